@@ -4,6 +4,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from symbol_date_index import get_symbol_date_index
+from symbol_state_store import SymbolStateStore
+from trade_ledger import TradeLedger
 
 class GapUpBollingerStrategy(Strategy):
     """
@@ -27,8 +30,16 @@ class GapUpBollingerStrategy(Strategy):
         }
         self.signals = None
         self.trades = None
-        self.previous_closes = {}  # {symbol: previous_close}
-        self.bollinger_data = {}   # {symbol: {'sma': [], 'std': [], 'upper_band': []}}
+        # Per-symbol previous close, latest bands and rolling close window
+        self.symbol_state = SymbolStateStore(
+            fields={
+                'prev_close': (np.float64, np.nan),
+                'sma': (np.float64, np.nan),
+                'std': (np.float64, np.nan),
+                'upper_band': (np.float64, np.nan)
+            },
+            windows={'closes': (self.params['bollinger_period'], np.float64)}
+        )
 
     def preprocess_data(self, data, context=None):
         """
@@ -75,73 +86,150 @@ class GapUpBollingerStrategy(Strategy):
         if data is None or len(data) == 0:
             return pd.DataFrame(columns=['Signal'])
         
-        # Initialize signals
-        signals = pd.Series(0, index=data.index)
-        
-        # Process each row
-        for i in range(len(data)):
-            row = data.iloc[i]
-            symbol = row['symbol']
-            current_open = row['open']
-            current_close = row['close']
-            current_high = row['high']
-            
-            # Initialize data structures for new symbols
-            if symbol not in self.previous_closes:
-                self.previous_closes[symbol] = None
-                self.bollinger_data[symbol] = {'sma': [], 'std': [], 'upper_band': []}
-            
-            # Store current close as previous close for next iteration
-            prev_close = self.previous_closes[symbol]
-            self.previous_closes[symbol] = current_close
-            
-            # Skip if we don't have previous close (first day)
-            if prev_close is None:
-                continue
-            
-            # Calculate Bollinger Bands
-            self._update_bollinger_bands(symbol, current_close)
-            
-            # Check if we have enough data for Bollinger Bands
-            if len(self.bollinger_data[symbol]['sma']) < self.params['bollinger_period']:
-                continue
-            
-            # Get current Bollinger Band values
-            current_upper_band = self.bollinger_data[symbol]['upper_band'][-1]
-            
-            # Check for Gap-Up + Bollinger Band exit signal
-            if self._is_gap_up_exit_signal(current_open, prev_close, current_high, current_upper_band):
-                signals.iloc[i] = -1  # Sell signal
+        # Continue from existing per-symbol state with the streaming update;
+        # a fresh run takes the grouped vectorized path
+        if len(self.symbol_state) > 0:
+            signals = self._generate_signals_stateful(data, context)
+        else:
+            signals = self._generate_signals_vectorized(data, context)
         
         self.signals = signals
+        # Exit-only: positions are opened elsewhere, so no trades start here
+        self.trades = TradeLedger()
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
-    def _update_bollinger_bands(self, symbol, current_close):
-        """Update Bollinger Band calculations for a symbol."""
-        # Add current close to the data
-        closes = self.bollinger_data[symbol]['sma']
-        closes.append(current_close)
+    def _group_rows(self, data, context=None):
+        """Order rows by symbol (data order within a symbol) and number them per symbol."""
+        index = get_symbol_date_index(data, context)
+        order = np.argsort(index.symbol_codes, kind='stable')
+        codes = index.symbol_codes[order]
+        
+        n = len(codes)
+        group_starts = np.flatnonzero(np.diff(codes, prepend=codes[0] - 1) != 0)
+        group_sizes = np.diff(np.append(group_starts, n))
+        position = np.arange(n) - np.repeat(group_starts, group_sizes)
+        
+        return index, order, codes, position, group_starts, group_sizes
+
+    def _generate_signals_vectorized(self, data, context=None):
+        """
+        Evaluate gap-up and upper-band conditions for every row at once.
+        
+        Rows are grouped by symbol (keeping data order within a symbol), the
+        previous close is a per-symbol shift and the Bollinger Bands are a
+        rolling population mean/std over each symbol's closes. A symbol's
+        first row only seeds its previous close, so a band is available from
+        its (bollinger_period + 1)-th row, as in the streaming update.
+        """
+        period = self.params['bollinger_period']
+        index, order, codes, position, group_starts, group_sizes = self._group_rows(data, context)
+        opens = data['open'].values[order].astype(float)
+        closes = data['close'].values[order].astype(float)
+        highs = data['high'].values[order].astype(float)
+        
+        n = len(codes)
+        prev_closes = np.empty(n)
+        prev_closes[0] = np.nan
+        prev_closes[1:] = closes[:-1]
+        prev_closes[position == 0] = np.nan
+        
+        # Windows ending at position >= period lie within one symbol and skip
+        # its first close, so one rolling pass over the grouped rows suffices
+        close_series = pd.Series(closes)
+        sma = close_series.rolling(window=period).mean().values
+        std = close_series.rolling(window=period).std(ddof=0).values
+        upper_band = sma + (self.params['bollinger_std'] * std)
+        
+        exit_signal = (position >= period) & (opens > prev_closes) & (highs > upper_band)
+        
+        signals = np.zeros(n, dtype=np.int64)
+        signals[order[exit_signal]] = -1
+        
+        # Leave per-symbol state where the streaming update would
+        self._seed_state(index, codes, closes, position, group_starts, group_sizes)
+        
+        return pd.Series(signals, index=data.index)
+
+    def _generate_signals_stateful(self, data, context=None):
+        """
+        Streaming evaluation that continues from stored state.
+        
+        Symbols are independent, so the k-th row of every symbol is applied
+        as one batch update, in order of k.
+        """
+        index, order, codes, position, _, _ = self._group_rows(data, context)
+        symbol_ids = self.symbol_state.ids(index.symbols)[codes]
+        opens = data['open'].values[order].astype(float)
+        closes = data['close'].values[order].astype(float)
+        highs = data['high'].values[order].astype(float)
+        
+        signals = np.zeros(len(codes), dtype=np.int64)
+        by_position = np.argsort(position, kind='stable')
+        wave_bounds = np.searchsorted(position[by_position], np.arange(position.max() + 2))
+        
+        for start, end in zip(wave_bounds[:-1], wave_bounds[1:]):
+            rows = by_position[start:end]
+            exits = self.update_bars(symbol_ids[rows], opens[rows], highs[rows], closes[rows])
+            signals[order[rows[exits]]] = -1
+        
+        return pd.Series(signals, index=data.index)
+
+    def update_bars(self, symbol_ids, opens, highs, closes):
+        """
+        Apply one bar for each of a batch of symbols.
         
-        # Keep only the required period
-        if len(closes) > self.params['bollinger_period']:
-            closes.pop(0)
+        Args:
+            symbol_ids (np.ndarray): Ids from self.symbol_state (unique)
+            opens (np.ndarray): Bar opens
+            highs (np.ndarray): Bar highs
+            closes (np.ndarray): Bar closes
         
-        # Calculate SMA
-        sma = np.mean(closes)
-        self.bollinger_data[symbol]['sma'].append(sma)
+        Returns:
+            np.ndarray: True where the gap-up exit signal fires
+        """
+        store = self.symbol_state
+        prev_closes = store.state['prev_close'][symbol_ids]
+        store.update(symbol_ids, prev_close=closes)
         
-        # Calculate standard deviation
-        std = np.std(closes, ddof=0)  # Population standard deviation
-        self.bollinger_data[symbol]['std'].append(std)
+        # Skip symbols without a previous close (first bar)
+        has_prev = ~np.isnan(prev_closes)
+        ids = symbol_ids[has_prev]
         
-        # Calculate upper Bollinger Band
+        # Update Bollinger Bands
+        store.push(ids, 'closes', closes[has_prev])
+        sma, std = store.window_mean_std(ids, 'closes', ddof=0)  # Population standard deviation
         upper_band = sma + (self.params['bollinger_std'] * std)
-        self.bollinger_data[symbol]['upper_band'].append(upper_band)
+        store.update(ids, sma=sma, std=std, upper_band=upper_band)
         
-        # Keep only the required period for all arrays
-        for key in ['sma', 'std', 'upper_band']:
-            if len(self.bollinger_data[symbol][key]) > self.params['bollinger_period']:
-                self.bollinger_data[symbol][key].pop(0)
+        # Check for Gap-Up + Bollinger Band exit signal once the window is full
+        ready = store.window_count(ids, 'closes') >= self.params['bollinger_period']
+        exits = np.zeros(len(symbol_ids), dtype=bool)
+        exits[has_prev] = ready & self._is_gap_up_exit_signal(
+            opens[has_prev], prev_closes[has_prev], highs[has_prev], upper_band
+        )
+        return exits
+
+    def _seed_state(self, index, codes, closes, position, group_starts, group_sizes):
+        """Set streaming state from the latest closes of every symbol."""
+        period = self.params['bollinger_period']
+        store = self.symbol_state
+        group_codes = codes[group_starts]
+        ids = store.ids(index.symbols[group_codes])
+        last_rows = group_starts + group_sizes - 1
+        store.update(ids, prev_close=closes[last_rows])
+        
+        # Window holds each symbol's last `period` closes, excluding its first
+        tail_start = np.maximum(1, group_sizes - period)
+        counts = group_sizes - tail_start
+        row_tail_start = np.repeat(tail_start, group_sizes)
+        in_tail = position >= row_tail_start
+        block = np.full((len(ids), period), np.nan)
+        group_of_row = np.repeat(np.arange(len(ids)), group_sizes)
+        block[group_of_row[in_tail], (position - row_tail_start)[in_tail]] = closes[in_tail]
+        store.fill_window(ids, 'closes', block, counts)
+        
+        sma, std = store.window_mean_std(ids, 'closes', ddof=0)
+        store.update(ids, sma=sma, std=std, upper_band=sma + (self.params['bollinger_std'] * std))
 
     def _is_gap_up_exit_signal(self, current_open, prev_close, current_high, upper_band):
         """
@@ -153,7 +241,32 @@ class GapUpBollingerStrategy(Strategy):
         # Condition 2: Current price (high) > Upper Bollinger Band
         above_upper_band = current_high > upper_band
         
-        return gap_up and above_upper_band
+        return gap_up & above_upper_band
+
+    def snapshot_state(self):
+        """
+        Per-symbol streaming state as arrays plus metadata
+        (see state_snapshot.StateCheckpointer).
+
+        Returns:
+            tuple: ({name: np.ndarray}, JSON-serializable meta)
+        """
+        return self.symbol_state.to_arrays('gapup.'), {
+            'symbols': list(self.symbol_state.symbols),
+            'bollinger_period': self.params['bollinger_period']
+        }
+
+    def restore_state(self, arrays, meta):
+        """
+        Restore state written by snapshot_state.
+
+        Args:
+            arrays (dict): Arrays from the snapshot (may be memory-mapped)
+            meta (dict): Metadata from the snapshot
+        """
+        if meta['bollinger_period'] != self.params['bollinger_period']:
+            raise ValueError("Snapshot was written with a different bollinger_period")
+        self.symbol_state.load_arrays(arrays, meta['symbols'], 'gapup.')
 
     def description(self):
         """
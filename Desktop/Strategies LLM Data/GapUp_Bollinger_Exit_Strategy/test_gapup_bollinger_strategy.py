@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized GapUpBollingerStrategy signals
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from gapup_bollinger_strategy import GapUpBollingerStrategy
+
+PARAMS = {'bollinger_period': 10, 'bollinger_std': 1.5, 'position_size': 1.0}
+
+
+def make_panel(n_symbols=8, n_days=120, seed=4):
+    """Date-sorted panel with frequent gap-ups; symbols start on different days."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=n_days)
+    frames = []
+    for i in range(n_symbols):
+        days = dates[i * 3:]
+        close = 100 * np.exp(rng.normal(0.001, 0.02, len(days)).cumsum())
+        prev = np.append(close[0], close[:-1])
+        open_ = prev * (1 + rng.normal(0.002, 0.01, len(days)))
+        frames.append(pd.DataFrame({'symbol': f'S{i}', 'date': days, 'open': open_, 'close': close,
+                                    'high': np.maximum(open_, close) * (1 + rng.uniform(0, 0.03, len(days)))}))
+    return GapUpBollingerStrategy().preprocess_data(pd.concat(frames, ignore_index=True))
+
+
+def reference_signals(data, period, k):
+    """Row-by-row loop: gap-up open and high above the band of the closes after each symbol's first."""
+    signals = np.zeros(len(data), dtype=np.int64)
+    prev_close, closes = {}, {}
+    for i, row in enumerate(data.itertuples(index=False)):
+        if row.symbol in prev_close:
+            window = closes.setdefault(row.symbol, [])
+            window.append(row.close)
+            recent = np.array(window[-period:])
+            if len(recent) == period and row.open > prev_close[row.symbol] \
+                    and row.high > recent.mean() + k * recent.std():
+                signals[i] = -1
+        prev_close[row.symbol] = row.close
+    return signals
+
+
+def test_vectorized_matches_row_loop():
+    data = make_panel()
+    signals = GapUpBollingerStrategy(dict(PARAMS)).generate_signals(data)['Signal'].values
+    expected = reference_signals(data, PARAMS['bollinger_period'], PARAMS['bollinger_std'])
+    assert (expected == -1).sum() > 10
+    np.testing.assert_array_equal(signals, expected)
+
+
+def test_split_run_continues_from_seeded_state():
+    data = make_panel()
+    full = GapUpBollingerStrategy(dict(PARAMS)).generate_signals(data)['Signal'].values
+
+    strategy = GapUpBollingerStrategy(dict(PARAMS))
+    cut = len(data) // 3
+    first = strategy.generate_signals(data.iloc[:cut])['Signal'].values
+    second = strategy.generate_signals(data.iloc[cut:])['Signal'].values
+    np.testing.assert_array_equal(np.concatenate([first, second]), full)
+    assert (second == -1).any()
@@ -4,6 +4,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger, EXIT_STOP_LOSS, EXIT_TRAILING_STOP, EXIT_TIME
+from indicator_cache import cached_indicator
 
 class LiquidityAwareMomentumStrategy(Strategy):
     """
@@ -213,23 +215,35 @@ class LiquidityAwareMomentumStrategy(Strategy):
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate indicators
-        vwap = self.calculate_vwap(data['high'], data['low'], data['close'], data['volume'])
-        vwap_percentile = self.calculate_vwap_percentile(data['close'], vwap, self.params['vwap_period'])
-        
-        obv = self.calculate_obv(data['close'], data['volume'])
-        obv_short_ema, obv_long_ema = self.calculate_obv_ema(
-            obv, self.params['obv_short_period'], self.params['obv_long_period']
+        vwap_period = self.params['vwap_period']
+        vwap = cached_indicator(self, context, data, ('vwap', vwap_period),
+                                lambda: self.calculate_vwap(data['high'], data['low'], data['close'], data['volume']))
+        vwap_percentile = cached_indicator(self, context, data, ('vwap_percentile', vwap_period),
+                                           lambda: self.calculate_vwap_percentile(data['close'], vwap, vwap_period))
+        
+        obv = cached_indicator(self, context, data, ('obv',), lambda: self.calculate_obv(data['close'], data['volume']))
+        obv_short_ema = cached_indicator(self, context, data, ('ema', 'obv', self.params['obv_short_period']),
+                                         lambda: obv.ewm(span=self.params['obv_short_period']).mean())
+        obv_long_ema = cached_indicator(self, context, data, ('ema', 'obv', self.params['obv_long_period']),
+                                        lambda: obv.ewm(span=self.params['obv_long_period']).mean())
+        
+        dollar_volume_period = self.params['dollar_volume_period']
+        avg_dollar_volume = cached_indicator(
+            self, context, data, ('sma', 'dollar_volume', dollar_volume_period),
+            lambda: self.calculate_dollar_volume(data['close'], data['volume']).rolling(
+                window=dollar_volume_period).mean()
         )
         
-        dollar_volume = self.calculate_dollar_volume(data['close'], data['volume'])
-        avg_dollar_volume = dollar_volume.rolling(window=self.params['dollar_volume_period']).mean()
-        
-        momentum = self.calculate_momentum(data['close'], self.params['momentum_period'])
+        momentum = cached_indicator(self, context, data, ('momentum', 'close', self.params['momentum_period']),
+                                    lambda: self.calculate_momentum(data['close'], self.params['momentum_period']))
         
-        atr = self.calculate_atr(data['high'], data['low'], data['close'], self.params['atr_period'])
+        atr = cached_indicator(self, context, data, ('atr', self.params['atr_period']),
+                               lambda: self.calculate_atr(data['high'], data['low'], data['close'],
+                                                          self.params['atr_period']))
         
         # Initialize signals
         signals = pd.Series(0, index=data.index)
+        exit_reasons = np.zeros(len(data), dtype=np.int8)
         
         # State-based logic for signal generation
         for i in range(max(self.params['vwap_period'], self.params['obv_long_period']), len(data)):
@@ -269,6 +283,8 @@ class LiquidityAwareMomentumStrategy(Strategy):
                 # Exit conditions
                 if (current_close < trailing_stop or vwap_stop or time_exit):
                     signals.iloc[i] = -1  # Exit signal
+                    exit_reasons[i] = (EXIT_TRAILING_STOP if current_close < trailing_stop
+                                       else EXIT_STOP_LOSS if vwap_stop else EXIT_TIME)
                     self.position = 0
                     self.entry_price = None
                     self.highest_price = None
@@ -298,6 +314,7 @@ class LiquidityAwareMomentumStrategy(Strategy):
                     self.entry_date = i
         
         self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values, exit_reasons=exit_reasons)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
     def description(self):
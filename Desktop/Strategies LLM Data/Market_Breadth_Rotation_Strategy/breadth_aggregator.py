@@ -0,0 +1,321 @@
+import pandas as pd
+import numpy as np
+
+
+class IncrementalBreadthAggregator:
+    """
+    Streaming Market Breadth Aggregator
+
+    Keeps advance/decline and new-high/new-low counts current as ticks arrive
+    instead of rebuilding them from a daily panel. Per-symbol state (previous
+    close, 52-week high/low, last price, advance/decline state) lives in flat
+    NumPy arrays indexed by a dense symbol id, and the global counters only
+    change when a symbol changes state, so each tick costs O(1).
+
+    States: 1 = advancing, -1 = declining, 0 = unchanged, -2 = no tick yet.
+    New highs/lows are counted once per session when a symbol first trades
+    beyond the 52-week range it started the session with.
+
+    end_session appends the closing readings to a daily history that is
+    kept across sessions, so to_frame() can feed
+    MarketBreadthRotationStrategy months of breadth; record() keeps
+    intraday readings for the current session only.
+
+    Example:
+        aggregator.begin_session(symbols, prev_close, high_52w, low_52w, date)
+        for symbol, price in ticks:
+            aggregator.update(symbol, price)
+        aggregator.end_session()
+        strategy.generate_signals(data, context={'breadth': aggregator.to_frame()})
+    """
+
+    NO_TICK = -2
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize empty per-symbol state.
+        Args:
+            capacity (int): Initial number of symbol slots (grows as needed).
+        """
+        self.symbol_ids = {}  # {symbol: id}
+        self.symbols = []
+        self.prev_close = np.full(capacity, np.nan)
+        self.high_52w = np.full(capacity, np.inf)
+        self.low_52w = np.full(capacity, -np.inf)
+        self.session_high = np.full(capacity, -np.inf)
+        self.session_low = np.full(capacity, np.inf)
+        self.last_price = np.full(capacity, np.nan)
+        self.state = np.full(capacity, self.NO_TICK, dtype=np.int8)
+        self.new_high = np.zeros(capacity, dtype=bool)
+        self.new_low = np.zeros(capacity, dtype=bool)
+        self.reset_counters()
+        self.session_date = None
+        self.history = []          # (date, advances, declines, new_highs, new_lows) per session
+        self.session_history = []  # record() readings of the current session
+
+    def reset_counters(self):
+        """Reset the global breadth counters."""
+        self.advances = 0
+        self.declines = 0
+        self.unchanged = 0
+        self.new_highs = 0
+        self.new_lows = 0
+
+    def _grow(self, size):
+        """Grow per-symbol arrays to hold at least size symbols."""
+        capacity = len(self.state)
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        fills = {
+            'prev_close': np.nan, 'high_52w': np.inf, 'low_52w': -np.inf,
+            'session_high': -np.inf, 'session_low': np.inf, 'last_price': np.nan,
+            'state': self.NO_TICK, 'new_high': False, 'new_low': False
+        }
+        for name, fill in fills.items():
+            old = getattr(self, name)
+            new = np.full(new_capacity, fill, dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, name, new)
+
+    def symbol_id(self, symbol):
+        """
+        Return the dense id for a symbol, registering it if new.
+
+        Args:
+            symbol (str): Instrument symbol
+
+        Returns:
+            int: Symbol id
+        """
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._grow(sid + 1)
+            self.symbol_ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def symbol_ids_for(self, symbols):
+        """
+        Return dense ids for a batch of symbols, registering new ones.
+
+        Args:
+            symbols (list): Instrument symbols
+
+        Returns:
+            np.ndarray: Symbol ids
+        """
+        return np.fromiter((self.symbol_id(s) for s in symbols), dtype=np.int64, count=len(symbols))
+
+    def begin_session(self, symbols, prev_close, high_52w, low_52w, date=None):
+        """
+        Load reference levels for a new session and clear intraday state.
+
+        Args:
+            symbols (list): Instrument symbols
+            prev_close (array-like): Previous session closes
+            high_52w (array-like): 52-week highs excluding today
+            low_52w (array-like): 52-week lows excluding today
+            date (datetime-like, optional): Session date, used for the daily
+                                            history row (see end_session)
+        """
+        ids = self.symbol_ids_for(symbols)
+        n = len(self.symbols)
+
+        self.prev_close[ids] = np.asarray(prev_close, dtype=float)
+        self.high_52w[ids] = np.asarray(high_52w, dtype=float)
+        self.low_52w[ids] = np.asarray(low_52w, dtype=float)
+        self.session_high[:n] = -np.inf
+        self.session_low[:n] = np.inf
+        self.last_price[:n] = np.nan
+        self.state[:n] = self.NO_TICK
+        self.new_high[:n] = False
+        self.new_low[:n] = False
+        self.reset_counters()
+        self.session_date = None if date is None else pd.Timestamp(date).normalize()
+        self.session_history = []
+
+    def end_session(self, date=None):
+        """
+        Record the session's closing readings and roll the reference levels
+        forward.
+
+        One row (advances, declines, new highs, new lows at the close) is
+        appended to the daily history. The last traded price becomes the
+        previous close and the session range is folded into the 52-week
+        high/low. Symbols should be reloaded with begin_session when an exact
+        rolling 52-week window is needed.
+
+        Args:
+            date (datetime-like, optional): Session date (default: the date
+                                            given to begin_session)
+
+        Raises:
+            ValueError: If no session date is known
+        """
+        date = self.session_date if date is None else pd.Timestamp(date).normalize()
+        if date is None:
+            raise ValueError("Session date unknown: pass it to begin_session or end_session")
+        self.history.append((date, self.advances, self.declines, self.new_highs, self.new_lows))
+
+        n = len(self.symbols)
+        traded = self.state[:n] != self.NO_TICK
+        self.prev_close[:n][traded] = self.last_price[:n][traded]
+        np.maximum(self.high_52w[:n], np.where(traded, self.session_high[:n], -np.inf), out=self.high_52w[:n])
+        np.minimum(self.low_52w[:n], np.where(traded, self.session_low[:n], np.inf), out=self.low_52w[:n])
+
+    def _apply_state_change(self, old_state, new_state):
+        """Move one symbol between the advance/decline/unchanged counters."""
+        if old_state == 1:
+            self.advances -= 1
+        elif old_state == -1:
+            self.declines -= 1
+        elif old_state == 0:
+            self.unchanged -= 1
+
+        if new_state == 1:
+            self.advances += 1
+        elif new_state == -1:
+            self.declines += 1
+        else:
+            self.unchanged += 1
+
+    def update(self, symbol, price):
+        """
+        Process a single tick in O(1). NaN prices (missing quotes) are ignored.
+
+        Args:
+            symbol (str): Instrument symbol
+            price (float): Last traded price
+        """
+        if price != price:
+            return
+        sid = self.symbol_id(symbol)
+        self.last_price[sid] = price
+
+        if price > self.session_high[sid]:
+            self.session_high[sid] = price
+        if price < self.session_low[sid]:
+            self.session_low[sid] = price
+
+        prev_close = self.prev_close[sid]
+        if prev_close != prev_close:  # No reference close yet
+            return
+
+        new_state = 1 if price > prev_close else (-1 if price < prev_close else 0)
+        old_state = self.state[sid]
+        if new_state != old_state:
+            self._apply_state_change(old_state, new_state)
+            self.state[sid] = new_state
+
+        if not self.new_high[sid] and price > self.high_52w[sid]:
+            self.new_high[sid] = True
+            self.new_highs += 1
+        if not self.new_low[sid] and price < self.low_52w[sid]:
+            self.new_low[sid] = True
+            self.new_lows += 1
+
+    def update_batch(self, symbols, prices):
+        """
+        Process a batch of ticks (e.g. a full-universe snapshot) with array
+        operations. Only the last tick per symbol in the batch is kept for the
+        advance/decline state; every tick counts toward the session range.
+        NaN prices (missing quotes) are ignored.
+
+        Args:
+            symbols (list or np.ndarray): Instrument symbols, or symbol ids
+                                          when given as an integer array
+            prices (array-like): Last traded prices
+
+        Raises:
+            ValueError: If symbols and prices differ in length or an id was
+                        never registered
+        """
+        if isinstance(symbols, np.ndarray) and symbols.dtype.kind in 'iu':
+            ids = symbols.astype(np.int64)
+            if len(ids) and (ids.min() < 0 or ids.max() >= len(self.symbols)):
+                raise ValueError(f"Unregistered symbol ids in batch (registered: 0..{len(self.symbols) - 1})")
+        else:
+            ids = self.symbol_ids_for(symbols)
+        prices = np.asarray(prices, dtype=float)
+        if len(ids) != len(prices):
+            raise ValueError(f"Got {len(ids)} symbols and {len(prices)} prices")
+
+        quoted = ~np.isnan(prices)
+        if not quoted.all():
+            ids, prices = ids[quoted], prices[quoted]
+        if len(ids) == 0:
+            return
+
+        np.maximum.at(self.session_high, ids, prices)
+        np.minimum.at(self.session_low, ids, prices)
+
+        # Last tick per symbol within the batch
+        rev_unique, rev_first = np.unique(ids[::-1], return_index=True)
+        ids = rev_unique
+        prices = prices[::-1][rev_first]
+        self.last_price[ids] = prices
+
+        prev_close = self.prev_close[ids]
+        has_ref = ~np.isnan(prev_close)
+        ids, prices, prev_close = ids[has_ref], prices[has_ref], prev_close[has_ref]
+
+        old_state = self.state[ids]
+        new_state = np.sign(prices - prev_close).astype(np.int8)
+        self.state[ids] = new_state
+
+        self.advances += int(np.count_nonzero(new_state == 1) - np.count_nonzero(old_state == 1))
+        self.declines += int(np.count_nonzero(new_state == -1) - np.count_nonzero(old_state == -1))
+        self.unchanged += int(np.count_nonzero(new_state == 0) - np.count_nonzero(old_state == 0))
+
+        # Sticky per-session new highs/lows use the session range, which
+        # includes every tick in the batch, not just the last one
+        crossed_high = ~self.new_high[ids] & (self.session_high[ids] > self.high_52w[ids])
+        crossed_low = ~self.new_low[ids] & (self.session_low[ids] < self.low_52w[ids])
+        self.new_high[ids[crossed_high]] = True
+        self.new_low[ids[crossed_low]] = True
+        self.new_highs += int(crossed_high.sum())
+        self.new_lows += int(crossed_low.sum())
+
+    def snapshot(self):
+        """
+        Current breadth readings.
+
+        Returns:
+            dict: Counters plus A/D ratio and net new highs
+        """
+        return {
+            'advances': self.advances,
+            'declines': self.declines,
+            'unchanged': self.unchanged,
+            'new_highs': self.new_highs,
+            'new_lows': self.new_lows,
+            'ad_ratio': self.advances / (self.declines + 1e-8),
+            'net_new_highs': self.new_highs - self.new_lows
+        }
+
+    def record(self, timestamp):
+        """
+        Append the current readings to the intraday history of this session.
+
+        Args:
+            timestamp (datetime): Bar or snapshot time
+        """
+        self.session_history.append((timestamp, self.advances, self.declines, self.new_highs, self.new_lows))
+
+    def to_frame(self, intraday=False):
+        """
+        Breadth history in the layout MarketBreadthRotationStrategy accepts
+        as context['breadth'].
+
+        Args:
+            intraday (bool): Return this session's record() readings instead
+                             of one row per finished session
+
+        Returns:
+            pd.DataFrame: advances, declines, new_highs, new_lows by date
+        """
+        rows = self.session_history if intraday else self.history
+        frame = pd.DataFrame(rows, columns=['date', 'advances', 'declines', 'new_highs', 'new_lows'])
+        return frame.set_index('date')
@@ -4,6 +4,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger
+from rebalance_calendar import RebalanceCalendar
 
 class MarketBreadthRotationStrategy(Strategy):
     """
@@ -38,6 +40,8 @@ class MarketBreadthRotationStrategy(Strategy):
         self.position = 0  # 0 = flat, 1 = long
         self.current_sector = None
         self.last_rebalance = 0
+        self.sector_names = []
+        self.top_sector_indices = None
 
     def preprocess_data(self, data, context=None):
         """
@@ -114,28 +118,44 @@ class MarketBreadthRotationStrategy(Strategy):
         
         return sector_cumulative / (market_cumulative + 1e-8)
 
-    def calculate_market_breadth(self, data):
+    def calculate_market_breadth(self, data, context=None):
         """
         Calculate market breadth indicators
         
+        Uses context['breadth'] when available (advances, declines, new_highs,
+        new_lows per date, e.g. IncrementalBreadthAggregator.to_frame()),
+        otherwise simulates breadth data.
+        
         Args:
             data (pd.DataFrame): Market data with breadth indicators
+            context (dict, optional): Breadth data
             
         Returns:
             dict: Dictionary of breadth indicators
         """
-        # For demo purposes, we'll simulate breadth data
-        # In practice, you'd have actual advance/decline data
-        np.random.seed(42)
-        n = len(data)
-        
-        # Simulate advancing/declining stocks
-        advances = np.random.randint(1000, 3000, n)
-        declines = np.random.randint(1000, 3000, n)
-        
-        # Simulate new highs/lows
-        new_highs = np.random.randint(50, 200, n)
-        new_lows = np.random.randint(50, 200, n)
+        if context is not None and context.get('breadth') is not None:
+            breadth = context['breadth']
+            if isinstance(breadth.index, pd.DatetimeIndex) and 'date' in data.columns:
+                breadth = breadth.reindex(pd.DatetimeIndex(data['date']), method='ffill')
+            elif len(breadth) != len(data):
+                raise ValueError("context['breadth'] must be date-indexed or match data length")
+            advances = breadth['advances'].values
+            declines = breadth['declines'].values
+            new_highs = breadth['new_highs'].values
+            new_lows = breadth['new_lows'].values
+        else:
+            # For demo purposes, we'll simulate breadth data
+            # In practice, you'd have actual advance/decline data
+            np.random.seed(42)
+            n = len(data)
+            
+            # Simulate advancing/declining stocks
+            advances = np.random.randint(1000, 3000, n)
+            declines = np.random.randint(1000, 3000, n)
+            
+            # Simulate new highs/lows
+            new_highs = np.random.randint(50, 200, n)
+            new_lows = np.random.randint(50, 200, n)
         
         # Calculate breadth indicators
         ad_ratio = self.calculate_advance_decline_ratio(
@@ -153,49 +173,190 @@ class MarketBreadthRotationStrategy(Strategy):
             'net_new_highs': net_new_highs
         }
 
+    def get_sector_closes(self, data, context=None):
+        """
+        Collect sector (index or ETF) closes as a dates x sectors frame
+        
+        Sector series are taken from context['sector_closes'] (DataFrame or
+        dict of Series), then from the '<sector>_close' columns in data of the
+        sectors named in context['sectors'] or params['sectors']. If neither
+        is available, sector closes are simulated around data['close'].
+        
+        Args:
+            data (pd.DataFrame): Market data
+            context (dict, optional): Sector data
+            
+        Returns:
+            pd.DataFrame: Sector closes aligned to data.index
+        """
+        sector_closes = None
+        if context is not None and context.get('sector_closes') is not None:
+            sector_closes = context['sector_closes']
+            if isinstance(sector_closes, dict):
+                sector_closes = pd.DataFrame(sector_closes)
+            
+            # Align on dates when the sector frame is date-indexed
+            if isinstance(sector_closes.index, pd.DatetimeIndex) and 'date' in data.columns:
+                sector_closes = sector_closes.reindex(pd.DatetimeIndex(data['date']))
+            elif len(sector_closes) != len(data):
+                raise ValueError("context['sector_closes'] must be date-indexed or match data length")
+            sector_closes = sector_closes.set_axis(data.index, axis=0)
+        else:
+            sectors = (context or {}).get('sectors') or self.params.get('sectors')
+            if sectors:
+                sector_cols = [f'{sector}_close' for sector in sectors]
+                missing = [col for col in sector_cols if col not in data.columns]
+                if missing:
+                    raise ValueError(f"Data is missing sector columns: {missing}")
+                sector_closes = data[sector_cols].set_axis(list(sectors), axis=1)
+        
+        if sector_closes is None:
+            # For demo purposes, we'll simulate sector data
+            # In practice, you'd have actual sector ETF data
+            np.random.seed(42)
+            n = len(data)
+            
+            sectors = ['Technology', 'Healthcare', 'Financial', 'Energy', 'Consumer']
+            base_returns = data['close'].pct_change().fillna(0).values
+            noise = np.random.normal(0, 0.01, (n, len(sectors)))
+            sector_closes = pd.DataFrame(
+                np.cumprod(1 + base_returns[:, None] + noise, axis=0),
+                index=data.index, columns=sectors
+            )
+        
+        return sector_closes.astype(float)
+
+    def calculate_relative_strength_matrix(self, sector_closes, market_close, lookbacks):
+        """
+        Calculate composite relative strength of every sector vs the market
+        
+        Log relative strength is computed for all lookbacks in one
+        lookbacks x dates x sectors array and averaged over the lookback axis.
+        
+        Args:
+            sector_closes (np.ndarray): Sector closes, dates x sectors
+            market_close (np.ndarray): Market closes, dates
+            lookbacks (list): Lookback periods in bars
+            
+        Returns:
+            np.ndarray: Composite RS scores, dates x sectors (NaN until the
+                        longest lookback is available)
+        """
+        closes = np.log(np.asarray(sector_closes, dtype=float))
+        market = np.log(np.asarray(market_close, dtype=float))
+        lags = np.asarray(lookbacks, dtype=np.int64)
+        n = closes.shape[0]
+        
+        # Row of the lookback start for every (lookback, date) pair
+        past_rows = np.arange(n)[None, :] - lags[:, None]
+        valid = past_rows >= 0
+        past_rows = np.where(valid, past_rows, 0)
+        
+        sector_perf = closes[None, :, :] - closes[past_rows]
+        market_perf = market[None, :] - market[past_rows]
+        rs = sector_perf - market_perf[:, :, None]
+        rs[~valid] = np.nan
+        
+        return rs.mean(axis=0)
+
+    def select_top_sectors(self, scores, top_k):
+        """
+        Select the top_k sectors for every date at once
+        
+        Args:
+            scores (np.ndarray): RS scores, dates x sectors
+            top_k (int): Number of sectors to select
+            
+        Returns:
+            np.ndarray: Sector column indices, dates x top_k, best first
+                        (-1 where no valid score is available)
+        """
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        n_sectors = scores.shape[1]
+        top_k = min(top_k, n_sectors)
+        
+        if top_k < n_sectors:
+            top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top = np.tile(np.arange(n_sectors), (scores.shape[0], 1))
+        
+        # Order the selected sectors best first
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        
+        return np.where(np.isfinite(top_scores), top, -1)
+
     def calculate_sector_rankings(self, data, context=None):
         """
         Calculate sector relative strength rankings
         
+        Relative strength is measured over params['rs_lookbacks'] (defaults
+        to [rs_period]) against context['market_close'] or data['close'].
+        
         Args:
             data (pd.DataFrame): Market data
             context (dict, optional): Sector data
             
         Returns:
-            pd.Series: Top sector rankings
-        """
-        # For demo purposes, we'll simulate sector data
-        # In practice, you'd have actual sector ETF data
-        np.random.seed(42)
-        n = len(data)
-        
-        # Simulate sector returns
-        sectors = ['Technology', 'Healthcare', 'Financial', 'Energy', 'Consumer']
-        sector_returns = {}
-        
-        for sector in sectors:
-            # Generate correlated but different returns
-            base_returns = data['close'].pct_change()
-            sector_returns[sector] = base_returns + np.random.normal(0, 0.01, n)
-        
-        # Calculate relative strength for each sector
-        market_returns = data['close'].pct_change()
-        sector_rs = {}
-        
-        for sector in sectors:
-            rs = self.calculate_relative_strength(
-                sector_returns[sector], 
-                market_returns, 
-                self.params['rs_period']
-            )
-            sector_rs[sector] = rs
+            pd.DataFrame: Sector ranks per date (1 = strongest)
+        """
+        sector_closes = self.get_sector_closes(data, context)
+        
+        if context is not None and context.get('market_close') is not None:
+            market_close = np.asarray(context['market_close'], dtype=float)
+            if market_close.shape != (len(data),):
+                raise ValueError(f"context['market_close'] must have one value per row "
+                                 f"({len(data)}), got shape {market_close.shape}")
+        else:
+            market_close = data['close'].values
+        
+        lookbacks = self.params.get('rs_lookbacks') or [self.params['rs_period']]
+        scores = self.calculate_relative_strength_matrix(sector_closes.values, market_close, lookbacks)
+        
+        # Keep the per-date selection so the signal loop doesn't rank again
+        self.sector_names = list(sector_closes.columns)
+        self.top_sector_indices = self.select_top_sectors(scores, self.params['top_sectors'])
         
-        # Rank sectors by relative strength
-        rs_df = pd.DataFrame(sector_rs)
+        rs_df = pd.DataFrame(scores, index=data.index, columns=sector_closes.columns)
         rankings = rs_df.rank(axis=1, ascending=False)
         
         return rankings
 
+    def calculate_rebalance_mask(self, data, start=0):
+        """
+        Mark rebalance bars from params['rebalance_rule']
+        
+        'sessions' (default) rebalances every rebalance_frequency bars from
+        start; 'weekly', 'monthly', 'quarterly' and 'yearly' rebalance on the
+        first trading day of every rebalance_frequency-th period and need a
+        date column.
+        
+        Args:
+            data (pd.DataFrame): Market data
+            start (int): First bar eligible for rebalancing
+            
+        Returns:
+            np.ndarray: Boolean mask, True on rebalance bars
+        """
+        rule = self.params.get('rebalance_rule', 'sessions')
+        frequency = self.params['rebalance_frequency']
+        
+        if 'date' in data.columns:
+            calendar = RebalanceCalendar(data['date'])
+            if calendar.n_sessions == len(data):
+                mask = calendar.mask(calendar.schedule(rule, frequency, start))
+                mask[:start] = False
+                return mask
+        
+        if rule != 'sessions':
+            raise ValueError(f"rebalance_rule '{rule}' requires one row per date")
+        
+        mask = np.zeros(len(data), dtype=bool)
+        mask[start::max(int(frequency), 1)] = True
+        return mask
+
     def generate_signals(self, data, context=None):
         """
         Core strategy logic: generate trading signals.
@@ -212,7 +373,7 @@ class MarketBreadthRotationStrategy(Strategy):
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate market breadth
-        breadth = self.calculate_market_breadth(data)
+        breadth = self.calculate_market_breadth(data, context)
         ad_ratio = breadth['ad_ratio']
         net_new_highs = breadth['net_new_highs']
         
@@ -222,11 +383,15 @@ class MarketBreadthRotationStrategy(Strategy):
         # Calculate moving average
         ma = data['close'].rolling(window=self.params['ma_period']).mean()
         
+        # Precompute rebalance sessions once instead of counting bars in the loop
+        start = max(self.params['rs_period'], self.params['ma_period'])
+        is_rebalance = self.calculate_rebalance_mask(data, start)
+        
         # Initialize signals
         signals = pd.Series(0, index=data.index)
         
         # State-based logic for signal generation
-        for i in range(max(self.params['rs_period'], self.params['ma_period']), len(data)):
+        for i in range(start, len(data)):
             current_ad_ratio = ad_ratio.iloc[i]
             current_net_highs = net_new_highs.iloc[i]
             current_close = data['close'].iloc[i]
@@ -238,7 +403,7 @@ class MarketBreadthRotationStrategy(Strategy):
                 continue
             
             # Check for rebalancing
-            should_rebalance = (i - self.last_rebalance) >= self.params['rebalance_frequency']
+            should_rebalance = is_rebalance[i]
             
             # Market breadth conditions
             breadth_healthy = (current_ad_ratio > self.params['ad_ratio_threshold'] and 
@@ -261,18 +426,22 @@ class MarketBreadthRotationStrategy(Strategy):
                     self.position = 0
                     self.current_sector = None
                     continue
+                
+                # Rotate to the current top ranked sector at rebalance
+                if should_rebalance and self.top_sector_indices[i, 0] >= 0:
+                    self.current_sector = self.sector_names[self.top_sector_indices[i, 0]]
+                    self.last_rebalance = i
             
             # Entry conditions
             if self.position == 0 and breadth_healthy and trend_healthy:
                 # Check if we should rebalance or enter
                 if should_rebalance or self.current_sector is None:
-                    # Find top ranked sector
-                    current_rankings = sector_rankings.iloc[i]
-                    top_sectors = current_rankings.nsmallest(self.params['top_sectors'])
+                    # Top ranked sector (precomputed for every date)
+                    top_index = self.top_sector_indices[i, 0]
                     
-                    if len(top_sectors) > 0:
+                    if top_index >= 0:
                         # Select the top sector
-                        selected_sector = top_sectors.index[0]
+                        selected_sector = self.sector_names[top_index]
                         
                         # For demo purposes, we'll use the main data as our "sector"
                         # In practice, you'd check the actual sector ETF data
@@ -282,6 +451,7 @@ class MarketBreadthRotationStrategy(Strategy):
                         self.last_rebalance = i
         
         self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
     def description(self):
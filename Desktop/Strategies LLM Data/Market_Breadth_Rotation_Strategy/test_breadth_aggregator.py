@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming breadth aggregator
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from breadth_aggregator import IncrementalBreadthAggregator
+from market_breadth_rotation_strategy import MarketBreadthRotationStrategy
+
+SYMBOLS = ['A', 'B', 'C', 'D']
+
+
+def new_session(date='2024-01-02'):
+    aggregator = IncrementalBreadthAggregator(capacity=2)
+    aggregator.begin_session(SYMBOLS, prev_close=[10, 20, 30, 40], high_52w=[12, 25, 31, 50],
+                             low_52w=[8, 15, 29, 39], date=date)
+    return aggregator
+
+
+def counters(aggregator):
+    return (aggregator.advances, aggregator.declines, aggregator.unchanged,
+            aggregator.new_highs, aggregator.new_lows)
+
+
+def test_update_tracks_state_changes_and_sticky_highs():
+    aggregator = new_session()
+    aggregator.update('A', 11)
+    aggregator.update('B', 19)
+    aggregator.update('C', 30)
+    aggregator.update('D', np.nan)
+    assert counters(aggregator) == (1, 1, 1, 0, 0)
+
+    aggregator.update('A', 13)    # new high
+    aggregator.update('A', 9)     # now declining; the new high stays counted
+    aggregator.update('C', 28.5)  # new low
+    assert counters(aggregator) == (0, 3, 0, 1, 1)
+    assert aggregator.snapshot()['net_new_highs'] == 0
+
+
+def test_batch_matches_tick_by_tick():
+    rng = np.random.default_rng(3)
+    symbols = rng.choice(SYMBOLS, 200)
+    prices = np.array([10, 20, 30, 40])[np.searchsorted(SYMBOLS, symbols)] * rng.uniform(0.8, 1.25, 200)
+    prices[::17] = np.nan
+
+    ticks, batch = new_session(), new_session()
+    for symbol, price in zip(symbols, prices):
+        ticks.update(symbol, price)
+    for start in range(0, 200, 50):
+        batch.update_batch(list(symbols[start:start + 50]), prices[start:start + 50])
+    assert counters(batch) == counters(ticks)
+    np.testing.assert_array_equal(batch.state[:4], ticks.state[:4])
+
+
+def test_batch_rejects_bad_input():
+    aggregator = new_session()
+    with pytest.raises(ValueError):
+        aggregator.update_batch(np.array([0, 4]), [1.0, 2.0])
+    with pytest.raises(ValueError):
+        aggregator.update_batch(['A', 'B'], [1.0])
+    aggregator.update_batch(np.array([0, 3]), [11.0, 41.0])
+    assert counters(aggregator) == (2, 0, 0, 0, 0)
+
+
+def test_history_keeps_one_row_per_session():
+    aggregator = new_session('2024-01-02')
+    aggregator.update_batch(['A', 'B'], [11.0, 19.0])
+    aggregator.record(pd.Timestamp('2024-01-02 10:00'))
+    aggregator.end_session()
+
+    aggregator.begin_session(SYMBOLS, [11, 19, 30, 40], [13, 25, 31, 50], [8, 15, 29, 39])
+    aggregator.update_batch(['A', 'B', 'C'], [12.0, 20.0, 31.5])
+    aggregator.record(pd.Timestamp('2024-01-03 10:00'))
+    aggregator.end_session(date='2024-01-03 15:30')
+
+    frame = aggregator.to_frame()
+    assert list(frame.index) == [pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-03')]
+    assert frame.values.tolist() == [[1, 1, 0, 0], [3, 0, 1, 0]]
+    assert list(aggregator.to_frame(intraday=True).index) == [pd.Timestamp('2024-01-03 10:00')]
+    # end_session rolled the last prices into the reference closes
+    assert list(aggregator.prev_close[:4]) == [12.0, 20.0, 31.5, 40.0]
+
+    aggregator.begin_session(SYMBOLS, [12, 20, 31.5, 40], [13, 25, 31.5, 50], [8, 15, 29, 39])
+    with pytest.raises(ValueError):
+        aggregator.end_session()
+
+
+def test_history_feeds_the_rotation_strategy():
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range('2024-01-01', periods=120)
+    closes = 100 * np.exp(rng.normal(0, 0.02, (len(dates) + 1, 30)).cumsum(axis=0))
+    symbols = [f'S{i}' for i in range(30)]
+
+    aggregator = IncrementalBreadthAggregator()
+    for day, date in enumerate(dates):
+        history = closes[max(0, day - 250):day + 1]
+        aggregator.begin_session(symbols, closes[day], history.max(axis=0), history.min(axis=0), date)
+        aggregator.update_batch(symbols, closes[day + 1])
+        aggregator.end_session()
+    breadth = aggregator.to_frame()
+    assert len(breadth) == len(dates)
+
+    data = pd.DataFrame({'date': dates, 'close': closes[1:].mean(axis=1)})
+    indicators = MarketBreadthRotationStrategy().calculate_market_breadth(data, {'breadth': breadth})
+    np.testing.assert_allclose(indicators['ad_ratio'].values,
+                               breadth['advances'].values / (breadth['declines'].values + 1e-8))
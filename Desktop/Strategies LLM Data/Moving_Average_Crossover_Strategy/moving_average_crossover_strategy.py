@@ -4,6 +4,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger, EXIT_TRAILING_STOP, EXIT_TIME
+from indicator_cache import cached_indicator
 
 class MovingAverageCrossoverStrategy(Strategy):
     """
@@ -71,6 +73,22 @@ class MovingAverageCrossoverStrategy(Strategy):
         
         return data
 
+    def calculate_atr(self, data):
+        """
+        Calculate ATR (simple average of the true range)
+        
+        Args:
+            data (pd.DataFrame): Data with high, low and close columns
+            
+        Returns:
+            pd.Series: ATR values
+        """
+        high_low = data['high'] - data['low']
+        high_close = np.abs(data['high'] - data['close'].shift())
+        low_close = np.abs(data['low'] - data['close'].shift())
+        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
+        return true_range.rolling(window=self.params['atr_period']).mean()
+
     def generate_signals(self, data, context=None):
         """
         Core strategy logic: generate trading signals.
@@ -87,18 +105,19 @@ class MovingAverageCrossoverStrategy(Strategy):
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate moving averages
-        short_ma = data['close'].rolling(window=self.params['short_ma_period']).mean()
-        long_ma = data['close'].rolling(window=self.params['long_ma_period']).mean()
+        short_period = self.params['short_ma_period']
+        long_period = self.params['long_ma_period']
+        short_ma = cached_indicator(self, context, data, ('sma', 'close', short_period),
+                                    lambda: data['close'].rolling(window=short_period).mean())
+        long_ma = cached_indicator(self, context, data, ('sma', 'close', long_period),
+                                   lambda: data['close'].rolling(window=long_period).mean())
         
         # Calculate ATR for risk management
-        high_low = data['high'] - data['low']
-        high_close = np.abs(data['high'] - data['close'].shift())
-        low_close = np.abs(data['low'] - data['close'].shift())
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=self.params['atr_period']).mean()
+        atr = cached_indicator(self, context, data, ('atr', self.params['atr_period']), lambda: self.calculate_atr(data))
         
         # Initialize signals
         signals = pd.Series(0, index=data.index)
+        exit_reasons = np.zeros(len(data), dtype=np.int8)
         
         # State-based logic for crossover detection with risk management
         for i in range(self.params['long_ma_period'], len(data)):
@@ -148,6 +167,7 @@ class MovingAverageCrossoverStrategy(Strategy):
                 # Check if stop loss is hit
                 if current_price <= self.trailing_stop:
                     signals.iloc[i] = -1  # Sell signal due to stop loss
+                    exit_reasons[i] = EXIT_TRAILING_STOP
                     self.position = 0
                     self.entry_price = None
                     self.stop_loss = None
@@ -157,6 +177,7 @@ class MovingAverageCrossoverStrategy(Strategy):
                 # Check for maximum holding period
                 elif self.entry_date is not None and (i - self.entry_date) >= self.params['max_holding_days']:
                     signals.iloc[i] = -1  # Sell signal due to time limit
+                    exit_reasons[i] = EXIT_TIME
                     self.position = 0
                     self.entry_price = None
                     self.stop_loss = None
@@ -164,6 +185,7 @@ class MovingAverageCrossoverStrategy(Strategy):
                     self.entry_date = None
         
         self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values, exit_reasons=exit_reasons)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
     def description(self):
@@ -6,6 +6,7 @@ from scipy import stats
 from sklearn.linear_model import LinearRegression
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger, EXIT_STOP_LOSS, EXIT_TIME
 
 class StatisticalPairsMeanReversionStrategy(Strategy):
     """
@@ -200,6 +201,9 @@ class StatisticalPairsMeanReversionStrategy(Strategy):
         
         # Initialize signals
         signals = pd.Series(0, index=data.index)
+        exit_reasons = np.zeros(len(data), dtype=np.int8)
+        positions = np.full(len(data), np.nan)
+        positions[:self.params['lookback_window']] = self.position
         
         # State-based logic for signal generation
         for i in range(self.params['lookback_window'], len(data)):
@@ -212,16 +216,20 @@ class StatisticalPairsMeanReversionStrategy(Strategy):
             # Check for stop loss
             if self.position != 0 and abs(current_z_score) > self.params['z_score_stop']:
                 signals.iloc[i] = -self.position  # Exit position
+                exit_reasons[i] = EXIT_STOP_LOSS
                 self.position = 0
                 self.entry_date = None
+                positions[i] = 0
                 continue
             
             # Check for maximum holding period
             if (self.position != 0 and self.entry_date is not None and 
                 i - self.entry_date > self.params['max_holding_period']):
                 signals.iloc[i] = -self.position  # Exit position
+                exit_reasons[i] = EXIT_TIME
                 self.position = 0
                 self.entry_date = None
+                positions[i] = 0
                 continue
             
             # Entry Rules
@@ -231,12 +239,14 @@ class StatisticalPairsMeanReversionStrategy(Strategy):
                     signals.iloc[i] = 1  # Long spread signal
                     self.position = 1
                     self.entry_date = i
+                    positions[i] = 1
                 
                 # Short spread (sell A, buy B) when Z-score > +entry_threshold
                 elif current_z_score > self.params['z_score_entry']:
                     signals.iloc[i] = -1  # Short spread signal
                     self.position = -1
                     self.entry_date = i
+                    positions[i] = -1
             
             # Exit Rules
             elif self.position != 0:
@@ -245,8 +255,13 @@ class StatisticalPairsMeanReversionStrategy(Strategy):
                     signals.iloc[i] = -self.position  # Exit signal
                     self.position = 0
                     self.entry_date = None
+                    positions[i] = 0
         
         self.signals = signals
+        
+        # Spread trades (long and short) from the position held after each bar
+        positions = pd.Series(positions).ffill().values
+        self.trades = TradeLedger.from_positions(positions, price_a.values, exit_reasons=exit_reasons)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
     def description(self):
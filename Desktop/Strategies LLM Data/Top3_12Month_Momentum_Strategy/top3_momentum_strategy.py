@@ -4,6 +4,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from symbol_date_index import get_symbol_date_index
+from rebalance_calendar import RebalanceCalendar
+from symbol_state_store import SymbolStateStore
+from trade_ledger import TradeLedger, EXIT_REBALANCE
 
 class Top3MomentumStrategy(Strategy):
     """
@@ -27,7 +31,14 @@ class Top3MomentumStrategy(Strategy):
         }
         self.signals = None
         self.trades = None
-        self.current_positions = {}  # {symbol: {'entry_date': date, 'entry_price': price}}
+        # Per-symbol holding flag and entry details
+        self.position_state = SymbolStateStore(
+            fields={
+                'held': (np.bool_, False),
+                'entry_date': ('datetime64[ns]', np.datetime64('NaT')),
+                'entry_price': (np.float64, np.nan)
+            }
+        )
         self.last_rebalance_date = None
 
     def preprocess_data(self, data, context=None):
@@ -75,103 +86,144 @@ class Top3MomentumStrategy(Strategy):
         if data is None or len(data) == 0:
             return pd.DataFrame(columns=['Signal'])
         
-        # Initialize signals
-        signals = pd.Series(0, index=data.index)
-        
-        # Get unique dates for rebalancing
-        unique_dates = data['date'].dt.date.unique()
-        unique_dates = sorted(unique_dates)
-        
-        # Process each rebalancing date
-        for i, current_date in enumerate(unique_dates):
-            # Check if it's time to rebalance
-            if self._should_rebalance(current_date):
-                # Calculate 12-month returns for all stocks
-                returns_data = self._calculate_momentum_returns(data, current_date)
-                
-                if len(returns_data) >= self.params['top_n_stocks']:
-                    # Select top N stocks
-                    top_stocks = returns_data.nlargest(self.params['top_n_stocks'], 'momentum_return')
-                    
-                    # Generate buy signals for top stocks
-                    for _, stock in top_stocks.iterrows():
-                        stock_mask = (data['symbol'] == stock['symbol']) & (data['date'].dt.date == current_date)
-                        signals[stock_mask] = 1
-                    
-                    # Generate sell signals for current positions not in top stocks
-                    current_symbols = set(self.current_positions.keys())
-                    top_symbols = set(top_stocks['symbol'])
-                    symbols_to_sell = current_symbols - top_symbols
-                    
-                    for symbol in symbols_to_sell:
-                        stock_mask = (data['symbol'] == symbol) & (data['date'].dt.date == current_date)
-                        signals[stock_mask] = -1
-                    
-                    # Update positions
-                    self._update_positions(top_stocks, current_date)
-                    self.last_rebalance_date = current_date
+        # Pivot once into a dates x symbols close matrix
+        index = get_symbol_date_index(data, context)
+        symbols = index.symbols
+        days = index.days
+        closes = index.to_wide(data['close'].values)
+        valid = ~np.isnan(closes)
+        day_dates = pd.DatetimeIndex(days).date
+        
+        # Signal decisions keyed by (day, symbol) so duplicate rows all get them
+        decision_days = []
+        decision_codes = []
+        decision_values = []
+        
+        # Only evaluate on rebalance sessions: the first session from the
+        # current month, then the first session rebalance_frequency months
+        # after each successful rebalance (retrying daily while too few
+        # stocks have a full momentum window)
+        calendar = RebalanceCalendar(days)
+        rebalance_frequency = self.params['rebalance_frequency']
+        if self.last_rebalance_date is None:
+            i = 0
+        else:
+            last_month = RebalanceCalendar.period_code(self.last_rebalance_date, 'M')
+            i = calendar.first_row_in_period(last_month + rebalance_frequency, 'M')
+        
+        while i < calendar.n_sessions:
+            current_date = day_dates[i]
+            
+            # Calculate 12-month returns for all stocks
+            momentum_returns, current_prices = self._calculate_momentum_returns(closes, valid, days, i)
+            n_valid = np.count_nonzero(~np.isnan(momentum_returns))
+            
+            if n_valid < self.params['top_n_stocks']:
+                i += 1
+                continue
+            
+            # Select top N stocks
+            top_codes = self._select_top_n(momentum_returns, self.params['top_n_stocks'])
+            top_symbols = list(symbols[top_codes])
+            
+            # Generate buy signals for top stocks
+            decision_days.extend([i] * len(top_codes))
+            decision_codes.extend(top_codes)
+            decision_values.extend([1] * len(top_codes))
+            
+            # Generate sell signals for current positions not in top stocks
+            symbols_to_sell = set(self._held_symbols()) - set(top_symbols)
+            sell_codes = [index.symbol_code(s) for s in symbols_to_sell]
+            sell_codes = [code for code in sell_codes if code >= 0]
+            decision_days.extend([i] * len(sell_codes))
+            decision_codes.extend(sell_codes)
+            decision_values.extend([-1] * len(sell_codes))
+            
+            # Update positions
+            self._update_positions(top_symbols, current_prices[top_codes], current_date)
+            self.last_rebalance_date = current_date
+            i = max(calendar.next_period_start(i, rebalance_frequency, 'M'), i + 1)
+        
+        # Map decisions back onto the long frame in one pass
+        signals = index.broadcast_pairs(decision_days, decision_codes,
+                                        np.asarray(decision_values, dtype=np.int64))
         
+        signals = pd.Series(signals, index=data.index)
         self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values, symbol_codes=index.symbol_codes,
+                                               symbols=list(symbols), default_reason=EXIT_REBALANCE)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
-    def _should_rebalance(self, current_date):
-        """Check if it's time to rebalance based on the rebalancing frequency."""
-        if self.last_rebalance_date is None:
-            return True
+    def _calculate_momentum_returns(self, closes, valid, days, row):
+        """
+        Calculate 12-month momentum returns for all stocks.
         
-        # Calculate months between last rebalance and current date
-        months_diff = (current_date.year - self.last_rebalance_date.year) * 12 + \
-                     (current_date.month - self.last_rebalance_date.month)
+        Args:
+            closes (np.ndarray): Close matrix, dates x symbols (NaN where missing)
+            valid (np.ndarray): ~np.isnan(closes)
+            days (np.ndarray): Sorted datetime64 dates of the close matrix rows
+            row (int): Row of the rebalance date
+        
+        Returns:
+            tuple: (momentum returns in %, NaN where fewer than two closes in
+                    the window; latest close in the window), both per symbol
+        """
+        # Find the row 12 months ago
+        start_date = pd.Timestamp(days[row]) - pd.DateOffset(months=self.params['momentum_period'])
+        start_row = np.searchsorted(days, start_date.to_datetime64(), side='left')
+        
+        # First and last available close of each symbol within the window
+        window = valid[start_row:row + 1]
+        has_data = window.any(axis=0)
+        first_rows = start_row + window.argmax(axis=0)
+        last_rows = row - window[::-1].argmax(axis=0)
+        
+        columns = np.arange(closes.shape[1])
+        first_prices = closes[first_rows, columns]
+        last_prices = closes[last_rows, columns]
+        
+        # Calculate 12-month return where at least two closes are available
+        momentum_returns = ((last_prices - first_prices) / first_prices) * 100
+        momentum_returns[~(has_data & (first_rows < last_rows))] = np.nan
         
-        return months_diff >= self.params['rebalance_frequency']
+        return momentum_returns, last_prices
 
-    def _calculate_momentum_returns(self, data, current_date):
-        """Calculate 12-month momentum returns for all stocks."""
-        # Calculate the date 12 months ago
-        current_dt = pd.to_datetime(current_date)
-        start_date = current_dt - pd.DateOffset(months=self.params['momentum_period'])
-        
-        # Get data for the momentum calculation period
-        momentum_data = data[
-            (data['date'] >= start_date) & 
-            (data['date'] <= current_dt)
-        ].copy()
-        
-        if momentum_data.empty:
-            return pd.DataFrame(columns=['symbol', 'momentum_return'])
-        
-        # Calculate returns for each stock
-        returns_list = []
-        for symbol in momentum_data['symbol'].unique():
-            stock_data = momentum_data[momentum_data['symbol'] == symbol].sort_values('date')
-            
-            if len(stock_data) >= 2:
-                # Get first and last prices in the period
-                first_price = stock_data['close'].iloc[0]
-                last_price = stock_data['close'].iloc[-1]
-                
-                # Calculate 12-month return
-                momentum_return = ((last_price - first_price) / first_price) * 100
-                
-                returns_list.append({
-                    'symbol': symbol,
-                    'momentum_return': momentum_return,
-                    'current_price': last_price
-                })
-        
-        return pd.DataFrame(returns_list)
+    def _select_top_n(self, momentum_returns, top_n):
+        """Return symbol codes of the top_n momentum returns, best first."""
+        scores = np.where(np.isnan(momentum_returns), -np.inf, momentum_returns)
+        if top_n < len(scores):
+            top_codes = np.argpartition(-scores, top_n - 1)[:top_n]
+        else:
+            top_codes = np.arange(len(scores))
+        return top_codes[np.argsort(-scores[top_codes], kind='stable')]
+
+    def _held_symbols(self):
+        """Symbols currently held."""
+        held_ids = np.flatnonzero(self.position_state.column('held'))
+        return [self.position_state.symbols[i] for i in held_ids]
 
-    def _update_positions(self, top_stocks, current_date):
+    def _update_positions(self, top_symbols, top_prices, current_date):
         """Update current positions with new selections."""
+        store = self.position_state
+        
         # Clear existing positions
-        self.current_positions.clear()
+        store.column('held')[:] = False
         
         # Add new positions
-        for _, stock in top_stocks.iterrows():
-            self.current_positions[stock['symbol']] = {
-                'entry_date': current_date,
-                'entry_price': stock['current_price']
+        ids = store.ids(top_symbols)
+        store.update(ids, held=True, entry_date=np.datetime64(current_date, 'ns'), entry_price=top_prices)
+
+    @property
+    def current_positions(self):
+        """Current positions as {symbol: {'entry_date': date, 'entry_price': price}}."""
+        state = self.position_state.state
+        return {
+            self.position_state.symbols[i]: {
+                'entry_date': pd.Timestamp(state['entry_date'][i]).date(),
+                'entry_price': float(state['entry_price'][i])
             }
+            for i in np.flatnonzero(self.position_state.column('held'))
+        }
 
     def description(self):
         """
@@ -4,6 +4,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger
+from indicator_cache import cached_indicator
 
 class TrendMomentumFilterStrategy(Strategy):
     """
@@ -121,11 +123,17 @@ class TrendMomentumFilterStrategy(Strategy):
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate indicators
-        short_ma = data['close'].rolling(window=self.params['short_ma_period']).mean()
-        long_ma = data['close'].rolling(window=self.params['long_ma_period']).mean()
-        rsi = self.calculate_rsi(data['close'], self.params['rsi_period'])
-        upper_bb, middle_bb, lower_bb = self.calculate_bollinger_bands(
-            data['close'], self.params['bb_period'], self.params['bb_std']
+        short_period = self.params['short_ma_period']
+        long_period = self.params['long_ma_period']
+        short_ma = cached_indicator(self, context, data, ('sma', 'close', short_period),
+                                    lambda: data['close'].rolling(window=short_period).mean())
+        long_ma = cached_indicator(self, context, data, ('sma', 'close', long_period),
+                                   lambda: data['close'].rolling(window=long_period).mean())
+        rsi = cached_indicator(self, context, data, ('rsi', 'close', self.params['rsi_period']),
+                               lambda: self.calculate_rsi(data['close'], self.params['rsi_period']))
+        upper_bb, middle_bb, lower_bb = cached_indicator(
+            self, context, data, ('bollinger', 'close', self.params['bb_period'], self.params['bb_std']),
+            lambda: self.calculate_bollinger_bands(data['close'], self.params['bb_period'], self.params['bb_std'])
         )
         
         # Initialize signals
@@ -166,6 +174,7 @@ class TrendMomentumFilterStrategy(Strategy):
                     self.position = 0
         
         self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
     def description(self):
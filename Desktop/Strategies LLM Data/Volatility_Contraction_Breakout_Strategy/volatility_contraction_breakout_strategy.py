@@ -4,6 +4,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger, EXIT_STOP_LOSS, EXIT_TRAILING_STOP, EXIT_TIME
+from indicator_cache import cached_indicator
 
 class VolatilityContractionBreakoutStrategy(Strategy):
     """
@@ -158,24 +160,38 @@ class VolatilityContractionBreakoutStrategy(Strategy):
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate indicators
-        upper_bb, middle_bb, lower_bb, bb_width = self.calculate_bollinger_bands(
-            data['close'], self.params['bb_period'], self.params['bb_std']
+        bb_key = ('bollinger', 'close', self.params['bb_period'], self.params['bb_std'])
+        upper_bb, middle_bb, lower_bb, bb_width = cached_indicator(
+            self, context, data, bb_key,
+            lambda: self.calculate_bollinger_bands(data['close'], self.params['bb_period'], self.params['bb_std'])
         )
         
-        atr = self.calculate_atr(data['high'], data['low'], data['close'], self.params['atr_period'])
+        atr = cached_indicator(self, context, data, ('atr', self.params['atr_period']),
+                               lambda: self.calculate_atr(data['high'], data['low'], data['close'],
+                                                          self.params['atr_period']))
         
-        consolidation_high = self.calculate_consolidation_high(data['high'], self.params['consolidation_period'])
-        consolidation_low = self.calculate_consolidation_low(data['low'], self.params['consolidation_period'])
+        # Consolidation range of the previous `period` bars: a range that
+        # includes the current bar always contains its close
+        period = self.params['consolidation_period']
+        consolidation_high = cached_indicator(self, context, data, ('rolling_max', 'high', period),
+                                              lambda: self.calculate_consolidation_high(data['high'], period)).shift(1)
+        consolidation_low = cached_indicator(self, context, data, ('rolling_min', 'low', period),
+                                             lambda: self.calculate_consolidation_low(data['low'], period)).shift(1)
         
         # Calculate rolling percentile of BB width
-        bb_width_percentile = bb_width.rolling(window=self.params['width_lookback']).rank(pct=True) * 100
+        bb_width_percentile = cached_indicator(
+            self, context, data, bb_key + ('width_percentile', self.params['width_lookback']),
+            lambda: bb_width.rolling(window=self.params['width_lookback']).rank(pct=True) * 100
+        )
         
         # Calculate volume ratio
-        avg_volume = data['volume'].rolling(window=self.params['volume_period']).mean()
+        avg_volume = cached_indicator(self, context, data, ('sma', 'volume', self.params['volume_period']),
+                                      lambda: data['volume'].rolling(window=self.params['volume_period']).mean())
         volume_ratio = data['volume'] / avg_volume
         
         # Initialize signals
         signals = pd.Series(0, index=data.index)
+        exit_reasons = np.zeros(len(data), dtype=np.int8)
         
         # State-based logic for signal generation
         for i in range(max(self.params['width_lookback'], self.params['consolidation_period']), len(data)):
@@ -214,6 +230,8 @@ class VolatilityContractionBreakoutStrategy(Strategy):
                 # Exit conditions
                 if (current_close < trailing_stop or consolidation_failure or time_exit):
                     signals.iloc[i] = -1  # Exit signal
+                    exit_reasons[i] = (EXIT_TRAILING_STOP if current_close < trailing_stop
+                                       else EXIT_STOP_LOSS if consolidation_failure else EXIT_TIME)
                     self.position = 0
                     self.entry_price = None
                     self.highest_price = None
@@ -240,6 +258,7 @@ class VolatilityContractionBreakoutStrategy(Strategy):
                     self.entry_date = i
         
         self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values, exit_reasons=exit_reasons)
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
     def description(self):
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the chunked universe volume scan
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Volume_Breakout_Strategy.volume_breakout_strategy import VolumeBreakoutStrategy
+
+PARAMS = {'volume_period': 20, 'position_size': 1.0}
+
+
+def make_volumes(n_days=90, n_symbols=12, seed=6):
+    """Dates x symbols volumes with gaps and a late listing."""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(10, 0.5, (n_days, n_symbols))
+    values[rng.random(values.shape) < 0.03] = np.nan
+    values[:40, 3] = np.nan
+    return pd.DataFrame(values, index=pd.bdate_range('2024-01-01', periods=n_days),
+                        columns=[f'S{i}' for i in range(n_symbols)])
+
+
+def test_scan_matches_per_symbol_signals():
+    volumes = make_volumes()
+    strategy = VolumeBreakoutStrategy(dict(PARAMS))
+    scan = strategy.scan_universe(volumes, top_k=4, chunk_size=7)
+
+    for symbol in volumes.columns:
+        data = pd.DataFrame({'volume': volumes[symbol].values, 'close': 100.0})
+        signals = VolumeBreakoutStrategy(dict(PARAMS)).generate_signals(data)['Signal'].values
+        np.testing.assert_array_equal(scan['breakout'][symbol].values, signals == 1)
+    assert scan['breakout'].values.sum() > 0
+
+    whole = strategy.scan_universe(volumes, top_k=4, chunk_size=1000)
+    for key in ('breakout', 'volume_ratio', 'top_ratios'):
+        pd.testing.assert_frame_equal(scan[key], whole[key])
+
+
+def test_top_symbols_rank_the_highest_ratios():
+    volumes = make_volumes()
+    scan = VolumeBreakoutStrategy(dict(PARAMS)).scan_universe(volumes, top_k=3, chunk_size=16)
+    ratio = scan['volume_ratio'].iloc[50]
+    expected = ratio.dropna().sort_values(ascending=False)[:3]
+    assert list(scan['top_symbols'].iloc[50]) == list(expected.index)
+    np.testing.assert_allclose(scan['top_ratios'].iloc[50].values, expected.values)
+    assert scan['top_ratios'].iloc[:19].isna().all().all()
+
+
+def test_screen_streams_the_scan():
+    volumes = make_volumes()
+    strategy = VolumeBreakoutStrategy(dict(PARAMS))
+    scan = strategy.scan_universe(volumes, top_k=5)
+    screen = list(strategy.iter_volume_screen(volumes, top_k=5, chunk_size=9))
+
+    assert [date for date, _ in screen] == list(volumes.index[20:])
+    for date, ranked in screen:
+        assert [symbol for symbol, _ in ranked] == list(scan['top_symbols'].loc[date])
+        np.testing.assert_allclose([ratio for _, ratio in ranked], scan['top_ratios'].loc[date].values)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for seeding and streaming the intraday volume profile
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Volume_Breakout_Strategy.volume_breakout_strategy import VolumeBreakoutStrategy
+
+PARAMS = {'volume_period': 100, 'position_size': 1.0, 'mode': 'intraday', 'profile_days': 5,
+          'relative_volume_threshold': 1.2, 'session_start': '09:15', 'session_minutes': 375}
+MINUTES = np.r_[0:375:15, 374]  # 15-minute bars plus one in the closing minute
+
+
+def make_bars(n_sessions=7, seed=8):
+    """Intraday bars of one symbol; each session has a bar in its final minute."""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range('2024-03-04', periods=n_sessions)
+    offsets = pd.to_timedelta(MINUTES + 9 * 60 + 15, unit='min')
+    dates = np.concatenate([(day + offsets).values for day in days])
+    return pd.DataFrame({'symbol': 'INFY', 'date': dates,
+                         'volume': rng.integers(100, 1000, len(dates)).astype(float)})
+
+
+def test_update_profile_adds_each_complete_session_once():
+    bars = make_bars()
+    strategy = VolumeBreakoutStrategy(dict(PARAMS))
+    sid = strategy._get_volume_profile().symbol_id('INFY')
+
+    # Session 3 is still running (no bar in the closing minute yet)
+    assert strategy.update_profile(bars.iloc[:2 * len(MINUTES) + 10]) == 2
+    assert strategy.update_profile(bars.iloc[:2 * len(MINUTES) + 20]) == 0
+    assert strategy.update_profile(bars.iloc[:3 * len(MINUTES)]) == 1
+    assert strategy.update_profile(bars.iloc[len(MINUTES):4 * len(MINUTES)]) == 1
+    assert strategy.volume_profile.symbol_state.state['days'][sid] == 4
+
+    # Only the last profile_days sessions are kept
+    assert strategy.update_profile(bars) == 3
+    days = bars['date'].dt.normalize()
+    last = bars[days >= days.unique()[-5]]
+    curves = last.groupby(last['date'].dt.normalize())['volume'].sum()
+    np.testing.assert_allclose(strategy.volume_profile.expected_volume(sid, 374), curves.mean(), rtol=1e-6)
+
+
+def test_seeded_ticks_match_batch_relative_volume():
+    bars = make_bars(6)
+    seed, today = bars.iloc[:5 * len(MINUTES)], bars.iloc[5 * len(MINUTES):]
+
+    batch = VolumeBreakoutStrategy(dict(PARAMS)).generate_signals(bars)
+    strategy = VolumeBreakoutStrategy(dict(PARAMS))
+    assert strategy.update_profile(seed) == 5
+
+    profile = strategy.volume_profile
+    live = [profile.update_tick('INFY', row.date, row.volume) for row in today.itertuples()]
+    np.testing.assert_allclose(live, batch['relative_volume'].values[-len(today):], rtol=1e-6)
+    assert np.isnan(batch['relative_volume'].values[:-len(today)]).all()
+    assert strategy.update_intraday_tick('INFY', today['date'].iloc[-1], 0.0) == (live[-1] > 1.2)
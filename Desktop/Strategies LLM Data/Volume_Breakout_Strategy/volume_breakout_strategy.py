@@ -4,6 +4,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from trade_ledger import TradeLedger
+from indicator_cache import cached_indicator
+from Volume_Breakout_Strategy.volume_profile import IntradayVolumeProfile
 
 class VolumeBreakoutStrategy(Strategy):
     """
@@ -21,10 +24,16 @@ class VolumeBreakoutStrategy(Strategy):
         """
         self.params = params or {
             'volume_period': 100,
-            'position_size': 1.0
+            'position_size': 1.0,
+            'mode': 'daily',  # 'daily' bars or 'intraday' time-of-day profile
+            'profile_days': 20,
+            'relative_volume_threshold': 1.0,
+            'session_start': '09:15',
+            'session_minutes': 375
         }
         self.signals = None
         self.trades = None
+        self.volume_profile = None
 
     def preprocess_data(self, data, context=None):
         """
@@ -69,30 +78,257 @@ class VolumeBreakoutStrategy(Strategy):
             pd.DataFrame: Must include a 'Signal' column 
                           (1=long, -1=short, 0=flat, or fractional weights).
         """
+        if self.params.get('mode', 'daily') == 'intraday':
+            return self.generate_intraday_signals(data, context)
+        
         if data is None or len(data) < self.params['volume_period']:
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate 100-day average volume
-        avg_volume = data['volume'].rolling(window=self.params['volume_period']).mean()
+        avg_volume = cached_indicator(self, context, data, ('sma', 'volume', self.params['volume_period']),
+                                      lambda: data['volume'].rolling(window=self.params['volume_period']).mean())
         
-        # Initialize signals
-        signals = pd.Series(0, index=data.index)
+        # Entry Rule: Current day's volume > 100-day average volume
+        # (from the bar after the first full window; NaN averages never match)
+        breakout = (data['volume'] > avg_volume).to_numpy(copy=True)
+        breakout[:self.params['volume_period']] = False
+        signals = pd.Series(breakout.astype(int), index=data.index)
         
-        # Generate buy signals when current volume > average volume
-        for i in range(self.params['volume_period'], len(data)):
-            current_volume = data['volume'].iloc[i]
-            current_avg_volume = avg_volume.iloc[i]
+        self.signals = signals
+        self.trades = TradeLedger.from_signals(signals.values, data['close'].values)
+        return pd.DataFrame({'Signal': signals}, index=data.index)
+
+    def _iter_volume_ratio_chunks(self, volumes, period, chunk_size):
+        """
+        Yield (start, end, volume_ratio, breakout) for consecutive blocks of
+        dates. Rolling sums come from cumulative sums over the block plus
+        the previous `period` rows, so memory is bounded by chunk_size.
+        """
+        n_dates = volumes.shape[0]
+        for start in range(0, n_dates, chunk_size):
+            end = min(n_dates, start + chunk_size)
+            lo = max(0, start - period)
+            block = volumes[lo:end]
+            
+            valid = ~np.isnan(block)
+            sums = np.zeros((len(block) + 1, block.shape[1]))
+            counts = np.zeros((len(block) + 1, block.shape[1]), dtype=np.int64)
+            np.cumsum(np.where(valid, block, 0.0), axis=0, out=sums[1:])
+            np.cumsum(valid, axis=0, out=counts[1:])
+            
+            # Window of `period` rows ending at each row of the chunk
+            rows = np.arange(start - lo, end - lo)
+            window_start = np.maximum(rows + 1 - period, 0)
+            window_sum = sums[rows + 1] - sums[window_start]
+            window_count = counts[rows + 1] - counts[window_start]
             
-            # Skip if we don't have enough data for average volume
-            if pd.isna(current_avg_volume):
-                continue
+            with np.errstate(invalid='ignore', divide='ignore'):
+                avg_volume = np.where(window_count == period, window_sum / period, np.nan)
+                volume_ratio = block[rows] / avg_volume
             
-            # Entry Rule: Current day's volume > 100-day average volume
-            if current_volume > current_avg_volume:
-                signals.iloc[i] = 1  # Buy signal
+            # Same rule as generate_signals: volume > average, from row `period`
+            breakout = volume_ratio > 1.0
+            breakout[np.arange(start, end) < period] = False
+            
+            yield start, end, volume_ratio, breakout
+
+    def _top_k(self, volume_ratio, top_k):
+        """Column indices and ratios of the top_k ratios per row, highest first."""
+        scores = np.where(np.isnan(volume_ratio), -np.inf, volume_ratio)
+        top_k = min(top_k, scores.shape[1])
+        if top_k < scores.shape[1]:
+            top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def scan_universe(self, volumes, top_k=10, chunk_size=512):
+        """
+        Vectorized volume breakout scan over a whole universe.
+        
+        Args:
+            volumes (pd.DataFrame): Volume matrix, dates x symbols.
+            top_k (int): Number of most unusual volumes to rank per date.
+            chunk_size (int): Dates processed per block.
+        
+        Returns:
+            dict: 'breakout' (bool) and 'volume_ratio' DataFrames shaped like
+                  volumes, plus 'top_symbols' and 'top_ratios' DataFrames
+                  (dates x top_k, highest volume ratio first).
+        """
+        period = self.params['volume_period']
+        values = volumes.to_numpy(dtype=np.float64)
+        symbols = np.asarray(volumes.columns)
+        top_k = min(top_k, values.shape[1])
+        
+        volume_ratio = np.empty(values.shape)
+        breakout = np.empty(values.shape, dtype=bool)
+        top_symbols = np.empty((len(values), top_k), dtype=object)
+        top_ratios = np.empty((len(values), top_k))
+        
+        for start, end, ratio, flags in self._iter_volume_ratio_chunks(values, period, chunk_size):
+            volume_ratio[start:end] = ratio
+            breakout[start:end] = flags
+            top, scores = self._top_k(ratio, top_k)
+            top_symbols[start:end] = symbols[top]
+            top_ratios[start:end] = np.where(np.isfinite(scores), scores, np.nan)
+        
+        return {
+            'breakout': pd.DataFrame(breakout, index=volumes.index, columns=volumes.columns),
+            'volume_ratio': pd.DataFrame(volume_ratio, index=volumes.index, columns=volumes.columns),
+            'top_symbols': pd.DataFrame(top_symbols, index=volumes.index),
+            'top_ratios': pd.DataFrame(top_ratios, index=volumes.index)
+        }
+
+    def iter_volume_screen(self, volumes, top_k=10, chunk_size=512):
+        """
+        Streaming daily screen of the most unusual volume.
+        
+        Args:
+            volumes (pd.DataFrame): Volume matrix, dates x symbols.
+            top_k (int): Number of symbols per date.
+            chunk_size (int): Dates processed per block.
+        
+        Yields:
+            tuple: (date, [(symbol, volume_ratio), ...]) for each date with at
+                   least one full average window, highest ratio first.
+        """
+        period = self.params['volume_period']
+        values = volumes.to_numpy(dtype=np.float64)
+        symbols = np.asarray(volumes.columns)
+        
+        for start, end, ratio, _ in self._iter_volume_ratio_chunks(values, period, chunk_size):
+            top, scores = self._top_k(ratio, top_k)
+            for row in range(end - start):
+                if start + row < period:
+                    continue
+                finite = np.isfinite(scores[row])
+                yield volumes.index[start + row], list(zip(symbols[top[row][finite]], scores[row][finite]))
+
+    def _get_volume_profile(self):
+        """Create the intraday volume profile on first use."""
+        if self.volume_profile is None:
+            self.volume_profile = IntradayVolumeProfile(
+                lookback_days=self.params.get('profile_days', 20),
+                session_start=self.params.get('session_start', '09:15'),
+                session_minutes=self.params.get('session_minutes', 375)
+            )
+        return self.volume_profile
+
+    def generate_intraday_signals(self, data, context=None):
+        """
+        Intraday mode: compare cumulative session volume with the average
+        cumulative volume at the same minute over the previous profile_days
+        sessions, so breakouts show up minutes after they start instead of
+        after the close. The live profile is not modified; seed it with
+        update_profile.
+        
+        Args:
+            data (pd.DataFrame): Intraday bars with 'date' timestamps and
+                                 'volume' (one symbol).
+            context (dict, optional): Unused.
+        
+        Returns:
+            pd.DataFrame: 'Signal' (1 while relative volume > threshold) and
+                          'relative_volume' columns.
+        """
+        if data is None or len(data) == 0:
+            return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
+        
+        profile = self._get_volume_profile()
+        profile_days = profile.lookback_days
+        symbol = data['symbol'].iloc[0] if 'symbol' in data.columns else 'default'
+        
+        sessions, curves, session_codes, minutes, cum_volume = profile.session_curves(data['date'], data['volume'])
+        
+        # Expected curve for each session = mean of the previous profile_days curves
+        cumulative = np.zeros((len(sessions) + 1, profile.session_minutes))
+        np.cumsum(curves, axis=0, out=cumulative[1:])
+        expected = np.full((len(sessions), profile.session_minutes), np.nan)
+        expected[profile_days:] = (cumulative[profile_days:-1] - cumulative[:-profile_days - 1]) / profile_days
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            relative_volume = cum_volume / expected[session_codes, minutes]
+        
+        # Entry Rule: cumulative volume so far > expected volume by this minute
+        threshold = self.params.get('relative_volume_threshold', 1.0)
+        signals = pd.Series(np.where(relative_volume > threshold, 1, 0), index=data.index)
         
         self.signals = signals
-        return pd.DataFrame({'Signal': signals}, index=data.index)
+        if 'close' in data.columns:
+            self.trades = TradeLedger.from_signals(signals.values, data['close'].values, symbols=[symbol])
+        return pd.DataFrame({'Signal': signals, 'relative_volume': relative_volume}, index=data.index)
+
+    def update_profile(self, data):
+        """
+        Seed the live intraday profile from historical bars.
+        
+        Only complete sessions that are newer than the symbol's profile are
+        added: the last session in data counts once it has a bar in the final
+        minute of the session. Calling this again with overlapping or
+        still-running data does not count a session twice.
+        
+        Args:
+            data (pd.DataFrame): Intraday bars with 'date' timestamps and
+                                 'volume' (one symbol, optional 'symbol').
+        
+        Returns:
+            int: Number of sessions added
+        """
+        if data is None or len(data) == 0:
+            return 0
+        
+        profile = self._get_volume_profile()
+        symbol = data['symbol'].iloc[0] if 'symbol' in data.columns else 'default'
+        sessions, curves, session_codes, minutes, _ = profile.session_curves(data['date'], data['volume'])
+        
+        last_session_closed = minutes[session_codes == len(sessions) - 1].max() >= profile.session_minutes - 1
+        complete = len(sessions) if last_session_closed else len(sessions) - 1
+        return profile.add_sessions(symbol, sessions[:complete], curves[:complete])
+
+    def update_intraday_tick(self, symbol, timestamp, volume):
+        """
+        Live intraday update in O(1) per tick.
+        
+        Args:
+            symbol (str): Instrument symbol
+            timestamp (datetime): Tick time
+            volume (float): Volume traded since the previous tick
+        
+        Returns:
+            bool: True if the symbol is in a volume breakout right now
+        """
+        profile = self._get_volume_profile()
+        relative_volume = profile.update_tick(symbol, timestamp, volume)
+        sid = profile.symbol_id(symbol)
+        return bool(profile.is_ready(sid) and relative_volume > self.params.get('relative_volume_threshold', 1.0))
+
+    def close_intraday_session(self):
+        """Fold today's curves into the profile after the close."""
+        self._get_volume_profile().close_day()
+
+    def snapshot_state(self):
+        """
+        Intraday profile state as arrays plus metadata
+        (see state_snapshot.StateCheckpointer).
+
+        Returns:
+            tuple: ({name: np.ndarray}, JSON-serializable meta)
+        """
+        profile = self._get_volume_profile()
+        return profile.to_arrays('profile.'), {'symbols': list(profile.symbol_state.symbols)}
+
+    def restore_state(self, arrays, meta):
+        """
+        Restore state written by snapshot_state.
+
+        Args:
+            arrays (dict): Arrays from the snapshot (may be memory-mapped)
+            meta (dict): Metadata from the snapshot
+        """
+        self._get_volume_profile().load_arrays(arrays, meta['symbols'], 'profile.')
 
     def description(self):
         """
@@ -108,6 +344,10 @@ class VolumeBreakoutStrategy(Strategy):
         
         Entry: When current day's volume > 100-day average volume
         Exit: No specific exit rules (position management not specified)
+        
+        Intraday mode compares cumulative volume so far with the average
+        cumulative volume at the same minute of the session over the last
+        20 sessions, signalling breakouts minutes after they start.
         """
 
     def parameter_schema(self):
@@ -135,6 +375,20 @@ class VolumeBreakoutStrategy(Strategy):
                 "max": 10.0,
                 "default": 1.0,
                 "description": "Position size multiplier"
+            },
+            "profile_days": {
+                "type": "int",
+                "min": 5,
+                "max": 60,
+                "default": 20,
+                "description": "Sessions averaged for the intraday volume profile"
+            },
+            "relative_volume_threshold": {
+                "type": "float",
+                "min": 1.0,
+                "max": 5.0,
+                "default": 1.0,
+                "description": "Intraday breakout when cumulative volume exceeds this multiple of the profile"
             }
         }
 
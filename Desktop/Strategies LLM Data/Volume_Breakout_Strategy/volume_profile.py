@@ -0,0 +1,264 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from symbol_state_store import SymbolStateStore
+
+
+class IntradayVolumeProfile:
+    """
+    Time-of-day cumulative volume profile per symbol.
+
+    For every symbol the profile keeps the cumulative-volume curve by minute
+    of session for each of the last `lookback_days` sessions in a ring
+    buffer, plus the running sum of those curves, so the expected cumulative
+    volume at any minute is one array read and adding a finished day costs
+    O(session_minutes). Live ticks only update the symbol's running
+    cumulative volume, and the relative volume (live / expected) is O(1).
+
+    Curves are stored as float32 in (symbols x lookback_days x minutes) and
+    (symbols x minutes) arrays that grow with the symbol store.
+    """
+
+    def __init__(self, lookback_days=20, session_start='09:15', session_minutes=375, capacity=256):
+        """
+        Initialize empty profiles.
+        Args:
+            lookback_days (int): Number of past sessions averaged.
+            session_start (str): Session open as 'HH:MM' (exchange time).
+            session_minutes (int): Session length in minutes.
+            capacity (int): Initial number of symbol slots.
+        """
+        self.lookback_days = lookback_days
+        self.session_start = pd.Timedelta(hours=int(session_start[:2]), minutes=int(session_start[3:5]))
+        self.session_minutes = session_minutes
+
+        self.symbol_state = SymbolStateStore(
+            fields={
+                'cum_volume': (np.float64, 0.0),
+                'last_minute': (np.int64, -1),
+                'days': (np.int64, 0),
+                'slot': (np.int64, 0),
+                'session': ('datetime64[ns]', np.datetime64('NaT')),
+                'last_session': ('datetime64[ns]', np.datetime64('NaT'))
+            },
+            capacity=capacity
+        )
+        self._allocate(self.symbol_state.capacity)
+
+    def _allocate(self, capacity):
+        """(Re)allocate curve arrays, keeping existing profiles."""
+        old_curves = getattr(self, 'curves', None)
+        old_sum = getattr(self, 'curve_sum', None)
+        old_today = getattr(self, 'today', None)
+
+        self.curves = np.zeros((capacity, self.lookback_days, self.session_minutes), dtype=np.float32)
+        self.curve_sum = np.zeros((capacity, self.session_minutes), dtype=np.float64)
+        self.today = np.zeros((capacity, self.session_minutes), dtype=np.float32)
+
+        if old_curves is not None:
+            n = len(old_curves)
+            self.curves[:n] = old_curves
+            self.curve_sum[:n] = old_sum
+            self.today[:n] = old_today
+
+    def symbol_id(self, symbol):
+        """Dense id of a symbol, growing the curve arrays if needed."""
+        sid = self.symbol_state.symbol_id(symbol)
+        if self.symbol_state.capacity > len(self.curves):
+            self._allocate(self.symbol_state.capacity)
+        return sid
+
+    def minute_of_session(self, timestamp):
+        """
+        Minute index of a timestamp within the session.
+
+        Args:
+            timestamp (datetime-like or array-like): Tick time(s)
+
+        Returns:
+            int or np.ndarray: Minute index clipped to [0, session_minutes - 1]
+        """
+        if np.ndim(timestamp) == 0:
+            ts = pd.Timestamp(timestamp)
+            minute = int((ts - ts.normalize() - self.session_start) // pd.Timedelta(minutes=1))
+            return min(max(minute, 0), self.session_minutes - 1)
+
+        times = pd.DatetimeIndex(timestamp)
+        minutes = (times - times.normalize() - self.session_start) // pd.Timedelta(minutes=1)
+        return np.clip(np.asarray(minutes, dtype=np.int64), 0, self.session_minutes - 1)
+
+    def expected_volume(self, symbol_id, minute):
+        """
+        Average cumulative volume at a minute over the stored sessions.
+
+        Args:
+            symbol_id (int or np.ndarray): Symbol id(s)
+            minute (int or np.ndarray): Minute index(es)
+
+        Returns:
+            float or np.ndarray: Expected cumulative volume (NaN without history)
+        """
+        days = self.symbol_state.state['days'][symbol_id]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(days > 0, self.curve_sum[symbol_id, minute] / np.maximum(days, 1), np.nan)
+
+    def is_ready(self, symbol_id):
+        """True once a full lookback of sessions is stored."""
+        return self.symbol_state.state['days'][symbol_id] >= self.lookback_days
+
+    def update_tick(self, symbol, timestamp, volume):
+        """
+        Add a tick's traded volume and return the live relative volume.
+
+        Args:
+            symbol (str): Instrument symbol
+            timestamp (datetime-like): Tick time
+            volume (float): Volume traded since the previous tick
+
+        Returns:
+            float: Live cumulative volume / expected cumulative volume at this
+                   minute (NaN without history)
+        """
+        sid = self.symbol_id(symbol)
+        minute = self.minute_of_session(timestamp)
+        state = self.symbol_state.state
+        if state['last_minute'][sid] < 0:
+            state['session'][sid] = np.datetime64(pd.Timestamp(timestamp).normalize(), 'ns')
+
+        cum_volume = state['cum_volume'][sid] + volume
+        state['cum_volume'][sid] = cum_volume
+        state['last_minute'][sid] = max(state['last_minute'][sid], minute)
+        self.today[sid, minute] = cum_volume
+
+        expected = self.expected_volume(sid, minute)
+        return cum_volume / expected if expected > 0 else np.nan
+
+    def close_day(self):
+        """
+        Store today's curves for every symbol that traded and reset the
+        intraday counters. Minutes without ticks carry the cumulative volume
+        forward.
+        """
+        state = self.symbol_state.state
+        n = len(self.symbol_state)
+        ids = np.flatnonzero(state['last_minute'][:n] >= 0)
+        if len(ids) == 0:
+            return
+
+        curves = np.maximum.accumulate(self.today[ids], axis=1)
+        self.add_curves(ids, curves)
+        state['last_session'][ids] = state['session'][ids]
+
+        self.today[ids] = 0
+        state['cum_volume'][ids] = 0.0
+        state['last_minute'][ids] = -1
+
+    def add_curves(self, symbol_ids, curves):
+        """
+        Add one finished session's cumulative curve per symbol.
+
+        Args:
+            symbol_ids (np.ndarray): Symbol ids (unique)
+            curves (np.ndarray): symbols x session_minutes cumulative volumes
+        """
+        symbol_ids = np.asarray(symbol_ids, dtype=np.int64)
+        state = self.symbol_state.state
+        slots = state['slot'][symbol_ids]
+
+        # Drop the oldest curve once the ring is full
+        full = state['days'][symbol_ids] >= self.lookback_days
+        self.curve_sum[symbol_ids[full]] -= self.curves[symbol_ids[full], slots[full]]
+
+        self.curves[symbol_ids, slots] = curves
+        self.curve_sum[symbol_ids] += self.curves[symbol_ids, slots]
+        state['slot'][symbol_ids] = (slots + 1) % self.lookback_days
+        state['days'][symbol_ids] = np.minimum(state['days'][symbol_ids] + 1, self.lookback_days)
+
+    def add_sessions(self, symbol, sessions, curves):
+        """
+        Add finished sessions of one symbol that are newer than the last
+        session already in its profile.
+
+        Args:
+            symbol (str): Instrument symbol
+            sessions (array-like): Session dates (sorted)
+            curves (np.ndarray): sessions x session_minutes cumulative volumes
+
+        Returns:
+            int: Number of sessions added
+        """
+        sid = self.symbol_id(symbol)
+        sessions = np.asarray(sessions, dtype='datetime64[ns]')
+        last_session = self.symbol_state.state['last_session'][sid]
+        new = np.ones(len(sessions), dtype=bool) if np.isnat(last_session) else sessions > last_session
+        sessions, curves = sessions[new][-self.lookback_days:], curves[new][-self.lookback_days:]
+        for curve in curves:
+            self.add_curves([sid], curve[None, :])
+        if len(sessions):
+            self.symbol_state.state['last_session'][sid] = sessions[-1]
+        return len(sessions)
+
+    def session_curves(self, timestamps, volumes):
+        """
+        Cumulative volume curves of one symbol for each session in a set of
+        intraday bars.
+
+        Args:
+            timestamps (pd.Series): Bar timestamps (sorted)
+            volumes (pd.Series): Bar volumes
+
+        Returns:
+            tuple: (session dates, sessions x session_minutes curves,
+                    per-bar session index, per-bar minute index,
+                    per-bar cumulative volume within the session)
+        """
+        times = pd.DatetimeIndex(timestamps)
+        session_codes, sessions = pd.factorize(times.normalize(), sort=True)
+        minutes = self.minute_of_session(times)
+        volumes = np.asarray(volumes, dtype=np.float64)
+
+        cum_volume = pd.Series(volumes).groupby(session_codes).cumsum().values
+        curves = np.zeros((len(sessions), self.session_minutes), dtype=np.float32)
+        np.maximum.at(curves, (session_codes, minutes), cum_volume.astype(np.float32))
+        curves = np.maximum.accumulate(curves, axis=1)
+
+        return sessions, curves, session_codes, minutes, cum_volume
+
+    def to_arrays(self, prefix=''):
+        """
+        Profiles of the registered symbols as plain arrays (for snapshots).
+
+        Args:
+            prefix (str): Prefix for the array names
+
+        Returns:
+            dict: {name: array}; symbol order is self.symbol_state.symbols
+        """
+        n = len(self.symbol_state)
+        arrays = self.symbol_state.to_arrays(prefix)
+        arrays[prefix + 'curves'] = self.curves[:n]
+        arrays[prefix + 'curve_sum'] = self.curve_sum[:n]
+        arrays[prefix + 'today'] = self.today[:n]
+        return arrays
+
+    def load_arrays(self, arrays, symbols, prefix=''):
+        """
+        Restore profiles written by to_arrays.
+
+        Args:
+            arrays (dict): {name: array}
+            symbols (list): Symbols in id order
+            prefix (str): Prefix used when the arrays were written
+        """
+        curves = arrays[prefix + 'curves']
+        if curves.shape[1:] != (self.lookback_days, self.session_minutes):
+            raise ValueError("Snapshot profile shape does not match lookback_days / session_minutes")
+        self.symbol_state.load_arrays(arrays, symbols, prefix)
+        self.curves = self.curve_sum = self.today = None
+        self._allocate(self.symbol_state.capacity)
+        n = len(symbols)
+        self.curves[:n] = curves
+        self.curve_sum[:n] = arrays[prefix + 'curve_sum']
+        self.today[:n] = arrays[prefix + 'today']
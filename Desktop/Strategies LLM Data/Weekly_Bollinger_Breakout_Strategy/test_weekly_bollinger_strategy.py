@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming WeeklyBollingerStrategy
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.event_engine import EventEngine, FillEvent, MarketEvent
+from Weekly_Bollinger_Breakout_Strategy.weekly_bollinger_strategy import WeeklyBollingerStrategy
+
+
+def make_strategy():
+    return WeeklyBollingerStrategy(EventEngine(), logging.getLogger('test'), 'test',
+                                   bollinger_period=3, ma_period=5)
+
+
+def feed(strategy, ticks):
+    async def main():
+        for symbol, price, timestamp in ticks:
+            await strategy.handle_market_event(MarketEvent(symbol, price, timestamp, 10.0))
+    asyncio.run(main())
+
+
+def test_positions_is_a_mutable_mapping_backed_by_the_store():
+    strategy = make_strategy()
+    feed(strategy, [('INFY', 100.0, datetime(2024, 1, 29, 10)), ('TCS', 50.0, datetime(2024, 1, 30, 10))])
+
+    assert dict(strategy.positions) == {'INFY': 'FLAT', 'TCS': 'FLAT'}
+    strategy.positions['INFY'] = 'LONG'
+    assert strategy.symbol_state.get('INFY', 'position') == 1
+    assert strategy.get_strategy_status('INFY')['position'] == 'LONG'
+
+    asyncio.run(strategy.handle_fill_event(FillEvent('INFY', 'SELL', 100, 101.0)))
+    assert strategy.positions['INFY'] == 'FLAT'
+    assert 'WIPRO' not in strategy.positions
+
+
+def test_status_reports_iso_week_numbers():
+    strategy = make_strategy()
+    feed(strategy, [('INFY', 100.0, datetime(2024, 1, 29, 10)), ('INFY', 101.0, datetime(2024, 2, 5, 10))])
+
+    status = strategy.get_strategy_status('INFY')
+    assert status['last_week'] == 6
+    assert strategy.get_strategy_status('TCS')['last_week'] is None
+
+    overall = strategy.get_strategy_status()
+    assert overall['last_weeks'] == {'INFY': 6}
+    assert overall['positions'] == {'INFY': 'FLAT'} and type(overall['positions']) is dict
+    assert overall['weekly_data_counts'] == {'INFY': 1}
@@ -4,6 +4,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strat2 import Strategy
+from bar_resampler import BarResampler
+from trade_ledger import TradeLedger
 
 class WeeklyBollingerBreakoutStrategy(Strategy):
     """
@@ -24,7 +26,8 @@ class WeeklyBollingerBreakoutStrategy(Strategy):
             'bollinger_period': 50,
             'bollinger_std': 2.0,
             'ma_period': 200,
-            'position_size': 1.0
+            'position_size': 1.0,
+            'bar_interval': None  # e.g. '1W' to resample daily input to ISO weeks (None = use bars as given)
         }
         self.signals = None
         self.trades = None
@@ -73,43 +76,77 @@ class WeeklyBollingerBreakoutStrategy(Strategy):
             pd.DataFrame: Must include a 'Signal' column 
                           (1=long, -1=short, 0=flat, or fractional weights).
         """
-        if data is None or len(data) < max(self.params['bollinger_period'], self.params['ma_period']):
+        bars, bar_rows = self.weekly_bars(data)
+        if bars is None or len(bars) < max(self.params['bollinger_period'], self.params['ma_period']):
             return pd.DataFrame(index=data.index if data is not None else [], columns=['Signal'])
         
         # Calculate Bollinger Bands
-        sma_50 = data['close'].rolling(window=self.params['bollinger_period']).mean()
-        std_50 = data['close'].rolling(window=self.params['bollinger_period']).std()
-        upper_band = sma_50 + (self.params['bollinger_std'] * std_50)
+        sma_50 = bars['close'].rolling(window=self.params['bollinger_period']).mean()
+        std_50 = bars['close'].rolling(window=self.params['bollinger_period']).std()
+        upper_band = (sma_50 + (self.params['bollinger_std'] * std_50)).values
         
         # Calculate 200-period Moving Average
-        ma_200 = data['close'].rolling(window=self.params['ma_period']).mean()
+        ma_200 = bars['close'].rolling(window=self.params['ma_period']).mean().values
+        closes = bars['close'].values
         
-        # Initialize signals
-        signals = pd.Series(0, index=data.index)
+        # Initialize signals (one per input row; bar signals land on each bar's last row)
+        signal_values = np.zeros(len(data), dtype=np.int64)
         
         # State-based logic
-        for i in range(max(self.params['bollinger_period'], self.params['ma_period']), len(data)):
-            current_close = data['close'].iloc[i]
-            current_upper_band = upper_band.iloc[i]
-            current_ma_200 = ma_200.iloc[i]
+        for i in range(max(self.params['bollinger_period'], self.params['ma_period']), len(bars)):
+            current_close = closes[i]
+            current_upper_band = upper_band[i]
+            current_ma_200 = ma_200[i]
             
             # Skip if we don't have enough data for indicators
-            if pd.isna(current_upper_band) or pd.isna(current_ma_200):
+            if np.isnan(current_upper_band) or np.isnan(current_ma_200):
                 continue
                 
             # Entry Rule: Close > Upper Bollinger Band (only if no position)
             if self.position == 0 and current_close > current_upper_band:
-                signals.iloc[i] = 1  # Buy signal
+                signal_values[bar_rows[i]] = 1  # Buy signal
                 self.position = 1
                 
             # Exit Rule: Close < 200 MA (only if we have a position)
             elif self.position == 1 and current_close < current_ma_200:
-                signals.iloc[i] = -1  # Sell signal
+                signal_values[bar_rows[i]] = -1  # Sell signal
                 self.position = 0
         
+        signals = pd.Series(signal_values, index=data.index)
         self.signals = signals
+        
+        # Trades on the bars (holding_bars counts bars), indexed by input row
+        trades = TradeLedger.from_signals(signal_values[bar_rows], closes)
+        trades.entry_index = bar_rows[trades.entry_index].astype(np.int64)
+        trades.exit_index = bar_rows[trades.exit_index].astype(np.int64)
+        self.trades = trades
         return pd.DataFrame({'Signal': signals}, index=data.index)
 
+    def weekly_bars(self, data):
+        """
+        Bars the strategy runs on.
+
+        With params['bar_interval'] set (e.g. '1W' for daily input) and a
+        'date' column, rows are resampled to bars of that interval aligned to
+        ISO year-weeks; otherwise (the default) the input rows are used as
+        given. bollinger_period and ma_period count bars after resampling,
+        so 200 weekly bars need about four years of daily rows.
+
+        Args:
+            data (pd.DataFrame): Input OHLCV data.
+
+        Returns:
+            tuple: (bars DataFrame with a 'close' column or None,
+                    row position in data of each bar's last row)
+        """
+        if data is None:
+            return None, None
+        interval = self.params.get('bar_interval')
+        if not interval or 'date' not in data.columns:
+            return data.reset_index(drop=True), np.arange(len(data))
+        bars = BarResampler(interval).resample(data)
+        return bars, bars['last_row'].values
+
     def description(self):
         """
         Text description of what the strategy does.
@@ -121,6 +158,10 @@ class WeeklyBollingerBreakoutStrategy(Strategy):
         Entry: When weekly closing price breaks above the upper Bollinger Band (50-period, 2 std dev)
         Exit: When weekly closing price falls below the 200-period moving average
         
+        With bar_interval='1W', daily (or intraday) input is resampled to ISO
+        year-week bars first and signals are placed on the last input row of
+        each week; by default the input bars are used as given.
+        
         This strategy captures strong upward breakouts while using the 200 MA as a 
         long-term trend filter for risk management. It maintains only one position 
         at a time with no pyramiding.
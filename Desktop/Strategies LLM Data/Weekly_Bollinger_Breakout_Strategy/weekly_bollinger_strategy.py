@@ -1,3 +1,7 @@
+import sys
+import os
+from collections.abc import MutableMapping
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.base_strategy import BaseStrategy
 from datetime import datetime
 from typing import Dict, Any, List
@@ -5,6 +9,44 @@ from engine.event_engine import MarketEvent, FillEvent, SignalEvent, EventEngine
 import logging
 import pandas as pd
 import numpy as np
+from symbol_state_store import SymbolStateStore
+from bar_resampler import BarResampler
+
+class PositionMap(MutableMapping):
+    """
+    {symbol: 'LONG' or 'FLAT'} view of the position field of a SymbolStateStore.
+
+    Reads and writes go to the store, so code that used to read or assign
+    strategy.positions[symbol] keeps working.
+    """
+
+    def __init__(self, store: SymbolStateStore):
+        self.store = store
+
+    def __getitem__(self, symbol):
+        if symbol not in self.store:
+            raise KeyError(symbol)
+        return 'LONG' if self.store.get(symbol, 'position') == 1 else 'FLAT'
+
+    def __setitem__(self, symbol, value):
+        if value not in ('LONG', 'FLAT'):
+            raise ValueError(f"Position must be 'LONG' or 'FLAT', got {value!r}")
+        self.store.set(symbol, 'position', 1 if value == 'LONG' else 0)
+
+    def __delitem__(self, symbol):
+        if symbol not in self.store:
+            raise KeyError(symbol)
+        self.store.set(symbol, 'position', 0)
+
+    def __iter__(self):
+        return iter(list(self.store.symbols))
+
+    def __len__(self):
+        return len(self.store)
+
+    def __repr__(self):
+        return repr(dict(self))
+
 
 class WeeklyBollingerStrategy(BaseStrategy):
     """
@@ -30,13 +72,26 @@ class WeeklyBollingerStrategy(BaseStrategy):
         self.ma_period = ma_period
         self.trade_quantity = trade_quantity
         
-        # Data storage for weekly calculations
-        self.weekly_data = {}  # {symbol: {'prices': [], 'timestamps': [], 'volumes': []}}
-        self.positions = {}    # {symbol: 'LONG' or 'FLAT'}
-        self.last_week = {}    # {symbol: last_processed_week}
+        # Per-symbol position (1 = LONG, 0 = FLAT), running sums for the indicators and rolling weekly history sized
+        # for the longest indicator
+        max_period = max(bollinger_period, ma_period)
+        self.symbol_state = SymbolStateStore(
+            fields={
+                'position': (np.int8, 0),
+                'shift': (np.float64, np.nan),
+                'bb_sum': (np.float64, 0.0),
+                'bb_sumsq': (np.float64, 0.0),
+                'ma_sum': (np.float64, 0.0)
+            },
+            windows={
+                'weekly_close': (max_period, np.float64),
+                'weekly_volume': (max_period, np.float64),
+                'weekly_timestamp': (max_period, 'datetime64[ns]')
+            }
+        )
         
-        # For weekly data aggregation
-        self.current_week_data = {}  # {symbol: {'prices': [], 'volumes': [], 'start_time': None}}
+        # Running OHLCV of the current ISO year-week per symbol (fixed memory per symbol)
+        self.resampler = BarResampler('1W')
         
         self.logger.info(f"[{self.strategy_name}] Initialized with Bollinger Period: {bollinger_period}, "
                         f"Bollinger Std: {bollinger_std}, MA Period: {ma_period}, "
@@ -53,100 +108,63 @@ class WeeklyBollingerStrategy(BaseStrategy):
 
     async def process_tick(self, symbol: str, price: float, volume: float, timestamp: datetime):
         """Process individual tick and aggregate to weekly data."""
-        # Get current week
-        current_week = timestamp.isocalendar()[1]  # Week number
-        current_year = timestamp.year
-        
-        # Initialize data structures if needed
-        if symbol not in self.weekly_data:
-            self.weekly_data[symbol] = {'prices': [], 'volumes': [], 'timestamps': []}
-            self.positions[symbol] = 'FLAT'
-            self.last_week[symbol] = None
-            self.current_week_data[symbol] = {'prices': [], 'volumes': [], 'start_time': None}
-        
-        # Check if this is a new week
-        if self.last_week[symbol] is not None and self.last_week[symbol] != current_week:
-            # Process the completed week
-            await self.process_weekly_data(symbol)
-            # Reset current week data
-            self.current_week_data[symbol] = {'prices': [], 'volumes': [], 'start_time': None}
-        
-        # Add current tick to current week data
-        if self.current_week_data[symbol]['start_time'] is None:
-            self.current_week_data[symbol]['start_time'] = timestamp
-        
-        self.current_week_data[symbol]['prices'].append(price)
-        self.current_week_data[symbol]['volumes'].append(volume)
-        
-        # Update last week
-        self.last_week[symbol] = current_week
-
-    async def process_weekly_data(self, symbol: str):
-        """Process completed weekly data and generate signals."""
-        if not self.current_week_data[symbol]['prices']:
+        # Register new symbols as FLAT on their first tick
+        if symbol not in self.symbol_state:
+            self.symbol_state.symbol_id(symbol)
+
+        # Add current tick to the running weekly bar (O(1)); the previous
+        # week's bar comes back when this tick starts a new week
+        completed = self.resampler.update(symbol, price, volume, timestamp)
+        if completed is not None:
+            await self.process_weekly_data(symbol, completed)
+
+    async def process_weekly_data(self, symbol: str, bar: Dict[str, Any] = None):
+        """Process a completed weekly bar (default: the symbol's current bar) and generate signals."""
+        if bar is None:
+            bar = self.resampler.current_bar(symbol)
+        if bar is None:
             return
         
-        # Calculate weekly OHLCV
-        prices = self.current_week_data[symbol]['prices']
-        volumes = self.current_week_data[symbol]['volumes']
+        # Weekly OHLCV from the running bar
+        weekly_close = bar['close']
+        weekly_volume = bar['volume']
+        weekly_timestamp = bar['start_time']
         
-        weekly_open = prices[0]
-        weekly_high = max(prices)
-        weekly_low = min(prices)
-        weekly_close = prices[-1]
-        weekly_volume = sum(volumes)
-        weekly_timestamp = self.current_week_data[symbol]['start_time']
-        
-        # Add to weekly data
-        self.weekly_data[symbol]['prices'].append(weekly_close)
-        self.weekly_data[symbol]['volumes'].append(weekly_volume)
-        self.weekly_data[symbol]['timestamps'].append(weekly_timestamp)
-        
-        # Keep only enough data for calculations
-        max_period = max(self.bollinger_period, self.ma_period)
-        if len(self.weekly_data[symbol]['prices']) > max_period:
-            self.weekly_data[symbol]['prices'] = self.weekly_data[symbol]['prices'][-max_period:]
-            self.weekly_data[symbol]['volumes'] = self.weekly_data[symbol]['volumes'][-max_period:]
-            self.weekly_data[symbol]['timestamps'] = self.weekly_data[symbol]['timestamps'][-max_period:]
+        # Add to weekly data (ring buffers keep only enough for calculations)
+        sid = [self.symbol_state.symbol_id(symbol)]
+        upper_band, ma_200 = self.update_weekly_indicators(sid, [weekly_close])
+        self.symbol_state.push(sid, 'weekly_volume', [weekly_volume])
+        self.symbol_state.push(sid, 'weekly_timestamp', [weekly_timestamp])
         
         # Need enough data for both indicators
-        if len(self.weekly_data[symbol]['prices']) < max_period:
+        max_period = max(self.bollinger_period, self.ma_period)
+        if self.symbol_state.window_count(sid, 'weekly_close')[0] < max_period:
             return
         
-        # Calculate indicators
-        prices_series = pd.Series(self.weekly_data[symbol]['prices'])
-        
-        # Bollinger Bands
-        sma_50 = prices_series.rolling(window=self.bollinger_period).mean()
-        std_50 = prices_series.rolling(window=self.bollinger_period).std()
-        upper_band = sma_50 + (self.bollinger_std * std_50)
-        
-        # 200-period Moving Average
-        ma_200 = prices_series.rolling(window=self.ma_period).mean()
-        
         # Get current values
         current_close = weekly_close
-        current_upper_band = upper_band.iloc[-1]
-        current_ma_200 = ma_200.iloc[-1]
+        current_upper_band = upper_band[0]
+        current_ma_200 = ma_200[0]
         
         # Skip if we don't have enough data
-        if pd.isna(current_upper_band) or pd.isna(current_ma_200):
+        if np.isnan(current_upper_band) or np.isnan(current_ma_200):
             return
         
         # Generate signals
         signal_type = None
         
         # Entry Rule: Close > Upper Bollinger Band (only if no position)
-        if self.positions[symbol] == 'FLAT' and current_close > current_upper_band:
+        position = self.symbol_state.get(symbol, 'position')
+        if position == 0 and current_close > current_upper_band:
             signal_type = 'BUY'
-            self.positions[symbol] = 'LONG'
+            self.symbol_state.set(symbol, 'position', 1)
             self.logger.info(f"[{self.strategy_name}] {symbol}: Weekly close {current_close:.2f} > "
                            f"Upper BB {current_upper_band:.2f}. BUY signal generated.")
         
         # Exit Rule: Close < 200 MA (only if we have a position)
-        elif self.positions[symbol] == 'LONG' and current_close < current_ma_200:
+        elif position == 1 and current_close < current_ma_200:
             signal_type = 'SELL'
-            self.positions[symbol] = 'FLAT'
+            self.symbol_state.set(symbol, 'position', 0)
             self.logger.info(f"[{self.strategy_name}] {symbol}: Weekly close {current_close:.2f} < "
                            f"200 MA {current_ma_200:.2f}. SELL signal generated.")
         
@@ -162,6 +180,66 @@ class WeeklyBollingerStrategy(BaseStrategy):
             )
             await self.event_engine.put(signal)
 
+    def update_weekly_indicators(self, ids, closes):
+        """
+        Add completed weekly closes and return the latest indicator values.
+
+        Running sums of the last `bollinger_period` closes (and their squares)
+        and of the last `ma_period` closes are kept per symbol, so each week
+        costs O(1) per symbol: add the new close and subtract the one leaving
+        each window, read from the close ring buffer. Sums are taken relative
+        to the symbol's first close to limit cancellation in the variance, and
+        are recomputed from the ring buffer each time it wraps so rounding
+        error can't accumulate. Vectorized over symbols, so a batch of week
+        closes is one call.
+
+        Args:
+            ids (array-like): Symbol ids from self.symbol_state (unique)
+            closes (array-like): Weekly close per id
+
+        Returns:
+            tuple: (upper Bollinger band, 200-period MA) arrays, NaN until the
+                   respective window is full
+        """
+        store = self.symbol_state
+        state = store.state
+        ids = np.asarray(ids, dtype=np.int64)
+        closes = np.asarray(closes, dtype=np.float64)
+        bb_period, ma_period = self.bollinger_period, self.ma_period
+        length = max(bb_period, ma_period)
+
+        shift = state['shift'][ids]
+        shift = np.where(np.isnan(shift), closes, shift)
+        state['shift'][ids] = shift
+
+        # Closes leaving each window (the ring head is the next write slot)
+        window = store.windows['weekly_close']
+        heads = store.window_heads['weekly_close'][ids]
+        counts = store.window_counts['weekly_close'][ids]
+        bb_out = np.where(counts >= bb_period, window[ids, (heads - bb_period) % length] - shift, 0.0)
+        ma_out = np.where(counts >= ma_period, window[ids, (heads - ma_period) % length] - shift, 0.0)
+
+        x = closes - shift
+        state['bb_sum'][ids] += x - bb_out
+        state['bb_sumsq'][ids] += x * x - bb_out * bb_out
+        state['ma_sum'][ids] += x - ma_out
+        store.push(ids, 'weekly_close', closes)
+
+        # Resync sums once per ring cycle (a wrapped ring is oldest-first)
+        wrapped = ids[store.window_heads['weekly_close'][ids] == 0]
+        if len(wrapped):
+            block = window[wrapped] - state['shift'][wrapped, None]
+            state['bb_sum'][wrapped] = block[:, -bb_period:].sum(axis=1)
+            state['bb_sumsq'][wrapped] = (block[:, -bb_period:] ** 2).sum(axis=1)
+            state['ma_sum'][wrapped] = block[:, -ma_period:].sum(axis=1)
+
+        counts = store.window_counts['weekly_close'][ids]
+        bb_mean = state['bb_sum'][ids] / bb_period
+        bb_var = np.maximum(state['bb_sumsq'][ids] - bb_period * bb_mean * bb_mean, 0.0) / max(bb_period - 1, 1)
+        upper_band = np.where(counts >= bb_period, shift + bb_mean + self.bollinger_std * np.sqrt(bb_var), np.nan)
+        ma = np.where(counts >= ma_period, shift + state['ma_sum'][ids] / ma_period, np.nan)
+        return upper_band, ma
+
     async def handle_fill_event(self, event: FillEvent):
         """Handle fill events for the WeeklyBollingerStrategy."""
         symbol = event.instrument_token
@@ -172,22 +250,75 @@ class WeeklyBollingerStrategy(BaseStrategy):
         
         # Update position status based on fill
         if transaction_type == 'BUY':
-            self.positions[symbol] = 'LONG'
+            self.symbol_state.set(symbol, 'position', 1)
         elif transaction_type == 'SELL':
-            self.positions[symbol] = 'FLAT'
+            self.symbol_state.set(symbol, 'position', 0)
+
+    def snapshot_state(self):
+        """
+        Streaming state as arrays plus metadata (see state_snapshot.StateCheckpointer).
+
+        Returns:
+            tuple: ({name: np.ndarray}, JSON-serializable meta)
+        """
+        arrays = self.symbol_state.to_arrays('weekly.')
+        bar_arrays, bar_symbols = self.resampler.to_arrays('bars.')
+        arrays.update(bar_arrays)
+        meta = {
+            'symbols': list(self.symbol_state.symbols),
+            'bar_symbols': bar_symbols,
+            'bollinger_period': self.bollinger_period,
+            'ma_period': self.ma_period
+        }
+        return arrays, meta
+
+    def restore_state(self, arrays: Dict[str, Any], meta: Dict[str, Any]):
+        """
+        Restore state written by snapshot_state.
+
+        Args:
+            arrays (dict): Arrays from the snapshot (may be memory-mapped)
+            meta (dict): Metadata from the snapshot
+        """
+        if meta['bollinger_period'] != self.bollinger_period or meta['ma_period'] != self.ma_period:
+            raise ValueError("Snapshot was written with different indicator periods")
+        self.symbol_state.load_arrays(arrays, meta['symbols'], 'weekly.')
+        self.resampler.load_arrays(arrays, meta['bar_symbols'], 'bars.')
+        self.logger.info(f"[{self.strategy_name}] Restored state for {len(meta['symbols'])} symbols")
+
+    @property
+    def positions(self) -> PositionMap:
+        """Positions as a mutable {symbol: 'LONG' or 'FLAT'} mapping backed by the state store."""
+        return PositionMap(self.symbol_state)
+
+    @property
+    def last_week(self) -> Dict[str, int]:
+        """ISO week number of the last tick per symbol, {symbol: week}."""
+        return {s: self._week_number(s) for s in self.resampler.symbol_state.symbols}
+
+    def _week_number(self, symbol: str):
+        """ISO week number of the bar being built for a symbol (None if unseen)."""
+        code = self.resampler.last_code(symbol)
+        if code is None:
+            return None
+        return int(pd.Timestamp(self.resampler.bar_start(code)).isocalendar()[1])
 
     def get_strategy_status(self, symbol: str = None):
         """Get current strategy status for monitoring."""
+        store = self.symbol_state
         if symbol:
             return {
                 'symbol': symbol,
-                'position': self.positions.get(symbol, 'FLAT'),
-                'weekly_data_points': len(self.weekly_data.get(symbol, {}).get('prices', [])),
-                'last_week': self.last_week.get(symbol)
+                'position': 'LONG' if store.get(symbol, 'position') == 1 else 'FLAT',
+                'weekly_data_points': int(store.window_count([store.symbol_id(symbol, create=False)], 'weekly_close')[0])
+                                      if symbol in store else 0,
+                'last_week': self._week_number(symbol)
             }
         else:
+            ids = np.arange(len(store))
+            counts = store.window_count(ids, 'weekly_close')
             return {
-                'positions': self.positions,
-                'weekly_data_counts': {s: len(data['prices']) for s, data in self.weekly_data.items()},
+                'positions': dict(self.positions),
+                'weekly_data_counts': {s: int(counts[i]) for i, s in enumerate(store.symbols)},
                 'last_weeks': self.last_week
             }
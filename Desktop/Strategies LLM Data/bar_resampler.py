@@ -0,0 +1,332 @@
+import re
+import pandas as pd
+import numpy as np
+from ohlcv_accumulator import OHLCVAccumulator
+
+
+_EPOCH_ORDINAL = 719163  # date.toordinal() of 1970-01-01
+# Day number of 1970-01-05, the Monday that week codes count from
+# (same week codes as RebalanceCalendar.period_code(..., 'W'))
+_WEEK_EPOCH_DAY = 4
+
+
+def wall_clock(timestamp):
+    """
+    Naive wall-clock time of a timestamp.
+
+    Args:
+        timestamp (datetime or np.datetime64): Time, tz-aware or naive
+
+    Returns:
+        np.datetime64: datetime64[ns] with the timestamp's local date and
+                       time (tz-aware times keep their own zone's clock)
+    """
+    if getattr(timestamp, 'tzinfo', None) is not None:
+        timestamp = timestamp.replace(tzinfo=None)
+    return np.datetime64(timestamp, 'ns')
+
+
+def parse_interval(interval):
+    """
+    Parse a bar interval.
+
+    Args:
+        interval (str): '<n><unit>' with unit 'min', 'h', 'D' or 'W'
+                        (e.g. '1min', '15min', '1h', '1D', '1W'; n defaults to 1)
+
+    Returns:
+        tuple: (unit, n) with unit in {'min', 'D', 'W'}; hours become minutes
+    """
+    match = re.fullmatch(r'\s*(\d*)\s*(min|T|h|H|D|d|W|w)\s*', str(interval))
+    if match is None:
+        raise ValueError(f"Unsupported bar interval: {interval}")
+    n = int(match.group(1) or 1)
+    unit = match.group(2)
+    if n < 1:
+        raise ValueError(f"Bar interval must be positive: {interval}")
+    if unit in ('min', 'T'):
+        return 'min', n
+    if unit in ('h', 'H'):
+        return 'min', n * 60
+    if unit in ('D', 'd'):
+        return 'D', n
+    return 'W', n
+
+
+class BarResampler:
+    """
+    OHLCV bars at a fixed interval, in batch and streaming form.
+
+    Bar codes are monotonic integers per timestamp, so a bar is "all rows
+    with the same (symbol, code)":
+        'W': Monday-based week number since 1970-01-05, i.e. ISO year-weeks
+             (weeks never collide across years), grouped n at a time
+        'D': session day number since 1970-01-01, grouped n at a time
+        'min': day number * bars per session + bar within the session, with
+               bars aligned to the session open; ticks before the open or
+               after the close fold into the first / last bar of the day
+
+    Codes are taken from the wall-clock time of the timestamps: tz-aware
+    times count in their own zone (02:00 IST on a Monday is in Monday's
+    bar), both in bar_code and bar_codes. Bar start times are naive
+    wall-clock times.
+
+    Example:
+        resampler = BarResampler('1W')
+        weekly = resampler.resample(daily_data)           # batch
+        bar = resampler.update('INFY', 1500.0, 10, ts)   # streaming; returns
+                                                          # the finished bar
+    """
+
+    def __init__(self, interval='1W', session_start=None, session_minutes=None):
+        """
+        Initialize the resampler.
+        Args:
+            interval (str): Bar interval, see parse_interval.
+            session_start (str, optional): Session open 'HH:MM' for intraday
+                                           alignment (default midnight).
+            session_minutes (int, optional): Session length in minutes
+                                             (default: the rest of the day).
+        """
+        self.interval = interval
+        self.unit, self.n = parse_interval(interval)
+
+        if session_start is None:
+            self.session_offset = 0
+        else:
+            self.session_offset = int(session_start[:2]) * 60 + int(session_start[3:5])
+        self.session_minutes = session_minutes or (1440 - self.session_offset)
+        self.bars_per_session = -(-self.session_minutes // self.n) if self.unit == 'min' else 1
+
+        self.accumulator = OHLCVAccumulator()
+        self.symbol_state = self.accumulator.symbol_state
+        self._codes = {}  # symbol -> code of the bar being built
+
+    def bar_code(self, timestamp):
+        """
+        Bar code of one timestamp.
+
+        Args:
+            timestamp (datetime or np.datetime64): Tick or bar time
+
+        Returns:
+            int: Bar code
+        """
+        if isinstance(timestamp, np.datetime64):
+            day, minute = divmod(int(timestamp.astype('datetime64[m]').astype(np.int64)), 1440)
+        else:
+            day = timestamp.toordinal() - _EPOCH_ORDINAL
+            minute = timestamp.hour * 60 + timestamp.minute
+        if self.unit == 'W':
+            return (day - _WEEK_EPOCH_DAY) // 7 // self.n
+        if self.unit == 'D':
+            return day // self.n
+        minute -= self.session_offset
+        minute = min(max(minute, 0), self.session_minutes - 1)
+        return day * self.bars_per_session + minute // self.n
+
+    def bar_codes(self, timestamps):
+        """
+        Bar codes of an array of timestamps.
+
+        Args:
+            timestamps (array-like): Datetimes
+
+        Returns:
+            np.ndarray: int64 bar codes
+        """
+        index = pd.DatetimeIndex(timestamps)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        values = index.values
+        days = values.astype('datetime64[D]').astype(np.int64)
+        if self.unit == 'W':
+            return (days - _WEEK_EPOCH_DAY) // 7 // self.n
+        if self.unit == 'D':
+            return days // self.n
+        minutes = (values - values.astype('datetime64[D]')).astype('timedelta64[m]').astype(np.int64)
+        minutes = np.clip(minutes - self.session_offset, 0, self.session_minutes - 1)
+        return days * self.bars_per_session + minutes // self.n
+
+    def bar_start(self, code):
+        """
+        Nominal start time of a bar.
+
+        Args:
+            code (int or np.ndarray): Bar code(s)
+
+        Returns:
+            np.datetime64 or np.ndarray: Start timestamp(s) (datetime64[ns])
+        """
+        code = np.asarray(code, dtype=np.int64)
+        if self.unit == 'W':
+            days = code * self.n * 7 + _WEEK_EPOCH_DAY
+            start = days.astype('datetime64[D]')
+        elif self.unit == 'D':
+            start = (code * self.n).astype('datetime64[D]')
+        else:
+            days, slot = np.divmod(code, self.bars_per_session)
+            start = (days.astype('datetime64[D]').astype('datetime64[m]') +
+                     (self.session_offset + slot * self.n).astype('timedelta64[m]'))
+        start = start.astype('datetime64[ns]')
+        return start[()] if start.ndim == 0 else start
+
+    def resample(self, data, date_col='date', symbol_col=None):
+        """
+        Batch resample OHLCV rows into bars.
+
+        Rows may be unsorted; they are stably sorted by (symbol, time). Missing
+        open/high/low columns fall back to close, missing volume to 0.
+
+        Args:
+            data (pd.DataFrame): Rows with date_col and close (optionally
+                                 open, high, low, volume and symbol_col)
+            date_col (str): Timestamp column
+            symbol_col (str, optional): Symbol column for multi-symbol data
+
+        Returns:
+            pd.DataFrame: One row per bar with [symbol_col,] date (bar start),
+                          open, high, low, close, volume, vwap, count,
+                          first_row and last_row (positions of the first and
+                          last input row of the bar)
+        """
+        n_rows = len(data)
+        times = pd.DatetimeIndex(data[date_col])
+        codes = self.bar_codes(times)
+        times = times.values
+        close = data['close'].to_numpy(dtype=np.float64)
+        columns = {name: data[name].to_numpy(dtype=np.float64) if name in data.columns else close
+                   for name in ('open', 'high', 'low')}
+        volume = (data['volume'].to_numpy(dtype=np.float64) if 'volume' in data.columns
+                  else np.zeros(n_rows))
+
+        if symbol_col is not None:
+            symbol_codes, symbols = pd.factorize(data[symbol_col], sort=True)
+            order = np.lexsort((times, symbol_codes))
+            keys = np.stack([symbol_codes[order], codes[order]])
+            change = np.any(keys[:, 1:] != keys[:, :-1], axis=0)
+        else:
+            order = np.argsort(times, kind='stable')
+            change = codes[order][1:] != codes[order][:-1]
+
+        if n_rows == 0:
+            empty = pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume', 'vwap',
+                                          'count', 'first_row', 'last_row'])
+            if symbol_col is not None:
+                empty.insert(0, symbol_col, [])
+            return empty
+
+        starts = np.concatenate([[0], np.flatnonzero(change) + 1])
+        ends = np.append(starts[1:], n_rows) - 1
+
+        close_sorted = close[order]
+        volume_sorted = volume[order]
+        bar_volume = np.add.reduceat(volume_sorted, starts)
+        notional = np.add.reduceat(close_sorted * volume_sorted, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = np.where(bar_volume > 0, notional / bar_volume, close_sorted[ends])
+
+        bars = pd.DataFrame({
+            'date': self.bar_start(codes[order][starts]),
+            'open': columns['open'][order][starts],
+            'high': np.maximum.reduceat(columns['high'][order], starts),
+            'low': np.minimum.reduceat(columns['low'][order], starts),
+            'close': close_sorted[ends],
+            'volume': bar_volume,
+            'vwap': vwap,
+            'count': ends - starts + 1,
+            'first_row': order[starts],
+            'last_row': order[ends]
+        })
+        if symbol_col is not None:
+            bars.insert(0, symbol_col, np.asarray(symbols)[symbol_codes[order][starts]])
+        return bars
+
+    def update(self, symbol, price, volume, timestamp):
+        """
+        Streaming: add one tick, returning the previous bar if it just closed.
+
+        Args:
+            symbol (str): Instrument symbol
+            price (float): Traded price
+            volume (float): Traded volume
+            timestamp (datetime or np.datetime64): Tick time (non-decreasing
+                                                   per symbol)
+
+        Returns:
+            dict or None: Finished bar (see OHLCVAccumulator.bar, plus 'code',
+                          with wall-clock start and end times) when this tick
+                          starts a new bar, otherwise None
+        """
+        timestamp = wall_clock(timestamp)
+        code = self.bar_code(timestamp)
+        last = self._codes.get(symbol)
+        finished = None
+        if last is not None and code != last:
+            finished = self.accumulator.bar(symbol)
+            if finished is not None:
+                finished['code'] = last
+            self.accumulator.reset(symbol)
+        self._codes[symbol] = code
+        self.accumulator.update(symbol, price, volume, timestamp)
+        return finished
+
+    def current_bar(self, symbol):
+        """Bar being built for a symbol (None if it has no ticks yet)."""
+        bar = self.accumulator.bar(symbol)
+        if bar is not None:
+            bar['code'] = self._codes[symbol]
+        return bar
+
+    def last_code(self, symbol):
+        """Code of the bar being built for a symbol (None if unseen)."""
+        return self._codes.get(symbol)
+
+    def flush(self, symbol=None):
+        """
+        Close open bars (e.g. at end of session or stream).
+
+        Args:
+            symbol (str, optional): Only this symbol (default: all)
+
+        Returns:
+            list: (symbol, bar) pairs for the bars that were open
+        """
+        symbols = [symbol] if symbol is not None else list(self._codes)
+        finished = []
+        for s in symbols:
+            bar = self.current_bar(s)
+            if bar is not None:
+                finished.append((s, bar))
+                self.accumulator.reset(s)
+        return finished
+
+    def to_arrays(self, prefix=''):
+        """
+        Open bars and bar codes as plain arrays (for snapshots).
+
+        Args:
+            prefix (str): Prefix for the array names
+
+        Returns:
+            tuple: ({name: array}, symbols in id order)
+        """
+        symbols = list(self.symbol_state.symbols)
+        arrays = self.symbol_state.to_arrays(prefix)
+        arrays[prefix + 'code'] = np.array([self._codes.get(s, 0) for s in symbols], dtype=np.int64)
+        arrays[prefix + 'has_code'] = np.array([s in self._codes for s in symbols], dtype=bool)
+        return arrays, symbols
+
+    def load_arrays(self, arrays, symbols, prefix=''):
+        """
+        Restore open bars written by to_arrays.
+
+        Args:
+            arrays (dict): {name: array}
+            symbols (list): Symbols in id order
+            prefix (str): Prefix used when the arrays were written
+        """
+        self.symbol_state.load_arrays(arrays, symbols, prefix)
+        codes = np.asarray(arrays[prefix + 'code'])
+        has_code = np.asarray(arrays[prefix + 'has_code'])
+        self._codes = {s: int(codes[i]) for i, s in enumerate(symbols) if has_code[i]}
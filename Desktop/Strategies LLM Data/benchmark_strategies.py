@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Strategy benchmark suite
+
+Times generate_signals of every strategy (and the event-driven
+WeeklyBollingerStrategy) at several scales, on one symbol and on a panel,
+and records wall time, throughput (bars/s) and peak memory to JSON. With a
+baseline file, any case slower or hungrier than the baseline beyond the
+tolerances, or that stops producing signals, is reported as a regression
+and the run exits with status 1. A run without a baseline file also exits
+with status 1 unless --save-baseline is given, so a missing baseline can't
+pass silently. Baselines are machine-specific: save one on the machine
+that runs the comparison.
+
+Each case runs in its own process: memory is per case, and a case that
+exceeds --timeout is stopped and recorded as 'timeout' instead of stalling
+the suite. Cases that emit no signals are marked 'no-op': their time only
+covers indicator set-up, not the trading path.
+
+Usage:
+    python benchmark_strategies.py --save-baseline                 # record this machine's baseline
+    python benchmark_strategies.py                                 # all cases, compared to it
+    python benchmark_strategies.py --strategies gapup top3 --layouts panel
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import warnings
+from datetime import datetime
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from universe_generator import default_params, simulate_factors, simulate_chunk
+
+
+# name -> (module, class, multi_symbol); multi_symbol strategies take the
+# whole long-format panel in one call, the others run once per symbol.
+# volatility_contraction stays a no-op case: its breakout needs a close above
+# a rolling high that includes the same bar, which consistent OHLC bars never
+# give, so it is timed on its indicator path only.
+STRATEGIES = {
+    'moving_average_crossover': ('Moving_Average_Crossover_Strategy.moving_average_crossover_strategy',
+                                 'MovingAverageCrossoverStrategy', False),
+    'trend_momentum_filter': ('Trend_Momentum_Filter_Strategy.trend_momentum_filter_strategy',
+                              'TrendMomentumFilterStrategy', False),
+    'volume_breakout': ('Volume_Breakout_Strategy.volume_breakout_strategy', 'VolumeBreakoutStrategy', False),
+    'weekly_bollinger_breakout': ('Weekly_Bollinger_Breakout_Strategy.weekly_bollinger_breakout_strategy',
+                                  'WeeklyBollingerBreakoutStrategy', False),
+    'statistical_pairs': ('Statistical_Pairs_Mean_Reversion_Strategy.statistical_pairs_mean_reversion_strategy',
+                          'StatisticalPairsMeanReversionStrategy', False),
+    'volatility_contraction': ('Volatility_Contraction_Breakout_Strategy.volatility_contraction_breakout_strategy',
+                               'VolatilityContractionBreakoutStrategy', False),
+    'market_breadth_rotation': ('Market_Breadth_Rotation_Strategy.market_breadth_rotation_strategy',
+                                'MarketBreadthRotationStrategy', False),
+    'liquidity_momentum': ('Liquidity_Aware_Momentum_Strategy.liquidity_aware_momentum_strategy',
+                           'LiquidityAwareMomentumStrategy', False),
+    'gapup_bollinger': ('GapUp_Bollinger_Exit_Strategy.gapup_bollinger_strategy', 'GapUpBollingerStrategy', True),
+    'top3_momentum': ('Top3_12Month_Momentum_Strategy.top3_momentum_strategy', 'Top3MomentumStrategy', True),
+    'weekly_bollinger_events': (None, None, True)
+}
+
+SCALES = (1000, 100000, 1000000)
+LAYOUTS = ('single', 'panel')
+PANEL_ONLY = ('top3_momentum',)  # cross-sectional ranking needs several symbols
+MIN_PANEL_SYMBOLS = 4
+DEFAULT_OUTPUT = 'benchmark_results.json'
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+
+def panel_symbols(n_bars):
+    """
+    Symbols in the panel layout: about 1,000 bars per symbol, and at least
+    MIN_PANEL_SYMBOLS (250 bars each at the 1k scale, which is past every
+    strategy's warm-up).
+    """
+    return max(MIN_PANEL_SYMBOLS, n_bars // 1000)
+
+
+def make_bars(n_bars, n_symbols=1, seed=7):
+    """
+    Synthetic OHLCV bars in long format (daily; minute bars when a symbol
+    has more bars than fit in the datetime64[ns] range as days).
+
+    Args:
+        n_bars (int): Total rows
+        n_symbols (int): Symbols the rows are split over
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: symbol, date, open, high, low, close, volume (symbol-major)
+    """
+    n_days = -(-n_bars // n_symbols)
+    params = {**default_params(), 'n_symbols': n_symbols, 'n_days': n_days, 'chunk_symbols': n_symbols,
+              'seed': seed, 'start_date': '1990-01-01'}
+    # Business days while they fit in the datetime64[ns] range, minutes beyond that
+    freq = 'B' if n_days <= 50000 else 'min'
+    dates = pd.date_range(params['start_date'], periods=n_days, freq=freq).values.astype('datetime64[ns]')
+    columns = simulate_chunk(params, simulate_factors(params), 0, dates)
+    symbols = np.array([f"SYM{i:05d}" for i in range(n_symbols)], dtype=object)
+    frame = pd.DataFrame({
+        'symbol': symbols[columns['symbol_id']],
+        'date': columns['date'],
+        'open': columns['open'],
+        'high': columns['high'],
+        'low': columns['low'],
+        'close': columns['close'],
+        'volume': columns['volume']
+    })
+    return frame.iloc[:n_bars].reset_index(drop=True)
+
+
+def _proc_status_mb(field):
+    """A memory field of /proc/self/status in MB (None where unavailable)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """
+    Start a memory measurement: reset the peak RSS to the current RSS
+    (Linux), so a later peak reading covers only what runs after this call.
+
+    Returns:
+        float: MB the measurement starts from (the current RSS, or the peak
+               so far where the peak can't be reset)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return _peak_rss_mb()
+    return _proc_status_mb('VmRSS') or _peak_rss_mb()
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_signals(name, data, multi_symbol):
+    """generate_signals over the data; returns (seconds, signal count, starting RSS MB)."""
+    module_name, class_name, _ = STRATEGIES[name]
+    strategy_class = getattr(__import__(module_name, fromlist=[class_name]), class_name)
+
+    if multi_symbol:
+        frames = [data]
+    else:
+        bounds = np.flatnonzero(data['symbol'].values[1:] != data['symbol'].values[:-1]) + 1
+        frames = [data.iloc[start:end].drop(columns='symbol').reset_index(drop=True)
+                  for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(data)])]
+    prepared = []
+    for frame in frames:
+        strategy = strategy_class()
+        prepared.append((strategy, strategy.preprocess_data(frame.copy())))
+
+    gc.collect()
+    rss_start = _reset_peak_rss()
+    start = time.perf_counter()
+    signals = 0
+    for strategy, frame in prepared:
+        output = strategy.generate_signals(frame)
+        signals += int((output['Signal'].fillna(0) != 0).sum()) if 'Signal' in output.columns else 0
+    return time.perf_counter() - start, signals, rss_start
+
+
+def _run_events(data):
+    """Replay the bars as ticks through the event-driven weekly strategy (same return as _run_signals)."""
+    from engine.event_engine import EventEngine, MarketEvent, SignalEvent
+    from Weekly_Bollinger_Breakout_Strategy.weekly_bollinger_strategy import WeeklyBollingerStrategy
+
+    order = np.argsort(data['date'].values, kind='stable')
+    times = pd.DatetimeIndex(data['date'].values[order]).to_pydatetime()
+    events = [MarketEvent(s, float(p), t, float(v)) for s, p, t, v in
+              zip(data['symbol'].values[order], data['close'].values[order], times, data['volume'].values[order])]
+    signals = []
+
+    async def run():
+        engine = EventEngine()
+        engine.register(SignalEvent, signals.append)
+        logger = logging.getLogger('benchmark')
+        logger.setLevel(logging.WARNING)
+        WeeklyBollingerStrategy(engine, logger, 'benchmark', bollinger_period=20, ma_period=40)
+        await engine.start()
+        gc.collect()
+        rss_start = _reset_peak_rss()
+        start = time.perf_counter()
+        for event in events:
+            await engine.put(event)
+        await engine.stop(drain=True)
+        return time.perf_counter() - start, rss_start
+
+    seconds, rss_start = asyncio.run(run())
+    return seconds, len(signals), rss_start
+
+
+def run_case(name, layout, n_bars, seed=7):
+    """
+    Run one benchmark case in this process.
+
+    Args:
+        name (str): Key of STRATEGIES
+        layout (str): 'single' or 'panel'
+        n_bars (int): Total bars
+        seed (int): Data seed
+
+    Returns:
+        dict: Case result (seconds, bars_per_second, peak_memory_mb, ...)
+    """
+    n_symbols = 1 if layout == 'single' else panel_symbols(n_bars)
+    data = make_bars(n_bars, n_symbols, seed)
+
+    # Peak RSS is reset once the data and strategies are set up (Linux), so
+    # the delta is the timed section's own memory; elsewhere only memory
+    # above the set-up peak shows
+    if name == 'weekly_bollinger_events':
+        seconds, signals, rss_before = _run_events(data)
+    else:
+        seconds, signals, rss_before = _run_signals(name, data, STRATEGIES[name][2])
+
+    peak = _peak_rss_mb()
+    return {
+        'strategy': name,
+        'layout': layout,
+        'bars': n_bars,
+        'symbols': n_symbols,
+        'status': 'ok',
+        'seconds': seconds,
+        'bars_per_second': n_bars / seconds if seconds > 0 else float('inf'),
+        'peak_memory_mb': peak,
+        'memory_delta_mb': max(peak - rss_before, 0.0),
+        'signals': signals
+    }
+
+
+def _case_worker(conn, name, layout, n_bars, seed):
+    warnings.simplefilter('ignore')  # Library deprecation noise would bury the table
+    try:
+        conn.send(run_case(name, layout, n_bars, seed))
+    except Exception as e:
+        conn.send({'strategy': name, 'layout': layout, 'bars': n_bars, 'status': 'error', 'error': repr(e)})
+    finally:
+        conn.close()
+
+
+def run_isolated(name, layout, n_bars, seed=7, timeout=600):
+    """
+    Run one case in a child process (fresh peak RSS, enforced timeout).
+
+    Returns:
+        dict: Case result; status 'timeout' or 'error' when it did not finish
+    """
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_case_worker, args=(sender, name, layout, n_bars, seed))
+    process.start()
+    sender.close()
+
+    result = None
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            pass
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    if result is None:
+        status = 'timeout' if process.exitcode in (None, -15) else 'error'
+        result = {'strategy': name, 'layout': layout, 'bars': n_bars, 'status': status,
+                  'error': f"exit code {process.exitcode}" if status == 'error' else f"exceeded {timeout}s"}
+    return result
+
+
+def environment():
+    """Machine and library versions recorded with the results."""
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare_to_baseline(results, baseline, time_tolerance=0.25, memory_tolerance=0.25,
+                        min_seconds=0.05, min_memory_mb=16.0):
+    """
+    Find cases that regressed against a baseline run.
+
+    A case regresses when it is more than `time_tolerance` (fraction) slower
+    and at least `min_seconds` slower, or uses `memory_tolerance` more peak
+    memory and at least `min_memory_mb` more, or no longer finishes, or no
+    longer emits signals. The absolute floors keep millisecond-scale cases
+    from flapping on noise.
+
+    Args:
+        results (list): Case results of this run
+        baseline (list): Case results of the baseline run
+
+    Returns:
+        list: (case key, message) for every regression
+    """
+    reference = {(r['strategy'], r['layout'], r['bars']): r for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result['strategy'], result['layout'], result['bars'])
+        base = reference.get(key)
+        if base is None or base.get('status') != 'ok':
+            continue
+        if result.get('status') != 'ok':
+            regressions.append((key, f"{result.get('status')} (baseline {base['seconds']:.3f}s)"))
+            continue
+        if base.get('signals') and not result.get('signals'):
+            regressions.append((key, f"no signals (baseline {base['signals']})"))
+        if (result['seconds'] > base['seconds'] * (1 + time_tolerance) and
+                result['seconds'] - base['seconds'] > min_seconds):
+            regressions.append((key, f"{result['seconds']:.3f}s vs baseline {base['seconds']:.3f}s "
+                                     f"({result['seconds'] / base['seconds']:.2f}x)"))
+        base_memory = base.get('memory_delta_mb', 0.0)
+        if (result['memory_delta_mb'] > base_memory * (1 + memory_tolerance) and
+                result['memory_delta_mb'] - base_memory > min_memory_mb):
+            regressions.append((key, f"{result['memory_delta_mb']:.0f}MB vs baseline {base_memory:.0f}MB"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strategy benchmark suite")
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument('--scales', type=int, nargs='+', default=list(SCALES), help="total bars per case")
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument('--timeout', type=float, default=600, help="seconds before a case is stopped")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="results JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="write this run as the new baseline")
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--memory-tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    print(f"{'strategy':<28} {'layout':<7} {'bars':>9} {'seconds':>9} {'bars/s':>12} {'mem MB':>8} {'status':>8}")
+    results = []
+    for name in args.strategies:
+        for layout in args.layouts:
+            if layout == 'single' and name in PANEL_ONLY:
+                continue
+            for n_bars in args.scales:
+                result = run_isolated(name, layout, n_bars, timeout=args.timeout)
+                results.append(result)
+                if result['status'] == 'ok':
+                    status = 'ok' if result['signals'] else 'no-op'
+                    print(f"{name:<28} {layout:<7} {n_bars:>9} {result['seconds']:>9.3f} "
+                          f"{result['bars_per_second']:>12,.0f} {result['memory_delta_mb']:>8.1f} {status:>8}")
+                else:
+                    print(f"{name:<28} {layout:<7} {n_bars:>9} {'':>9} {'':>12} {'':>8} {result['status']:>8}")
+
+    report = {'environment': environment(), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ No baseline at {args.baseline}; run with --save-baseline on this machine to create one")
+        sys.exit(1)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline['results'], args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+        for (name, layout, n_bars), message in regressions:
+            print(f"   {name} / {layout} / {n_bars} bars: {message}")
+        sys.exit(1)
+    print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,10 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
@@ -26,6 +30,80 @@ from Volume_Breakout_Strategy.volume_breakout_strategy import VolumeBreakoutStra
 from Weekly_Bollinger_Breakout_Strategy.weekly_bollinger_breakout_strategy import WeeklyBollingerBreakoutStrategy
 from GapUp_Bollinger_Exit_Strategy.gapup_bollinger_strategy import GapUpBollingerStrategy
 from Top3_12Month_Momentum_Strategy.top3_momentum_strategy import Top3MomentumStrategy
+from performance_metrics import compute_trade_metrics
+from scenario_cache import cached_scenario
+from results_store import ResultsStore, DEFAULT_DB_PATH
+
+# Worker-side state for parallel runs (set by _init_worker)
+_WORKER = {}
+
+
+def share_frames(frames):
+    """
+    Copy DataFrames into one shared-memory block.
+
+    Workers attach to the block once and rebuild the frames from views, so
+    scenario data is not pickled per task.
+
+    Args:
+        frames (dict): {name: pd.DataFrame} with numeric/datetime columns
+
+    Returns:
+        tuple: (SharedMemory, spec list of (frame, column, dtype, offset, length))
+    """
+    columns = []
+    size = 0
+    for name, frame in frames.items():
+        for column in frame.columns:
+            values = np.ascontiguousarray(frame[column].to_numpy())
+            columns.append((name, column, values))
+            size += -(-values.nbytes // 64) * 64
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+    spec = []
+    offset = 0
+    for name, column, values in columns:
+        view = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=offset)
+        view[:] = values
+        spec.append((name, column, values.dtype.str, offset, len(values)))
+        offset += -(-values.nbytes // 64) * 64
+    return shm, spec
+
+
+def attach_frames(shm, spec):
+    """
+    Rebuild the DataFrames written by share_frames.
+
+    Args:
+        shm (SharedMemory): Attached block
+        spec (list): Spec from share_frames
+
+    Returns:
+        dict: {name: pd.DataFrame}
+    """
+    columns = {}
+    for name, column, dtype, offset, length in spec:
+        columns.setdefault(name, {})[column] = np.ndarray(length, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+    return {name: pd.DataFrame(cols) for name, cols in columns.items()}
+
+
+def _init_worker(shm_name, spec, test_date):
+    """Pool initializer: attach the shared scenario data once per worker."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER['shm'] = shm
+    _WORKER['scenarios'] = attach_frames(shm, spec)
+    tester = StrategyTester()
+    tester.test_date = test_date
+    _WORKER['tester'] = tester
+
+
+def _run_task(task):
+    """Pool task: run one (strategy, scenario) pair against the shared data."""
+    index, strategy_class, scenario_name = task
+    start = time.perf_counter()
+    result = _WORKER['tester'].run_scenario(strategy_class, _WORKER['scenarios'][scenario_name])
+    return index, result, time.perf_counter() - start, os.getpid()
+
 
 class StrategyTester:
     """Comprehensive strategy testing framework"""
@@ -34,9 +112,10 @@ class StrategyTester:
         self.results = {}
         self.test_date = datetime.now().strftime("%Y-%m-%d")
         
-    def generate_test_data(self, days=500, start_price=100, trend='uptrend', volatility=0.02):
-        """Generate synthetic test data with various patterns"""
-        np.random.seed(42)  # For reproducible results
+    @cached_scenario
+    def generate_test_data(self, days=500, start_price=100, trend='uptrend', volatility=0.02, seed=42):
+        """Generate synthetic test data with various patterns (cached on disk per parameters)"""
+        rng = np.random.default_rng(seed)  # Local generator: global np.random state is untouched
         
         dates = pd.date_range(start='2023-01-01', periods=days, freq='D')
         
@@ -55,7 +134,7 @@ class StrategyTester:
         cycle2 = 0.05 * np.sin(2 * np.pi * np.arange(days) / 20)  # 20-day cycle
         
         # Generate random noise
-        noise = np.random.normal(0, volatility, days)
+        noise = rng.normal(0, volatility, days)
         
         # Combine all components
         log_returns = trend_component/days + cycle1/days + cycle2/days + noise
@@ -66,11 +145,11 @@ class StrategyTester:
         # Generate OHLCV data
         data = pd.DataFrame({
             'date': dates,
-            'open': prices * (1 + np.random.normal(0, 0.005, days)),
-            'high': prices * (1 + np.abs(np.random.normal(0, 0.01, days))),
-            'low': prices * (1 - np.abs(np.random.normal(0, 0.01, days))),
+            'open': prices * (1 + rng.normal(0, 0.005, days)),
+            'high': prices * (1 + np.abs(rng.normal(0, 0.01, days))),
+            'low': prices * (1 - np.abs(rng.normal(0, 0.01, days))),
             'close': prices,
-            'volume': np.random.randint(100000, 1000000, days)
+            'volume': rng.integers(100000, 1000000, days)
         })
         
         # Ensure high >= max(open, close) and low <= min(open, close)
@@ -79,53 +158,55 @@ class StrategyTester:
         
         return data
     
-    def generate_pairs_data(self, days=500):
-        """Generate synthetic pairs data for pairs trading strategy"""
-        np.random.seed(42)
+    @cached_scenario
+    def generate_pairs_data(self, days=500, seed=42):
+        """Generate synthetic pairs data for pairs trading strategy (cached on disk per parameters)"""
+        rng = np.random.default_rng(seed)
         
         dates = pd.date_range(start='2023-01-01', periods=days, freq='D')
         
         # Create two correlated but mean-reverting series
         base_trend = np.linspace(0, 0.2, days)
-        common_factor = np.random.normal(0, 0.02, days)
+        common_factor = rng.normal(0, 0.02, days)
         
         # Stock A
-        stock_a_trend = base_trend + 0.3 * common_factor + np.random.normal(0, 0.015, days)
+        stock_a_trend = base_trend + 0.3 * common_factor + rng.normal(0, 0.015, days)
         stock_a_prices = 100 * np.exp(np.cumsum(stock_a_trend))
         
         # Stock B (correlated but with some divergence)
-        stock_b_trend = base_trend + 0.7 * common_factor + np.random.normal(0, 0.012, days)
+        stock_b_trend = base_trend + 0.7 * common_factor + rng.normal(0, 0.012, days)
         stock_b_prices = 95 * np.exp(np.cumsum(stock_b_trend))
         
         data = pd.DataFrame({
             'date': dates,
             'stock_a_close': stock_a_prices,
             'stock_b_close': stock_b_prices,
-            'stock_a_volume': np.random.randint(50000, 500000, days),
-            'stock_b_volume': np.random.randint(40000, 400000, days)
+            'stock_a_volume': rng.integers(50000, 500000, days),
+            'stock_b_volume': rng.integers(40000, 400000, days)
         })
         
         return data
     
-    def generate_market_breadth_data(self, days=500):
-        """Generate synthetic market breadth data"""
-        np.random.seed(42)
+    @cached_scenario
+    def generate_market_breadth_data(self, days=500, seed=42):
+        """Generate synthetic market breadth data (cached on disk per parameters)"""
+        rng = np.random.default_rng(seed)
         
         dates = pd.date_range(start='2023-01-01', periods=days, freq='D')
         
         # Generate market breadth indicators
-        ad_ratio = 1 + np.random.normal(0, 0.3, days)  # Around 1.0
-        net_highs = np.random.normal(0, 50, days)  # Around 0
+        ad_ratio = 1 + rng.normal(0, 0.3, days)  # Around 1.0
+        net_highs = rng.normal(0, 50, days)  # Around 0
         
         # Generate sector data
         sectors = ['IT', 'Banking', 'Pharma', 'Auto', 'FMCG']
         sector_data = {}
         
         for sector in sectors:
-            sector_trend = np.random.normal(0.001, 0.02, days)  # Slight positive trend
+            sector_trend = rng.normal(0.001, 0.02, days)  # Slight positive trend
             sector_prices = 100 * np.exp(np.cumsum(sector_trend))
             sector_data[f'{sector}_close'] = sector_prices
-            sector_data[f'{sector}_volume'] = np.random.randint(100000, 800000, days)
+            sector_data[f'{sector}_volume'] = rng.integers(100000, 800000, days)
         
         data = pd.DataFrame({
             'date': dates,
@@ -137,63 +218,30 @@ class StrategyTester:
         return data
     
     def calculate_performance_metrics(self, signals, prices):
-        """Calculate comprehensive performance metrics"""
-        if len(signals) == 0 or signals.sum() == 0:
-            return {
-                'total_signals': 0,
-                'win_rate': 0,
-                'total_return': 0,
-                'max_drawdown': 0,
-                'sharpe_ratio': 0,
-                'avg_trade_duration': 0
-            }
-        
-        # Calculate returns
-        returns = prices.pct_change().fillna(0)
-        
-        # Calculate strategy returns
-        strategy_returns = signals.shift(1) * returns
-        
-        # Basic metrics
+        """
+        Calculate trade-level performance metrics.
+
+        Entries (1) and exits (-1) are paired into long trades by
+        performance_metrics.compute_trade_metrics; win rate is the share of
+        closed trades with a positive return and total return compounds the
+        bar returns earned while in a trade.
+
+        Args:
+            signals (pd.Series): Signal per bar
+            prices (pd.Series): Price per bar
+
+        Returns:
+            dict: total_signals, num_trades, open_trades, win_rate,
+                  total_return, avg_trade_return, max_drawdown, sharpe_ratio,
+                  sortino_ratio, exposure and avg_trade_duration
+        """
         total_signals = int(abs(signals).sum())
-        total_return = strategy_returns.sum()
-        
-        # Win rate
-        winning_trades = (strategy_returns > 0).sum()
-        win_rate = winning_trades / total_signals if total_signals > 0 else 0
-        
-        # Drawdown
-        cumulative_returns = (1 + strategy_returns).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdown.min()
-        
-        # Sharpe ratio
-        sharpe_ratio = strategy_returns.mean() / strategy_returns.std() if strategy_returns.std() > 0 else 0
-        
-        # Average trade duration
-        trade_durations = []
-        in_trade = False
-        trade_start = 0
-        
-        for i, signal in enumerate(signals):
-            if signal == 1 and not in_trade:  # Enter trade
-                in_trade = True
-                trade_start = i
-            elif signal == -1 and in_trade:  # Exit trade
-                trade_durations.append(i - trade_start)
-                in_trade = False
-        
-        avg_trade_duration = np.mean(trade_durations) if trade_durations else 0
-        
-        return {
-            'total_signals': total_signals,
-            'win_rate': win_rate,
-            'total_return': total_return,
-            'max_drawdown': max_drawdown,
-            'sharpe_ratio': sharpe_ratio,
-            'avg_trade_duration': avg_trade_duration
-        }
+        summary = compute_trade_metrics(signals, prices)['summary']
+        metrics = {name: float(values[0]) for name, values in summary.items()}
+        metrics['num_trades'] = int(summary['num_trades'][0])
+        metrics['open_trades'] = int(summary['open_trades'][0])
+        metrics['total_signals'] = total_signals
+        return metrics
     
     def test_strategy(self, strategy_class, strategy_name, test_data, test_scenarios):
         """Test a single strategy with multiple scenarios"""
@@ -208,44 +256,101 @@ class StrategyTester:
         for scenario_name, data in test_scenarios.items():
             print(f"  Running scenario: {scenario_name}")
             
-            try:
-                # Initialize strategy
-                strategy = strategy_class()
-                
-                # Preprocess data
-                processed_data = strategy.preprocess_data(data.copy())
-                
-                # Generate signals
-                signals_df = strategy.generate_signals(processed_data)
-                signals = signals_df['Signal'] if 'Signal' in signals_df.columns else pd.Series(0, index=data.index)
-                
-                # Calculate performance metrics
-                price_col = 'close' if 'close' in data.columns else data.columns[1]  # Use first price column
-                metrics = self.calculate_performance_metrics(signals, data[price_col])
-                
-                # Add scenario results
-                results['scenarios'][scenario_name] = {
-                    'status': 'PASSED',
-                    'metrics': metrics,
-                    'total_signals': int(abs(signals).sum()),
-                    'data_points': len(data),
-                    'signal_breakdown': {
-                        'buy_signals': int((signals == 1).sum()),
-                        'sell_signals': int((signals == -1).sum()),
-                        'hold_signals': int((signals == 0).sum())
-                    }
-                }
-                
-            except Exception as e:
-                results['scenarios'][scenario_name] = {
-                    'status': 'FAILED',
-                    'error': str(e),
-                    'data_points': len(data)
-                }
-                print(f"    ERROR: {str(e)}")
+            start = time.perf_counter()
+            results['scenarios'][scenario_name] = self.run_scenario(strategy_class, data)
+            results['scenarios'][scenario_name]['seconds'] = time.perf_counter() - start
+            if results['scenarios'][scenario_name]['status'] == 'FAILED':
+                print(f"    ERROR: {results['scenarios'][scenario_name]['error']}")
         
         return results
     
+    def run_scenario(self, strategy_class, data):
+        """Run one strategy on one scenario and return its result entry"""
+        try:
+            # Initialize strategy
+            strategy = strategy_class()
+            
+            # Preprocess data
+            processed_data = strategy.preprocess_data(data.copy())
+            
+            # Generate signals
+            signals_df = strategy.generate_signals(processed_data)
+            signals = signals_df['Signal'] if 'Signal' in signals_df.columns else pd.Series(0, index=data.index)
+            
+            # Calculate performance metrics
+            price_col = 'close' if 'close' in data.columns else data.columns[1]  # Use first price column
+            metrics = self.calculate_performance_metrics(signals, data[price_col])
+            
+            # Add scenario results
+            return {
+                'status': 'PASSED',
+                'params': dict(getattr(strategy, 'params', {})),
+                'metrics': metrics,
+                'total_signals': int(abs(signals).sum()),
+                'data_points': len(data),
+                'signal_breakdown': {
+                    'buy_signals': int((signals == 1).sum()),
+                    'sell_signals': int((signals == -1).sum()),
+                    'hold_signals': int((signals == 0).sum())
+                }
+            }
+            
+        except Exception as e:
+            return {
+                'status': 'FAILED',
+                'error': str(e),
+                'data_points': len(data)
+            }
+    
+    def run_parallel(self, strategies, test_scenarios, max_workers=None):
+        """
+        Run every (strategy, scenario) pair on a process pool.
+        
+        Scenario data is placed in shared memory once and attached by each
+        worker at start-up; tasks only carry the strategy class and scenario
+        name. Results are collected in grid order regardless of completion
+        order, so output is deterministic.
+        
+        Args:
+            strategies (list): (strategy_class, strategy_name) pairs
+            test_scenarios (dict): {scenario_name: pd.DataFrame}
+            max_workers (int, optional): Pool size (default: CPU count)
+        
+        Returns:
+            tuple: ({strategy_name: results}, list of per-task timing dicts)
+        """
+        grid = [(strategy_class, strategy_name, scenario_name)
+                for strategy_class, strategy_name in strategies
+                for scenario_name in test_scenarios]
+        tasks = [(i, strategy_class, scenario_name) for i, (strategy_class, _, scenario_name) in enumerate(grid)]
+        
+        shm, spec = share_frames(test_scenarios)
+        outcomes = [None] * len(tasks)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shm.name, spec, self.test_date)) as pool:
+                futures = [pool.submit(_run_task, task) for task in tasks]
+                for future in as_completed(futures):
+                    index, result, seconds, pid = future.result()
+                    outcomes[index] = (result, seconds, pid)
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        all_results = {}
+        timings = []
+        for (_, strategy_name, scenario_name), (result, seconds, pid) in zip(grid, outcomes):
+            entry = all_results.setdefault(strategy_name, {
+                'strategy_name': strategy_name,
+                'test_date': self.test_date,
+                'scenarios': {}
+            })
+            result['seconds'] = seconds
+            entry['scenarios'][scenario_name] = result
+            timings.append({'strategy': strategy_name, 'scenario': scenario_name,
+                            'seconds': seconds, 'worker': pid, 'status': result['status']})
+        return all_results, timings
+    
     def generate_test_report(self, strategy_name, results):
         """Generate detailed test report for a strategy"""
         report = f"""# {strategy_name} - Comprehensive Test Results
@@ -276,10 +381,13 @@ class StrategyTester:
                 report += f"✅ **PASSED** - Strategy executed successfully\n\n"
                 report += f"**Performance Metrics:**\n"
                 report += f"- Total Signals: {scenario_results['total_signals']}\n"
+                report += f"- Trades: {metrics.get('num_trades', 0)} (open: {metrics.get('open_trades', 0)})\n"
                 report += f"- Win Rate: {metrics['win_rate']:.2%}\n"
                 report += f"- Total Return: {metrics['total_return']:.2%}\n"
                 report += f"- Max Drawdown: {metrics['max_drawdown']:.2%}\n"
                 report += f"- Sharpe Ratio: {metrics['sharpe_ratio']:.2f}\n"
+                report += f"- Sortino Ratio: {metrics.get('sortino_ratio', 0):.2f}\n"
+                report += f"- Exposure: {metrics.get('exposure', 0):.2%}\n"
                 report += f"- Avg Trade Duration: {metrics['avg_trade_duration']:.1f} days\n\n"
                 
                 report += f"**Signal Breakdown:**\n"
@@ -328,8 +436,20 @@ class StrategyTester:
         
         return report
     
-    def run_all_tests(self):
-        """Run comprehensive tests on all strategies"""
+    def run_all_tests(self, workers=1, db_path=DEFAULT_DB_PATH):
+        """
+        Run comprehensive tests on all strategies
+        
+        Results are recorded in the results store and the Markdown reports
+        are generated from the stored run.
+        
+        Args:
+            workers (int, optional): Process-pool size for the (strategy,
+                                     scenario) grid; 1 runs serially in this
+                                     process, None uses every core.
+            db_path (str, optional): Results store file (None: don't record;
+                                     reports come from the in-memory results)
+        """
         print("🚀 Starting Comprehensive Strategy Testing...")
         print("=" * 60)
         
@@ -350,16 +470,39 @@ class StrategyTester:
             (WeeklyBollingerBreakoutStrategy, 'Weekly Bollinger Breakout Strategy'),
         ]
         
+        wall_start = time.perf_counter()
+        parallel_results = None
+        if workers != 1:
+            parallel_results, timings = self.run_parallel(strategies, test_scenarios, workers)
+        
         # Test each strategy
         for strategy_class, strategy_name in strategies:
             print(f"\n🔍 Testing {strategy_name}")
             print("-" * 40)
             
             # Test the strategy
-            results = self.test_strategy(strategy_class, strategy_name, None, test_scenarios)
+            if parallel_results is not None:
+                results = parallel_results[strategy_name]
+                for scenario_name, scenario_results in results['scenarios'].items():
+                    print(f"  {scenario_name}: {scenario_results['status']} ({scenario_results['seconds']:.2f}s)")
+            else:
+                results = self.test_strategy(strategy_class, strategy_name, None, test_scenarios)
             
+            # Store results
+            self.results[strategy_name] = results
+        
+        wall_time = time.perf_counter() - wall_start
+        report_results = self.results
+        if db_path is not None:
+            with ResultsStore(db_path) as store:
+                run_id = store.record_run(self.results, self.test_date, wall_seconds=wall_time,
+                                          workers=workers or os.cpu_count())
+                report_results = store.run_results(run_id)
+            print(f"\n🗄️ Run {run_id} recorded in {db_path}")
+        
+        for strategy_class, strategy_name in strategies:
             # Generate and save report
-            report = self.generate_test_report(strategy_name, results)
+            report = self.generate_test_report(strategy_name, report_results[strategy_name])
             
             # Determine folder name
             folder_name = strategy_name.replace(' ', '_').replace('+', '_').replace('&', '_')
@@ -373,9 +516,6 @@ class StrategyTester:
                 print(f"✅ Report saved to {report_path}")
             else:
                 print(f"⚠️ Folder {folder_name} not found, skipping report save")
-            
-            # Store results
-            self.results[strategy_name] = results
         
         print("\n🎉 All tests completed!")
         print("=" * 60)
@@ -397,7 +537,26 @@ class StrategyTester:
         print(f"   Total Tests: {total_tests}")
         print(f"   Passed Tests: {passed_tests}")
         print(f"   Success Rate: {passed_tests/total_tests:.1%}")
+        
+        # Timing summary
+        task_time = sum(s['seconds'] for r in self.results.values() for s in r['scenarios'].values())
+        print(f"⏱️ Timing:")
+        print(f"   Wall Time: {wall_time:.2f}s")
+        print(f"   Task Time: {task_time:.2f}s")
+        if parallel_results is not None:
+            print(f"   Workers Used: {len(set(t['worker'] for t in timings))}")
+            print(f"   Speedup: {task_time / wall_time:.2f}x")
+            slowest = sorted(timings, key=lambda t: t['seconds'], reverse=True)[:5]
+            for t in slowest:
+                print(f"   {t['seconds']:.2f}s  {t['strategy']} / {t['scenario']}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comprehensive Strategy Tester")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="process-pool size for the strategy x scenario grid (0 = all cores)")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="results store file")
+    parser.add_argument('--no-store', action='store_true', help="don't record the run in the results store")
+    args = parser.parse_args()
+    
     tester = StrategyTester()
-    tester.run_all_tests()
+    tester.run_all_tests(workers=args.workers or None, db_path=None if args.no_store else args.db)
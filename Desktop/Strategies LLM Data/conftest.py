@@ -0,0 +1,3 @@
+# test_all_strategies.py is a script run directly (its test_strategy takes
+# strategy arguments, not fixtures); keep it out of pytest collection.
+collect_ignore = ['test_all_strategies.py']
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: MarketEvents per second absorbed by WeeklyBollingerStrategy
+through the local EventEngine, or through a ShardedEventEngine with --shards.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.event_engine import SignalEvent, run_benchmark
+from engine.sharded_engine import run_sharded_benchmark
+from Weekly_Bollinger_Breakout_Strategy.weekly_bollinger_strategy import WeeklyBollingerStrategy
+
+
+def weekly_strategy_factory(engine):
+    """Strategy per engine (module level so shard processes can use it)."""
+    logger = logging.getLogger('benchmark')
+    logger.setLevel(logging.WARNING)
+    return WeeklyBollingerStrategy(engine, logger, 'benchmark', bollinger_period=20, ma_period=50)
+
+
+def run_sharded(args):
+    print(f"{'shards':>8} {'mode':>8} {'events':>10} {'seconds':>9} {'events/s':>12} {'signals':>8}")
+    for n_shards in args.shards:
+        result = asyncio.run(run_sharded_benchmark(weekly_strategy_factory, n_shards=n_shards, mode=args.mode,
+                                                   n_events=args.events, n_symbols=args.symbols,
+                                                   span_days=args.days, batch_size=args.batch_sizes[0]))
+        print(f"{n_shards:>8} {args.mode:>8} {result['events']:>10} {result['seconds']:>9.2f} "
+              f"{result['events_per_second']:>12,.0f} {len(result['signals']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--days', type=int, default=730, help='calendar days the ticks span')
+    parser.add_argument('--queue-size', type=int, default=10000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64, 256, 1024])
+    parser.add_argument('--shards', type=int, nargs='+', help='benchmark a sharded engine with these shard counts')
+    parser.add_argument('--mode', choices=['task', 'process'], default='process', help='shard runtime')
+    args = parser.parse_args()
+
+    if args.shards:
+        run_sharded(args)
+        return
+
+    print(f"{'batch':>8} {'events':>10} {'seconds':>9} {'events/s':>12} {'signals':>8} {'blocked':>8}")
+    for batch_size in args.batch_sizes:
+        signals = []
+
+        def factory(engine):
+            engine.register(SignalEvent, signals.append)
+            return weekly_strategy_factory(engine)
+
+        result = asyncio.run(run_benchmark(factory, n_events=args.events, n_symbols=args.symbols,
+                                           span_days=args.days,
+                                           max_queue_size=args.queue_size, batch_size=batch_size))
+        print(f"{batch_size:>8} {result['events']:>10} {result['seconds']:>9.2f} "
+              f"{result['events_per_second']:>12,.0f} {len(signals):>8} {result['stats'].blocked_puts:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import asyncio
+import collections
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class MarketEvent:
+    """Tick for one instrument."""
+    instrument_token: str
+    ltp: float
+    timestamp: datetime
+    volume: float = 0
+
+
+@dataclass(slots=True)
+class SignalEvent:
+    """Order request emitted by a strategy."""
+    instrument_token: str
+    strategy_id: str
+    signal_type: str  # 'BUY' or 'SELL'
+    quantity: int
+    price: float
+    order_type: str = "MARKET"
+    timestamp: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class FillEvent:
+    """Execution report for an order."""
+    instrument_token: str
+    transaction_type: str  # 'BUY' or 'SELL'
+    quantity: int
+    price: float
+    strategy_id: Optional[str] = None
+    order_id: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+
+@dataclass
+class _Subscription:
+    handler: Callable
+    batch: bool
+    is_async: bool
+
+
+@dataclass
+class EngineStats:
+    """Counters kept by the engine."""
+    events_put: int = 0
+    events_dispatched: int = 0
+    batches: int = 0
+    handler_errors: int = 0
+    max_queue_depth: int = 0
+    blocked_puts: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+
+class EventEngine:
+    """
+    In-process asyncio event engine.
+
+    Producers call `await put(event)`; one dispatcher task drains the queue
+    and calls the handlers registered for each event type in arrival order.
+
+    - Bounded queue: market data goes through an asyncio.Queue of
+      `max_queue_size`; `put` waits while it is full, so a fast feed is
+      slowed to the speed of the strategies instead of growing memory.
+    - Control queue: signals, fills and other non-market events put from
+      inside a handler go to a separate queue that is drained before the
+      next market batch. The dispatcher never waits on its own bounded
+      queue, so a strategy emitting signals can't deadlock the engine.
+    - Batched dispatch: the dispatcher takes up to `batch_size` queued
+      events per wake-up. Handlers registered with batch=True receive each
+      run of consecutive same-type events as one list.
+    - Ordering: dispatch is event-major. Each event reaches the handlers in
+      registration order before the next event is delivered, as with
+      batch_size=1. A batch handler receives the run at its place in that
+      order, once every handler registered before it has processed the
+      whole run.
+
+    Example:
+        engine = EventEngine(max_queue_size=10000, batch_size=256)
+        engine.register(MarketEvent, strategy.handle_market_event)
+        await engine.start()
+        await engine.put(MarketEvent('INFY', 1500.0, datetime.now(), 10))
+        await engine.stop()
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 256,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the engine.
+        Args:
+            max_queue_size (int): Capacity of the market-data queue.
+            batch_size (int): Maximum events dispatched per wake-up.
+            logger (logging.Logger, optional): Logger for handler errors.
+        """
+        self.max_queue_size = max_queue_size
+        self.batch_size = max(int(batch_size), 1)
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = EngineStats()
+
+        self._handlers: Dict[type, List[_Subscription]] = collections.defaultdict(list)
+        self._queue: Optional[asyncio.Queue] = None
+        self._control: collections.deque = collections.deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._running = False
+
+    def register(self, event_type: type, handler: Callable, batch: bool = False):
+        """
+        Subscribe a handler to an event type.
+
+        Args:
+            event_type (type): Event class, e.g. MarketEvent
+            handler (callable): Sync or async callable taking one event, or a
+                                list of events when batch is True
+            batch (bool): Deliver runs of consecutive events as a list
+        """
+        self._handlers[event_type].append(
+            _Subscription(handler, batch, inspect.iscoroutinefunction(handler))
+        )
+
+    def unregister(self, event_type: type, handler: Callable):
+        """Remove a handler from an event type."""
+        self._handlers[event_type] = [s for s in self._handlers[event_type] if s.handler != handler]
+
+    def _ensure_queues(self):
+        """Create loop-bound primitives lazily (inside the running loop)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._idle.set()
+
+    def _in_dispatcher(self) -> bool:
+        return self._task is not None and asyncio.current_task() is self._task
+
+    async def put(self, event: Any):
+        """
+        Queue an event, waiting while the market-data queue is full.
+
+        Args:
+            event: Event instance
+        """
+        self._ensure_queues()
+        self.stats.events_put += 1
+        self._idle.clear()
+
+        if not isinstance(event, MarketEvent) or self._in_dispatcher():
+            self._control.append(event)
+            self._wakeup.set()
+            return
+
+        if self._queue.full():
+            self.stats.blocked_puts += 1
+        await self._queue.put(event)
+        depth = self._queue.qsize()
+        if depth > self.stats.max_queue_depth:
+            self.stats.max_queue_depth = depth
+        self._wakeup.set()
+
+    def put_nowait(self, event: Any):
+        """
+        Queue an event without waiting.
+
+        Raises:
+            asyncio.QueueFull: If the market-data queue is full
+        """
+        self._ensure_queues()
+        if not isinstance(event, MarketEvent) or self._in_dispatcher():
+            self._control.append(event)
+        else:
+            self._queue.put_nowait(event)
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue.qsize())
+        self.stats.events_put += 1
+        self._idle.clear()
+        self._wakeup.set()
+
+    def qsize(self) -> int:
+        """Events waiting for dispatch."""
+        return (self._queue.qsize() if self._queue is not None else 0) + len(self._control)
+
+    async def start(self):
+        """Start the dispatcher task."""
+        self._ensure_queues()
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, drain: bool = True):
+        """
+        Stop the dispatcher.
+
+        Args:
+            drain (bool): Dispatch everything already queued first
+        """
+        if self._task is None:
+            return
+        self._running = False
+        if drain:
+            await self.join()
+            self._wakeup.set()
+            await self._task
+        else:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def join(self):
+        """Wait until every queued event (including ones queued by handlers) is dispatched."""
+        self._ensure_queues()
+        while self.qsize() or not self._idle.is_set():
+            await self._idle.wait()
+
+    def _next_batch(self) -> List[Any]:
+        """Control events first, then up to batch_size market events."""
+        batch = []
+        while self._control and len(batch) < self.batch_size:
+            batch.append(self._control.popleft())
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                self._idle.set()
+                if not self._running:
+                    return
+                self._wakeup.clear()
+                if self.qsize():
+                    continue
+                await self._wakeup.wait()
+                continue
+            await self.dispatch(batch)
+
+    async def dispatch(self, events: List[Any]):
+        """
+        Deliver events to their handlers in order (event-major, see class
+        docstring).
+
+        Args:
+            events (list): Events to deliver
+        """
+        self.stats.batches += 1
+        start = 0
+        n = len(events)
+        while start < n:
+            event_type = type(events[start])
+            end = start + 1
+            while end < n and type(events[end]) is event_type:
+                end += 1
+            run = events[start:end]
+            name = event_type.__name__
+            self.stats.by_type[name] = self.stats.by_type.get(name, 0) + len(run)
+
+            subs = self._handlers.get(event_type, ())
+            i = 0
+            while i < len(subs):
+                if subs[i].batch:
+                    await self._call(subs[i], run)
+                    i += 1
+                    continue
+                # Consecutive per-event handlers take each event in turn
+                j = i + 1
+                while j < len(subs) and not subs[j].batch:
+                    j += 1
+                group = subs[i:j]
+                for event in run:
+                    for sub in group:
+                        await self._call(sub, event)
+                i = j
+
+            self.stats.events_dispatched += len(run)
+            start = end
+
+    async def _call(self, sub: _Subscription, payload: Any):
+        """Run one handler; errors are logged and counted, not raised."""
+        try:
+            if sub.is_async:
+                await sub.handler(payload)
+            else:
+                result = sub.handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+        except Exception:
+            self.stats.handler_errors += 1
+            self.logger.exception(f"Handler {getattr(sub.handler, '__qualname__', sub.handler)} failed")
+
+
+def make_market_events(n_events: int = 200000, n_symbols: int = 500, span_days: int = 365,
+                       seed: int = 42) -> List[MarketEvent]:
+    """
+    Synthetic tick stream for benchmarks.
+
+    Args:
+        n_events (int): Ticks to generate
+        n_symbols (int): Distinct instruments
+        span_days (int): Calendar days the ticks are spread over
+        seed (int): Random seed
+
+    Returns:
+        list: MarketEvents in time order
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i:05d}" for i in range(n_symbols)]
+    codes = rng.integers(0, n_symbols, n_events)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.001, n_events)))
+    volumes = rng.integers(1, 1000, n_events).astype(float)
+    times = (pd.Timestamp('2022-01-03 09:15') +
+             pd.to_timedelta(np.linspace(0, span_days * 86400, n_events).astype(np.int64), unit='s')).to_pydatetime()
+    return [MarketEvent(symbols[c], float(p), t, float(v)) for c, p, t, v in zip(codes, prices, times, volumes)]
+
+
+async def run_benchmark(strategy_factory: Callable, n_events: int = 200000, n_symbols: int = 500,
+                        span_days: int = 365, max_queue_size: int = 10000, batch_size: int = 256,
+                        seed: int = 42) -> Dict[str, Any]:
+    """
+    Measure how many MarketEvents per second a strategy absorbs.
+
+    Args:
+        strategy_factory (callable): f(engine) -> strategy registered on engine
+        n_events (int): Ticks to publish
+        n_symbols (int): Distinct instruments
+        span_days (int): Calendar days the ticks are spread over
+        max_queue_size (int): Engine queue capacity
+        batch_size (int): Engine batch size
+        seed (int): Random seed for the tick stream
+
+    Returns:
+        dict: events, seconds, events_per_second and engine stats
+    """
+    events = make_market_events(n_events, n_symbols, span_days, seed)
+
+    engine = EventEngine(max_queue_size=max_queue_size, batch_size=batch_size)
+    strategy = strategy_factory(engine)
+    await engine.start()
+
+    start = time.perf_counter()
+    for event in events:
+        await engine.put(event)
+    await engine.stop(drain=True)
+    seconds = time.perf_counter() - start
+
+    return {
+        'strategy': getattr(strategy, 'strategy_name', type(strategy).__name__),
+        'events': n_events,
+        'seconds': seconds,
+        'events_per_second': n_events / seconds if seconds > 0 else float('inf'),
+        'stats': engine.stats
+    }
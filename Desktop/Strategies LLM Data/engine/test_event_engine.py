@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for EventEngine dispatch order
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.event_engine import EventEngine, MarketEvent, SignalEvent
+
+
+def run_engine(batch_size, register):
+    """Dispatch 6 ticks through an engine and return the handler call log."""
+    async def main():
+        calls = []
+        engine = EventEngine(batch_size=batch_size)
+        register(engine, calls)
+        await engine.start()
+        for i in range(6):
+            await engine.put(MarketEvent('INFY', float(i), datetime(2024, 1, 1), 1))
+        await engine.stop()
+        return calls
+    return asyncio.run(main())
+
+
+def per_event_handlers(engine, calls):
+    engine.register(MarketEvent, lambda event: calls.append(('A', event.ltp)))
+    engine.register(MarketEvent, lambda event: calls.append(('B', event.ltp)))
+
+
+def test_batched_dispatch_matches_unbatched_order():
+    unbatched = run_engine(1, per_event_handlers)
+    assert unbatched[:4] == [('A', 0.0), ('B', 0.0), ('A', 1.0), ('B', 1.0)]
+    assert run_engine(4, per_event_handlers) == unbatched
+    assert run_engine(256, per_event_handlers) == unbatched
+
+
+def test_batch_handler_sees_run_after_earlier_handlers():
+    def register(engine, calls):
+        engine.register(MarketEvent, lambda event: calls.append(('A', event.ltp)))
+        engine.register(MarketEvent, lambda events: calls.append(('batch', [e.ltp for e in events])), batch=True)
+
+    calls = run_engine(256, register)
+    batch_at = next(i for i, call in enumerate(calls) if call[0] == 'batch')
+    seen = [ltp for _, ltp in calls[:batch_at]]
+    assert seen == calls[batch_at][1]
+
+
+def test_events_put_by_handlers_are_dispatched():
+    def register(engine, calls):
+        async def emit(event):
+            await engine.put(SignalEvent(event.instrument_token, 'test', 'BUY', 1, event.ltp))
+        engine.register(MarketEvent, emit)
+        engine.register(SignalEvent, lambda signal: calls.append(signal.price))
+
+    assert run_engine(4, register) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
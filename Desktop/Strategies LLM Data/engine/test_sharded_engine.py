@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for ShardedEventEngine
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.event_engine import MarketEvent, SignalEvent
+from engine.sharded_engine import ShardedEventEngine
+
+
+def echo_strategy(engine):
+    """Emits one BUY signal per tick."""
+    async def on_tick(event):
+        await engine.put(SignalEvent(event.instrument_token, 'echo', 'BUY', 1, event.ltp))
+    engine.register(MarketEvent, on_tick)
+
+
+def crashing_strategy(engine):
+    """Kills its shard process on the first tick."""
+    engine.register(MarketEvent, lambda event: os._exit(3))
+
+
+def run_sharded(factory, mode, n_events=200, **stop_kwargs):
+    async def main():
+        signals = []
+        engine = ShardedEventEngine(factory, n_shards=2, mode=mode, batch_size=16, max_pending_batches=2)
+        engine.register(SignalEvent, signals.append)
+        await engine.start()
+        for i in range(n_events):
+            await engine.put(MarketEvent(f"SYM{i % 7}", float(i), datetime(2024, 1, 1), 1))
+        await engine.stop(**stop_kwargs)
+        return signals, engine.stats
+    return asyncio.run(main())
+
+
+def by_symbol(signals):
+    prices = {}
+    for signal in signals:
+        prices.setdefault(signal.instrument_token, []).append(signal.price)
+    return prices
+
+
+def test_process_mode_matches_task_mode():
+    task_signals, task_stats = run_sharded(echo_strategy, 'task')
+    process_signals, process_stats = run_sharded(echo_strategy, 'process')
+
+    assert len(task_signals) == 200
+    assert by_symbol(process_signals) == by_symbol(task_signals)
+    assert process_stats['events_routed'] == task_stats['events_routed']
+
+
+def test_dead_shard_raises_instead_of_hanging():
+    with pytest.raises(RuntimeError, match="died"):
+        run_sharded(crashing_strategy, 'process', n_events=2000, timeout=30)
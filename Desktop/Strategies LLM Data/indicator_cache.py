@@ -0,0 +1,79 @@
+class IndicatorCache:
+    """
+    Memo of indicator series computed on one data frame.
+
+    Parameter searches run many candidates on the same data; candidates that
+    share a lookback (same moving average, ATR period, ...) get the series
+    computed once. A cache is bound to one frame and strategies reach it
+    through `context['indicator_cache']`; cached values are shared, so
+    callers must not modify them in place.
+
+    Strategies go through cached_indicator, which prefixes every key with the
+    calling strategy's class: two strategies may compute an indicator of the
+    same name differently (ATR with or without the first row, Bollinger bands
+    with or without the width), so entries are never shared between classes.
+
+    Example:
+        cache = IndicatorCache(data)
+        for params in candidates:
+            Strategy(params).generate_signals(data, context={'indicator_cache': cache})
+    """
+
+    def __init__(self, data):
+        """
+        Initialize the cache.
+        Args:
+            data (pd.DataFrame): Frame the indicators are computed on.
+        """
+        self.data = data
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, compute):
+        """
+        Cached value of an indicator, computing it on first use.
+
+        Args:
+            key (tuple): Indicator name and everything it depends on,
+                         e.g. ('sma', 'close', 50)
+            compute (callable): Computes the value when it is not cached
+
+        Returns:
+            Value returned by compute
+        """
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = self._values[key] = compute()
+        return value
+
+
+def cached_indicator(owner, context, data, key, compute):
+    """
+    Look an indicator up in the context's IndicatorCache.
+
+    Falls back to compute() when there is no cache or it belongs to another
+    frame, so strategies behave the same with or without one. The key is
+    namespaced by the owner's class, so only instances of the same strategy
+    share a cached value.
+
+    Args:
+        owner: Strategy computing the indicator (usually self)
+        context (dict or None): generate_signals context
+        data (pd.DataFrame): Frame the indicator is computed on
+        key (tuple): Cache key within the owner's namespace (see IndicatorCache.get)
+        compute (callable): Computes the indicator
+
+    Returns:
+        Indicator value
+    """
+    cache = context.get('indicator_cache') if context else None
+    if cache is None or cache.data is not data:
+        return compute()
+    owner_class = type(owner)
+    return cache.get((owner_class.__module__, owner_class.__qualname__) + tuple(key), compute)
@@ -0,0 +1,146 @@
+import numpy as np
+from symbol_state_store import SymbolStateStore
+
+
+class OHLCVAccumulator:
+    """
+    Running OHLCV bar per symbol, updated in O(1) per tick.
+
+    Instead of keeping every tick of the current bar, each symbol holds one
+    fixed-size record: open, high, low, close, volume, VWAP numerator
+    (sum of price * volume), tick count and the times of the bar's first and
+    last ticks. Memory per symbol is constant however many ticks arrive.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Initialize empty bars.
+        Args:
+            capacity (int): Initial number of symbol slots.
+        """
+        self.symbol_state = SymbolStateStore(
+            fields={
+                'open': (np.float64, np.nan),
+                'high': (np.float64, np.nan),
+                'low': (np.float64, np.nan),
+                'close': (np.float64, np.nan),
+                'volume': (np.float64, 0.0),
+                'vwap_num': (np.float64, 0.0),
+                'count': (np.int64, 0),
+                'start_time': ('datetime64[ns]', np.datetime64('NaT')),
+                'end_time': ('datetime64[ns]', np.datetime64('NaT'))
+            },
+            capacity=capacity
+        )
+        self._columns = {}
+        self._columns_state = None
+
+    def columns(self):
+        """Per-field column views (refreshed when the store reallocates)."""
+        state = self.symbol_state.state
+        if self._columns_state is not state:
+            self._columns = {name: state[name] for name in state.dtype.names}
+            self._columns_state = state
+        return self._columns
+
+    def update(self, symbol, price, volume, timestamp):
+        """
+        Add one tick to the symbol's current bar.
+
+        Args:
+            symbol (str): Instrument symbol
+            price (float): Traded price
+            volume (float): Traded volume
+            timestamp (datetime): Tick time
+        """
+        sid = self.symbol_state.symbol_id(symbol)
+        columns = self.columns()
+        count = columns['count'][sid]
+        timestamp = np.datetime64(timestamp, 'ns')
+
+        if count == 0:
+            columns['open'][sid] = price
+            columns['high'][sid] = price
+            columns['low'][sid] = price
+            columns['start_time'][sid] = timestamp
+        else:
+            if price > columns['high'][sid]:
+                columns['high'][sid] = price
+            if price < columns['low'][sid]:
+                columns['low'][sid] = price
+
+        columns['close'][sid] = price
+        columns['volume'][sid] += volume
+        columns['vwap_num'][sid] += price * volume
+        columns['count'][sid] = count + 1
+        columns['end_time'][sid] = timestamp
+
+    def update_batch(self, symbol_ids, prices, volumes, timestamps):
+        """
+        Add one tick for each of a batch of symbols.
+
+        Args:
+            symbol_ids (np.ndarray): Ids from self.symbol_state (unique)
+            prices (np.ndarray): Traded prices
+            volumes (np.ndarray): Traded volumes
+            timestamps (np.ndarray): Tick times (datetime64)
+        """
+        ids = np.asarray(symbol_ids, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        state = self.symbol_state.state
+
+        first = state['count'][ids] == 0
+        state['open'][ids[first]] = prices[first]
+        state['start_time'][ids[first]] = timestamps[first]
+        state['high'][ids] = np.where(first, prices, np.fmax(state['high'][ids], prices))
+        state['low'][ids] = np.where(first, prices, np.fmin(state['low'][ids], prices))
+        state['close'][ids] = prices
+        state['volume'][ids] += volumes
+        state['vwap_num'][ids] += prices * volumes
+        state['count'][ids] += 1
+        state['end_time'][ids] = timestamps
+
+    def bar(self, symbol):
+        """
+        Current bar of a symbol.
+
+        Args:
+            symbol (str): Instrument symbol
+
+        Returns:
+            dict: open, high, low, close, volume, vwap, count, start_time and
+                  end_time (None if the symbol has no ticks in this bar)
+        """
+        sid = self.symbol_state.symbol_id(symbol, create=False)
+        if sid < 0 or self.symbol_state.state['count'][sid] == 0:
+            return None
+
+        record = self.symbol_state.state[sid]
+        volume = float(record['volume'])
+        return {
+            'open': float(record['open']),
+            'high': float(record['high']),
+            'low': float(record['low']),
+            'close': float(record['close']),
+            'volume': volume,
+            'vwap': float(record['vwap_num']) / volume if volume > 0 else float(record['close']),
+            'count': int(record['count']),
+            'start_time': record['start_time'],
+            'end_time': record['end_time']
+        }
+
+    def reset(self, symbol):
+        """Start a new bar for a symbol."""
+        sid = self.symbol_state.symbol_id(symbol, create=False)
+        if sid >= 0:
+            self.reset_ids([sid])
+
+    def reset_ids(self, symbol_ids):
+        """Start new bars for a batch of symbol ids."""
+        self.symbol_state.update(
+            symbol_ids, open=np.nan, high=np.nan, low=np.nan, close=np.nan, volume=0.0,
+            vwap_num=0.0, count=0, start_time=np.datetime64('NaT'),
+            end_time=np.datetime64('NaT')
+        )
@@ -0,0 +1,190 @@
+import pandas as pd
+import numpy as np
+
+
+def _as_matrix(values, dtype=np.float64):
+    """bars x symbols float matrix from a Series, DataFrame or array."""
+    if isinstance(values, (pd.Series, pd.DataFrame)):
+        values = values.to_numpy(dtype=dtype)
+    values = np.asarray(values, dtype=dtype)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def pair_events(groups, positions, values, group_last):
+    """
+    Pair entry/exit events into long trades.
+
+    An entry opens a trade only when flat, an exit closes it only when in a
+    trade, and repeated signals in between are ignored - the same rules as a
+    bar-by-bar state machine. Vectorized: consecutive repeats within a group
+    are dropped and a leading exit is discarded, which leaves strictly
+    alternating entry/exit pairs.
+
+    Args:
+        groups (np.ndarray): Group (symbol) of each event
+        positions (np.ndarray): Bar position of each event; events must be
+                                sorted by (group, position)
+        values (np.ndarray): Event sign (> 0 entry, < 0 exit)
+        group_last (np.ndarray): Last bar position of each group, where
+                                 trades still open at the end are closed
+
+    Returns:
+        tuple: (group, entry_position, exit_position, is_open) arrays, one
+               entry per trade, ordered by group then entry
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.int64)
+    values = np.asarray(values)
+
+    # Drop repeats of the previous event in the same group
+    keep = np.ones(len(groups), dtype=bool)
+    keep[1:] = (groups[1:] != groups[:-1]) | (values[1:] != values[:-1])
+    groups, positions, values = groups[keep], positions[keep], values[keep]
+
+    # A group's first remaining event must be an entry
+    first = np.ones(len(groups), dtype=bool)
+    first[1:] = groups[1:] != groups[:-1]
+    keep = ~(first & (values < 0))
+    groups, positions, values = groups[keep], positions[keep], values[keep]
+
+    entries = np.flatnonzero(values > 0)
+    nxt = entries + 1
+    has_exit = nxt < len(groups)
+    has_exit[has_exit] = groups[nxt[has_exit]] == groups[entries[has_exit]]
+
+    entry_groups = groups[entries]
+    exit_position = np.asarray(group_last, dtype=np.int64)[entry_groups]
+    exit_position[has_exit] = positions[nxt[has_exit]]
+    return entry_groups, positions[entries], exit_position, ~has_exit
+
+
+def pair_trades(signals):
+    """
+    Pair entry (1) and exit (-1) signals into long trades, per column.
+
+    Args:
+        signals (array-like): bars x symbols (or 1-D) signal values
+
+    Returns:
+        tuple: (symbol, entry_index, exit_index, is_open) int/bool arrays, one
+               entry per trade, ordered by symbol then entry; trades still
+               open at the end have exit_index = last bar and is_open True
+    """
+    signals = np.nan_to_num(np.sign(_as_matrix(signals)))
+    n_bars, n_symbols = signals.shape
+    cols, rows = np.nonzero(signals.T)
+    return pair_events(cols, rows, signals[rows, cols], np.full(n_symbols, n_bars - 1))
+
+
+def position_matrix(n_bars, n_symbols, symbol, entry_index, exit_index):
+    """
+    Long exposure per bar: 1 on bars (entry, exit], i.e. the bars whose
+    returns a trade entered at the entry close and exited at the exit close
+    earns.
+
+    Args:
+        n_bars (int): Number of bars
+        n_symbols (int): Number of symbols
+        symbol, entry_index, exit_index (np.ndarray): Trades from pair_trades
+
+    Returns:
+        np.ndarray: bars x symbols float matrix of 0/1
+    """
+    steps = np.zeros((n_bars + 1, n_symbols))
+    np.add.at(steps, (entry_index + 1, symbol), 1.0)
+    np.add.at(steps, (exit_index + 1, symbol), -1.0)
+    return np.cumsum(steps[:-1], axis=0)
+
+
+def compute_trade_metrics(signals, prices, periods_per_year=None):
+    """
+    Trade-level and bar-level performance for one or many symbols.
+
+    Trades are long, entered at the close of the entry bar and exited at the
+    close of the exit bar (or the last bar if still open). Bar returns of the
+    position drive equity, Sharpe, Sortino and drawdown.
+
+    Args:
+        signals (array-like): bars x symbols (or 1-D) signals (1 entry, -1 exit)
+        prices (array-like): Prices with the same shape
+        periods_per_year (int, optional): Annualize Sharpe/Sortino by
+                                          sqrt(periods_per_year) (default: per bar)
+
+    Returns:
+        dict: {
+            'trades': {symbol, entry_index, exit_index, entry_price,
+                       exit_price, return, duration, is_open} arrays,
+            'summary': per-symbol arrays {num_trades, open_trades, win_rate,
+                       total_return, avg_trade_return, avg_trade_duration,
+                       exposure, sharpe_ratio, sortino_ratio, max_drawdown};
+                       win_rate, avg_trade_return and avg_trade_duration are
+                       over closed trades, open_trades counts the rest,
+            'strategy_returns': bars x symbols bar returns of the position
+        }
+    """
+    prices = _as_matrix(prices)
+    signals = _as_matrix(signals)
+    n_bars, n_symbols = prices.shape
+
+    symbol, entry_index, exit_index, is_open = pair_trades(signals)
+    entry_price = prices[entry_index, symbol]
+    exit_price = prices[exit_index, symbol]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        trade_return = exit_price / entry_price - 1
+    duration = exit_index - entry_index
+
+    # Bar returns while in a position
+    bar_returns = np.zeros_like(prices)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bar_returns[1:] = prices[1:] / prices[:-1] - 1
+    bar_returns[~np.isfinite(bar_returns)] = 0.0
+    position = position_matrix(n_bars, n_symbols, symbol, entry_index, exit_index)
+    strategy_returns = position * bar_returns
+
+    # Per-symbol trade aggregates
+    num_trades = np.bincount(symbol, minlength=n_symbols)
+    closed = ~is_open
+    num_closed = np.bincount(symbol[closed], minlength=n_symbols)
+    wins = np.bincount(symbol[closed], weights=(trade_return[closed] > 0), minlength=n_symbols)
+    valid_return = np.where(np.isfinite(trade_return[closed]), trade_return[closed], 0.0)
+    return_sum = np.bincount(symbol[closed], weights=valid_return, minlength=n_symbols)
+    duration_sum = np.bincount(symbol[closed], weights=duration[closed], minlength=n_symbols)
+
+    # Bar-level risk metrics
+    mean = strategy_returns.mean(axis=0)
+    std = strategy_returns.std(axis=0, ddof=1) if n_bars > 1 else np.zeros(n_symbols)
+    downside = np.sqrt(np.mean(np.minimum(strategy_returns, 0.0) ** 2, axis=0))
+    scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+
+    equity = np.cumprod(1 + strategy_returns, axis=0)
+    running_max = np.maximum.accumulate(equity, axis=0)
+    drawdown = equity / running_max - 1
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        summary = {
+            'num_trades': num_trades,
+            'open_trades': num_trades - num_closed,
+            'win_rate': np.where(num_closed > 0, wins / np.maximum(num_closed, 1), 0.0),
+            'total_return': equity[-1] - 1 if n_bars else np.zeros(n_symbols),
+            'avg_trade_return': np.where(num_closed > 0, return_sum / np.maximum(num_closed, 1), 0.0),
+            'avg_trade_duration': np.where(num_closed > 0, duration_sum / np.maximum(num_closed, 1), 0.0),
+            'exposure': position.mean(axis=0) if n_bars else np.zeros(n_symbols),
+            'sharpe_ratio': np.where(std > 0, mean / np.where(std > 0, std, 1) * scale, 0.0),
+            'sortino_ratio': np.where(downside > 0, mean / np.where(downside > 0, downside, 1) * scale, 0.0),
+            'max_drawdown': drawdown.min(axis=0) if n_bars else np.zeros(n_symbols)
+        }
+
+    return {
+        'trades': {
+            'symbol': symbol,
+            'entry_index': entry_index,
+            'exit_index': exit_index,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'return': trade_return,
+            'duration': duration,
+            'is_open': is_open
+        },
+        'summary': summary,
+        'strategy_returns': strategy_returns
+    }
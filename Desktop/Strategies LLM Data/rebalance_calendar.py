@@ -0,0 +1,186 @@
+import pandas as pd
+import numpy as np
+
+
+class RebalanceCalendar:
+    """
+    Precomputed rebalance schedule over a trading-session index.
+
+    Periodic strategies use it to find their rebalance sessions up front
+    (first/last trading day of each week, month, quarter or year, every N
+    periods, or every N sessions) instead of re-checking date arithmetic on
+    every bar, and then only evaluate their selection logic on those rows.
+
+    Period codes are monotonic integers per session:
+        'W': Monday-based week number since 1970-01-05 (ISO weeks)
+        'M': year * 12 + month - 1
+        'Q': year * 4 + quarter - 1
+        'Y': year
+    """
+
+    FREQUENCIES = ('W', 'M', 'Q', 'Y')
+
+    def __init__(self, sessions):
+        """
+        Build the calendar.
+        Args:
+            sessions (array-like): Trading sessions (dates or timestamps);
+                                   normalized to days, de-duplicated and sorted.
+        """
+        sessions = pd.DatetimeIndex(sessions).normalize().unique().sort_values()
+        self.sessions = sessions
+        self.n_sessions = len(sessions)
+        self._codes = {freq: self.period_code(sessions, freq) for freq in self.FREQUENCIES}
+
+    @staticmethod
+    def period_code(dates, freq='M'):
+        """
+        Period code of one date or an array of dates.
+
+        Args:
+            dates (datetime-like or array-like): Date(s)
+            freq (str): 'W', 'M', 'Q' or 'Y'
+
+        Returns:
+            int or np.ndarray: Period code(s)
+        """
+        scalar = not hasattr(dates, '__len__') or isinstance(dates, str)
+        index = pd.DatetimeIndex([dates] if scalar else dates)
+
+        if freq == 'W':
+            ordinals = index.values.astype('datetime64[D]').astype(np.int64)
+            codes = (ordinals - 4) // 7  # 1970-01-05 was a Monday
+        elif freq == 'M':
+            codes = index.year.values.astype(np.int64) * 12 + index.month.values - 1
+        elif freq == 'Q':
+            codes = index.year.values.astype(np.int64) * 4 + (index.month.values - 1) // 3
+        elif freq == 'Y':
+            codes = index.year.values.astype(np.int64)
+        else:
+            raise ValueError(f"freq must be one of {RebalanceCalendar.FREQUENCIES}")
+
+        codes = np.asarray(codes, dtype=np.int64)
+        return int(codes[0]) if scalar else codes
+
+    def codes(self, freq='M'):
+        """Period code of every session."""
+        return self._codes[freq]
+
+    def period_starts(self, freq='M', every=1, offset=0):
+        """
+        First trading session of every `every`-th period.
+
+        Args:
+            freq (str): 'W', 'M', 'Q' or 'Y'
+            every (int): Keep one period in `every`, counted from the first
+            offset (int): Which period within each group of `every` to keep
+
+        Returns:
+            np.ndarray: Session rows
+        """
+        codes = self.codes(freq)
+        if self.n_sessions == 0:
+            return np.empty(0, dtype=np.int64)
+        starts = np.flatnonzero(np.diff(codes, prepend=codes[0] - 1) != 0)
+        keep = (codes[starts] - codes[0]) % every == offset
+        return starts[keep]
+
+    def period_ends(self, freq='M', every=1, offset=0):
+        """
+        Last trading session of every `every`-th period.
+
+        Args:
+            freq (str): 'W', 'M', 'Q' or 'Y'
+            every (int): Keep one period in `every`, counted from the first
+            offset (int): Which period within each group of `every` to keep
+
+        Returns:
+            np.ndarray: Session rows
+        """
+        codes = self.codes(freq)
+        if self.n_sessions == 0:
+            return np.empty(0, dtype=np.int64)
+        ends = np.flatnonzero(np.diff(codes, append=codes[-1] + 1) != 0)
+        keep = (codes[ends] - codes[0]) % every == offset
+        return ends[keep]
+
+    def monthly(self, every=1):
+        """First trading day of every `every`-th month."""
+        return self.period_starts('M', every)
+
+    def quarterly(self, every=1):
+        """First trading day of every `every`-th quarter."""
+        return self.period_starts('Q', every)
+
+    def every_n_sessions(self, n, start=0):
+        """
+        Every n-th session from start.
+
+        Args:
+            n (int): Sessions between rebalances
+            start (int): First rebalance row
+
+        Returns:
+            np.ndarray: Session rows
+        """
+        return np.arange(start, self.n_sessions, max(int(n), 1), dtype=np.int64)
+
+    def schedule(self, rule='sessions', n=1, start=0):
+        """
+        Rebalance rows for a named rule.
+
+        Args:
+            rule (str): 'sessions', 'weekly', 'monthly', 'quarterly' or 'yearly'
+            n (int): Sessions (for 'sessions') or periods between rebalances
+            start (int): First row for 'sessions'
+
+        Returns:
+            np.ndarray: Session rows
+        """
+        if rule == 'sessions':
+            return self.every_n_sessions(n, start)
+        freqs = {'weekly': 'W', 'monthly': 'M', 'quarterly': 'Q', 'yearly': 'Y'}
+        if rule not in freqs:
+            raise ValueError(f"Unknown rebalance rule: {rule}")
+        return self.period_starts(freqs[rule], n)
+
+    def first_row_in_period(self, code, freq='M'):
+        """
+        First session at or after the start of a period.
+
+        Args:
+            code (int): Period code
+            freq (str): 'W', 'M', 'Q' or 'Y'
+
+        Returns:
+            int: Session row (n_sessions if the period is past the end)
+        """
+        return int(np.searchsorted(self.codes(freq), code, side='left'))
+
+    def next_period_start(self, row, periods=1, freq='M'):
+        """
+        First session `periods` periods after the period of row.
+
+        Args:
+            row (int): Current session row
+            periods (int): Periods to move forward
+            freq (str): 'W', 'M', 'Q' or 'Y'
+
+        Returns:
+            int: Session row (n_sessions if past the end)
+        """
+        return self.first_row_in_period(self.codes(freq)[row] + periods, freq)
+
+    def mask(self, rows):
+        """
+        Boolean per-session mask of rebalance rows.
+
+        Args:
+            rows (array-like): Session rows
+
+        Returns:
+            np.ndarray: True on rebalance sessions
+        """
+        mask = np.zeros(self.n_sessions, dtype=bool)
+        mask[np.asarray(rows, dtype=np.int64)] = True
+        return mask
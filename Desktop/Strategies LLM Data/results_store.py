@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Results Store
+SQLite database of StrategyTester runs: metrics, timings and parameter sets
+of every (strategy, scenario) result, indexed for cross-run queries.
+
+Usage:
+    python results_store.py runs                       # latest runs
+    python results_store.py metric sharpe_ratio --last 30
+    python results_store.py slowest --days 7
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+import pandas as pd
+
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_results.db')
+
+# Metrics stored as REAL but reported as integers
+INTEGER_METRICS = ('num_trades', 'open_trades', 'total_signals')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    test_date TEXT NOT NULL,
+    wall_seconds REAL,
+    workers INTEGER,
+    environment TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS parameter_sets (
+    param_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    strategy TEXT NOT NULL,
+    params TEXT NOT NULL,
+    UNIQUE (strategy, params)
+);
+
+CREATE TABLE IF NOT EXISTS scenario_results (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    strategy TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    seconds REAL,
+    data_points INTEGER,
+    total_signals INTEGER,
+    buy_signals INTEGER,
+    sell_signals INTEGER,
+    hold_signals INTEGER,
+    param_id INTEGER REFERENCES parameter_sets (param_id),
+    PRIMARY KEY (run_id, strategy, scenario)
+);
+CREATE INDEX IF NOT EXISTS idx_scenario_results_strategy ON scenario_results (strategy, run_id);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    strategy TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, strategy, scenario, name)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics (name, run_id);
+"""
+
+
+class ResultsStore:
+    """
+    Indexed SQLite store of tester runs.
+
+    One row per run, one row per (run, strategy, scenario) result with its
+    timing and signal counts, one row per metric value (so new metrics need
+    no schema change) and deduplicated parameter sets. Queries return
+    DataFrames and hit the indexes, so they stay in the millisecond range
+    as runs accumulate.
+
+    Example:
+        with ResultsStore() as store:
+            run_id = store.record_run(tester.results, tester.test_date, wall_seconds=3.2)
+            store.metric_by_strategy('sharpe_ratio', last_runs=30)
+            store.slowest_strategies(days=7)
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        """
+        Open (and create if needed) the database.
+        Args:
+            path (str): SQLite file, or ':memory:'
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _param_id(self, strategy, params):
+        """Id of a parameter set, inserting it on first use."""
+        if params is None:
+            return None
+        payload = json.dumps(params, sort_keys=True, default=str)
+        self.conn.execute("INSERT OR IGNORE INTO parameter_sets (strategy, params) VALUES (?, ?)",
+                          (strategy, payload))
+        return self.conn.execute("SELECT param_id FROM parameter_sets WHERE strategy = ? AND params = ?",
+                                 (strategy, payload)).fetchone()[0]
+
+    def record_run(self, results, test_date, wall_seconds=None, workers=1, environment=None, started_at=None):
+        """
+        Store one tester run in a single transaction.
+
+        Args:
+            results (dict): {strategy_name: {'scenarios': {scenario: result}}}
+                            as built by StrategyTester
+            test_date (str): Test date shown in the reports
+            wall_seconds (float, optional): Wall time of the run
+            workers (int, optional): Pool size used
+            environment (dict, optional): Machine/library details
+            started_at (datetime, optional): Run time (default: now)
+
+        Returns:
+            int: run_id
+        """
+        started_at = (started_at or datetime.now()).isoformat(timespec='seconds')
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (started_at, test_date, wall_seconds, workers, environment) VALUES (?, ?, ?, ?, ?)",
+                (started_at, test_date, wall_seconds, workers, json.dumps(environment or {}))).lastrowid
+
+            rows = []
+            metric_rows = []
+            position = 0
+            for strategy, strategy_results in results.items():
+                for scenario, result in strategy_results['scenarios'].items():
+                    breakdown = result.get('signal_breakdown', {})
+                    rows.append((run_id, strategy, scenario, position, result['status'], result.get('error'),
+                                 result.get('seconds'), result.get('data_points'), result.get('total_signals'),
+                                 breakdown.get('buy_signals'), breakdown.get('sell_signals'),
+                                 breakdown.get('hold_signals'), self._param_id(strategy, result.get('params'))))
+                    metric_rows.extend((run_id, strategy, scenario, name, float(value))
+                                       for name, value in result.get('metrics', {}).items())
+                    position += 1
+
+            self.conn.executemany("INSERT INTO scenario_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)", metric_rows)
+        return run_id
+
+    def latest_run_id(self):
+        """Id of the most recent run (None if the store is empty)."""
+        return self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+
+    def run_results(self, run_id=None):
+        """
+        Rebuild a run's results in StrategyTester's format.
+
+        Args:
+            run_id (int, optional): Run (default: latest)
+
+        Returns:
+            dict: {strategy_name: {'strategy_name', 'test_date', 'scenarios'}}
+        """
+        run_id = run_id if run_id is not None else self.latest_run_id()
+        run = self.conn.execute("SELECT test_date FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if run is None:
+            raise KeyError(f"No run {run_id}")
+
+        metrics = {}
+        for strategy, scenario, name, value in self.conn.execute(
+                "SELECT strategy, scenario, name, value FROM metrics WHERE run_id = ?", (run_id,)):
+            if name in INTEGER_METRICS:
+                value = int(value)
+            metrics.setdefault((strategy, scenario), {})[name] = value
+
+        results = {}
+        for (strategy, scenario, status, error, seconds, data_points, total_signals,
+             buy, sell, hold, params) in self.conn.execute(
+                """SELECT r.strategy, r.scenario, r.status, r.error, r.seconds, r.data_points, r.total_signals,
+                          r.buy_signals, r.sell_signals, r.hold_signals, p.params
+                   FROM scenario_results r LEFT JOIN parameter_sets p ON p.param_id = r.param_id
+                   WHERE r.run_id = ? ORDER BY r.position""", (run_id,)):
+            entry = results.setdefault(strategy, {'strategy_name': strategy, 'test_date': run[0], 'scenarios': {}})
+            result = {'status': status, 'data_points': data_points, 'seconds': seconds}
+            if status == 'PASSED':
+                result['metrics'] = metrics.get((strategy, scenario), {})
+                result['total_signals'] = total_signals
+                result['signal_breakdown'] = {'buy_signals': buy, 'sell_signals': sell, 'hold_signals': hold}
+            else:
+                result['error'] = error
+            if params is not None:
+                result['params'] = json.loads(params)
+            entry['scenarios'][scenario] = result
+        return results
+
+    def runs(self, limit=30):
+        """
+        Latest runs with their pass counts.
+
+        Args:
+            limit (int): Number of runs
+
+        Returns:
+            pd.DataFrame: run_id, started_at, test_date, wall_seconds,
+                          workers, tests, passed
+        """
+        return pd.read_sql_query(
+            """SELECT r.run_id, r.started_at, r.test_date, r.wall_seconds, r.workers,
+                      COUNT(s.scenario) AS tests, SUM(s.status = 'PASSED') AS passed
+               FROM (SELECT * FROM runs ORDER BY run_id DESC LIMIT ?) r
+               LEFT JOIN scenario_results s ON s.run_id = r.run_id
+               GROUP BY r.run_id ORDER BY r.run_id DESC""", self.conn, params=(limit,))
+
+    def metric_history(self, metric, last_runs=30, strategy=None, scenario=None):
+        """
+        Values of one metric over the latest runs.
+
+        Args:
+            metric (str): Metric name, e.g. 'sharpe_ratio'
+            last_runs (int): Number of most recent runs
+            strategy (str, optional): Only this strategy
+            scenario (str, optional): Only this scenario
+
+        Returns:
+            pd.DataFrame: run_id, started_at, strategy, scenario, value
+        """
+        query = """SELECT m.run_id, r.started_at, m.strategy, m.scenario, m.value
+                   FROM metrics m JOIN runs r ON r.run_id = m.run_id
+                   WHERE m.name = ? AND m.run_id >= (SELECT COALESCE(MIN(run_id), 0) FROM
+                         (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?))"""
+        params = [metric, last_runs]
+        if strategy is not None:
+            query += " AND m.strategy = ?"
+            params.append(strategy)
+        if scenario is not None:
+            query += " AND m.scenario = ?"
+            params.append(scenario)
+        return pd.read_sql_query(query + " ORDER BY m.run_id, m.strategy, m.scenario", self.conn, params=params)
+
+    def metric_by_strategy(self, metric, last_runs=30):
+        """
+        One metric aggregated per strategy over the latest runs, e.g.
+        Sharpe by strategy over the last 30 runs.
+
+        Args:
+            metric (str): Metric name
+            last_runs (int): Number of most recent runs
+
+        Returns:
+            pd.DataFrame: strategy, runs, mean, min, max (best mean first)
+        """
+        return pd.read_sql_query(
+            """SELECT strategy, COUNT(DISTINCT run_id) AS runs, AVG(value) AS mean,
+                      MIN(value) AS min, MAX(value) AS max
+               FROM metrics
+               WHERE name = ? AND run_id >= (SELECT COALESCE(MIN(run_id), 0) FROM
+                     (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?))
+               GROUP BY strategy ORDER BY mean DESC""", self.conn, params=(metric, last_runs))
+
+    def slowest_strategies(self, days=7, limit=10):
+        """
+        Strategies by average scenario time over recent runs, e.g. the
+        slowest strategies this week.
+
+        Args:
+            days (float): Look-back window
+            limit (int): Number of strategies
+
+        Returns:
+            pd.DataFrame: strategy, runs, mean_seconds, max_seconds,
+                          total_seconds (slowest first)
+        """
+        since = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+        return pd.read_sql_query(
+            """SELECT s.strategy, COUNT(DISTINCT s.run_id) AS runs, AVG(s.seconds) AS mean_seconds,
+                      MAX(s.seconds) AS max_seconds, SUM(s.seconds) AS total_seconds
+               FROM scenario_results s
+               WHERE s.run_id IN (SELECT run_id FROM runs WHERE started_at >= ?)
+               GROUP BY s.strategy ORDER BY mean_seconds DESC LIMIT ?""",
+            self.conn, params=(since, limit))
+
+    def parameter_sets(self, strategy=None):
+        """
+        Stored parameter sets.
+
+        Args:
+            strategy (str, optional): Only this strategy
+
+        Returns:
+            pd.DataFrame: param_id, strategy, params (JSON)
+        """
+        query = "SELECT param_id, strategy, params FROM parameter_sets"
+        params = ()
+        if strategy is not None:
+            query += " WHERE strategy = ?"
+            params = (strategy,)
+        return pd.read_sql_query(query + " ORDER BY param_id", self.conn, params=params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the tester results store")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite file")
+    commands = parser.add_subparsers(dest='command', required=True)
+    runs = commands.add_parser('runs', help="latest runs")
+    runs.add_argument('--last', type=int, default=30)
+    metric = commands.add_parser('metric', help="one metric per strategy over the latest runs")
+    metric.add_argument('name', help="e.g. sharpe_ratio, total_return, max_drawdown")
+    metric.add_argument('--last', type=int, default=30)
+    metric.add_argument('--history', action='store_true', help="every value instead of per-strategy stats")
+    slowest = commands.add_parser('slowest', help="slowest strategies over recent days")
+    slowest.add_argument('--days', type=float, default=7)
+    slowest.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.command == 'runs':
+            frame = store.runs(args.last)
+        elif args.command == 'metric':
+            frame = (store.metric_history(args.name, args.last) if args.history
+                     else store.metric_by_strategy(args.name, args.last))
+        else:
+            frame = store.slowest_strategies(args.days, args.limit)
+    print(frame.to_string(index=False) if len(frame) else "No results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Robustness Engine
+Monte Carlo / block-bootstrap resampling of history into thousands of
+paths, with each strategy's indicator and rule logic evaluated across the
+path axis at once, giving distributions of Sharpe ratio, drawdown, total
+return and trade count.
+
+Paths are generated and evaluated in chunks, so memory stays bounded by
+--max-memory whatever the number of paths.
+
+Usage:
+    python robustness.py --strategy volatility_contraction --paths 2000 --block-size 20
+    python robustness.py --strategy top3_momentum --paths 1000 --symbols 30
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from performance_metrics import compute_trade_metrics
+from rebalance_calendar import RebalanceCalendar
+from symbol_date_index import get_symbol_date_index
+
+# Paths per random stream: each block of PATH_BLOCK paths has its own seed,
+# so results don't depend on the chunk size
+PATH_BLOCK = 64
+
+METRICS = ('sharpe_ratio', 'max_drawdown', 'total_return', 'num_trades')
+
+
+def block_bootstrap_indices(n_source, n_paths, n_bars, block_size=1, rng=None):
+    """
+    Circular moving-block bootstrap of positions 0..n_source-1.
+
+    Each path is built from blocks of `block_size` consecutive positions
+    starting at uniform random offsets (wrapping around the end), which
+    keeps short-range dependence such as volatility clustering;
+    block_size=1 is the plain i.i.d. bootstrap.
+
+    Args:
+        n_source (int): Number of source observations
+        n_paths (int): Number of paths
+        n_bars (int): Observations per path
+        block_size (int): Block length
+        rng (np.random.Generator, optional): Random generator
+
+    Returns:
+        np.ndarray: (n_paths, n_bars) int64 source positions
+    """
+    rng = rng or np.random.default_rng()
+    block_size = max(1, min(int(block_size), n_source))
+    n_blocks = -(-n_bars // block_size)
+    starts = rng.integers(0, n_source, size=(n_paths, n_blocks, 1))
+    indices = (starts + np.arange(block_size)) % n_source
+    return indices.reshape(n_paths, -1)[:, :n_bars]
+
+
+def resample_bars(data, indices):
+    """
+    OHLCV paths from resampled bars.
+
+    Bar j of the source contributes its close-to-close return and its
+    open/high/low relative to its own close, so each path is a continuous
+    price series starting at the first source close.
+
+    Args:
+        data (pd.DataFrame): Source bars with close (and open, high, low, volume)
+        indices (np.ndarray): (paths, bars) positions into the source
+                              returns (bar j + 1 of the data)
+
+    Returns:
+        dict: {column: (paths, bars) float64 matrix}
+    """
+    close = data['close'].to_numpy(dtype=np.float64)
+    source = indices + 1
+    growth = close[1:] / close[:-1]
+    paths_close = close[0] * np.cumprod(growth[indices], axis=1)
+    bars = {'close': paths_close}
+    previous = np.concatenate([np.full((len(indices), 1), close[0]), paths_close[:, :-1]], axis=1)
+    if 'open' in data.columns:
+        bars['open'] = previous * (data['open'].to_numpy(dtype=np.float64)[source] / close[source - 1])
+    for column in ('high', 'low'):
+        if column in data.columns:
+            bars[column] = paths_close * (data[column].to_numpy(dtype=np.float64)[source] / close[source])
+    if 'volume' in data.columns:
+        bars['volume'] = data['volume'].to_numpy(dtype=np.float64)[source]
+    return bars
+
+
+def _rolling(values, window, reduce):
+    """Trailing window reduction along axis 1 (NaN until the window is full)."""
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[1]:
+        out[:, window - 1:] = reduce(sliding_window_view(values, window, axis=1), axis=-1)
+    return out
+
+
+def rolling_mean(values, window):
+    return _rolling(values, window, np.mean)
+
+
+def rolling_std(values, window):
+    return _rolling(values, window, lambda v, axis: np.std(v, axis=axis, ddof=1))
+
+
+def rolling_max(values, window):
+    return _rolling(values, window, np.max)
+
+
+def rolling_min(values, window):
+    return _rolling(values, window, np.min)
+
+
+def shift_bars(values):
+    """Values of the previous bar along axis 1 (NaN on the first bar)."""
+    return np.concatenate([np.full((len(values), 1), np.nan), values[:, :-1]], axis=1)
+
+
+def rolling_rank_pct(values, window):
+    """
+    Percentile rank of each value within its trailing window, ties averaged
+    (as pandas rolling(window).rank(pct=True)); NaN if the window has NaNs.
+    """
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[1]:
+        windows = sliding_window_view(values, window, axis=1)
+        last = windows[..., -1:]
+        less = (windows < last).sum(axis=-1)
+        equal = (windows == last).sum(axis=-1)
+        rank = (less + (equal + 1) / 2) / window
+        rank[np.isnan(windows).any(axis=-1)] = np.nan
+        out[:, window - 1:] = rank
+    return out
+
+
+def vcb_signals(bars, params):
+    """
+    VolatilityContractionBreakoutStrategy rules over paths x bars matrices.
+
+    Indicators are computed for every path and bar at once; the position
+    state machine steps through bars with the state of all paths as vectors.
+
+    Args:
+        bars (dict): (paths, bars) close, high, low and volume matrices
+        params (dict): Strategy parameters
+
+    Returns:
+        np.ndarray: (paths, bars) int8 signals (1 entry, -1 exit)
+    """
+    close, high, low, volume = bars['close'], bars['high'], bars['low'], bars['volume']
+    n_paths, n_bars = close.shape
+
+    middle = rolling_mean(close, params['bb_period'])
+    std = rolling_std(close, params['bb_period'])
+    width = (middle + params['bb_std'] * std) - (middle - params['bb_std'] * std)
+
+    previous_close = shift_bars(close)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    atr = rolling_mean(true_range, params['atr_period'])
+
+    # Range of the previous consolidation_period bars, as in the strategy
+    consolidation_high = shift_bars(rolling_max(high, params['consolidation_period']))
+    consolidation_low = shift_bars(rolling_min(low, params['consolidation_period']))
+    width_percentile = rolling_rank_pct(width, params['width_lookback']) * 100
+    volume_ratio = volume / rolling_mean(volume, params['volume_period'])
+
+    with np.errstate(invalid='ignore'):
+        valid = ~(np.isnan(width) | np.isnan(width_percentile) | np.isnan(consolidation_high) |
+                  np.isnan(volume_ratio) | np.isnan(atr))
+        entry_condition = valid & (width_percentile <= params['width_percentile']) & \
+            (close > consolidation_high) & (volume_ratio > params['volume_multiplier'])
+
+    signals = np.zeros((n_paths, n_bars), dtype=np.int8)
+    position = np.zeros(n_paths, dtype=bool)
+    highest = np.full(n_paths, np.nan)
+    entry_bar = np.zeros(n_paths, dtype=np.int64)
+    for i in range(max(params['width_lookback'], params['consolidation_period']), n_bars):
+        held = position & valid[:, i]
+        highest = np.where(held, np.fmax(highest, high[:, i]), highest)
+        with np.errstate(invalid='ignore'):
+            trailing_stop = highest - params['atr_multiplier'] * atr[:, i]
+            exits = held & ((close[:, i] < trailing_stop) | (close[:, i] < consolidation_low[:, i]) |
+                            (i - entry_bar > params['max_holding_period']))
+        entries = ~position & entry_condition[:, i]
+        signals[exits, i] = -1
+        signals[entries, i] = 1
+        position = (position & ~exits) | entries
+        highest[entries] = high[entries, i]
+        entry_bar[entries] = i
+    return signals
+
+
+def top3_schedule(days, params, n_symbols):
+    """
+    Top3MomentumStrategy rebalance rows and momentum window starts.
+
+    With complete data the schedule doesn't depend on prices, so it is
+    computed once and shared by every path.
+
+    Args:
+        days (np.ndarray): Sorted datetime64 sessions
+        params (dict): Strategy parameters
+        n_symbols (int): Symbols in the panel
+
+    Returns:
+        tuple: (rebalance rows, window start row of each) int arrays
+    """
+    calendar = RebalanceCalendar(days)
+    rows, starts = [], []
+    i = 0
+    while i < calendar.n_sessions:
+        start_date = pd.Timestamp(days[i]) - pd.DateOffset(months=params['momentum_period'])
+        start = int(np.searchsorted(days, start_date.to_datetime64(), side='left'))
+        if start >= i or n_symbols < params['top_n_stocks']:
+            i += 1
+            continue
+        rows.append(i)
+        starts.append(start)
+        i = max(calendar.next_period_start(i, params['rebalance_frequency'], 'M'), i + 1)
+    return np.asarray(rows, dtype=np.int64), np.asarray(starts, dtype=np.int64)
+
+
+def top3_returns(closes, rows, starts, top_n):
+    """
+    Top3MomentumStrategy portfolio over (paths, bars, symbols) closes.
+
+    At each rebalance row every path picks its top_n trailing returns, holds
+    them equally weighted until the next rebalance and counts a trade for
+    each newly selected symbol.
+
+    Args:
+        closes (np.ndarray): (paths, bars, symbols) closes
+        rows, starts (np.ndarray): From top3_schedule
+        top_n (int): Symbols held
+
+    Returns:
+        tuple: ((paths, bars) portfolio bar returns, (paths,) trade counts)
+    """
+    n_paths, n_bars, n_symbols = closes.shape
+    bar_returns = np.zeros_like(closes)
+    bar_returns[:, 1:] = closes[:, 1:] / closes[:, :-1] - 1
+    strategy_returns = np.zeros((n_paths, n_bars))
+    trades = np.zeros(n_paths, dtype=np.int64)
+    held = np.zeros((n_paths, n_symbols), dtype=bool)
+    ends = np.append(rows[1:], n_bars - 1)
+    paths = np.arange(n_paths)[:, None]
+
+    for row, start, end in zip(rows, starts, ends):
+        momentum = closes[:, row] / closes[:, start] - 1
+        top = np.argpartition(-momentum, top_n - 1, axis=1)[:, :top_n] if top_n < n_symbols else \
+            np.broadcast_to(np.arange(n_symbols), (n_paths, n_symbols))
+        selected = np.zeros_like(held)
+        selected[paths, top] = True
+        trades += (selected & ~held).sum(axis=1)
+        held = selected
+        # Held on bars (row, end]: bought at the rebalance close
+        window = bar_returns[:, row + 1:end + 1]
+        strategy_returns[:, row + 1:end + 1] = np.take_along_axis(window, top[:, None, :], axis=2).mean(axis=2)
+    return strategy_returns, trades
+
+
+def returns_metrics(strategy_returns, periods_per_year=None):
+    """
+    Sharpe ratio, max drawdown and total return of each path's bar returns.
+
+    Args:
+        strategy_returns (np.ndarray): (paths, bars) returns
+        periods_per_year (int, optional): Annualize the Sharpe ratio
+
+    Returns:
+        dict: {metric: (paths,) array}
+    """
+    std = strategy_returns.std(axis=1, ddof=1)
+    scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+    equity = np.cumprod(1 + strategy_returns, axis=1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.where(std > 0, strategy_returns.mean(axis=1) / np.where(std > 0, std, 1) * scale, 0.0)
+    return {'sharpe_ratio': sharpe, 'max_drawdown': drawdown.min(axis=1), 'total_return': equity[:, -1] - 1}
+
+
+class RobustnessEngine:
+    """
+    Bootstrap robustness test of one strategy.
+
+    Resamples the history into n_paths synthetic paths (moving blocks of
+    block_size bars) and evaluates the strategy on all of them, chunk by
+    chunk. VolatilityContractionBreakoutStrategy and Top3MomentumStrategy
+    run as path-axis kernels; other single-symbol strategies fall back to
+    one generate_signals call per path.
+
+    Example:
+        engine = RobustnessEngine(Top3MomentumStrategy, n_paths=2000, block_size=20)
+        result = engine.run(panel)
+        result['summary']['sharpe_ratio']['p5'], result['sharpe_ratio']
+    """
+
+    KERNELS = ('VolatilityContractionBreakoutStrategy', 'Top3MomentumStrategy')
+
+    def __init__(self, strategy_class, params=None, n_paths=1000, n_bars=None, block_size=20,
+                 max_memory_mb=256, periods_per_year=None, seed=42):
+        """
+        Initialize the engine.
+        Args:
+            strategy_class (type): Strategy to test
+            params (dict, optional): Strategy parameters (default: its defaults)
+            n_paths (int): Number of resampled paths
+            n_bars (int, optional): Bars per path (default: source length)
+            block_size (int): Bootstrap block length (1 = i.i.d. bootstrap)
+            max_memory_mb (float): Memory budget of one chunk of paths
+            periods_per_year (int, optional): Annualize the Sharpe ratio
+            seed (int): Random seed
+        """
+        self.strategy_class = strategy_class
+        self.params = {**strategy_class().params, **(params or {})}
+        self.n_paths = n_paths
+        self.n_bars = n_bars
+        self.block_size = block_size
+        self.max_memory_mb = max_memory_mb
+        self.periods_per_year = periods_per_year
+        self.seed = seed
+
+    def chunk_paths(self, bytes_per_path):
+        """Paths per chunk within the memory budget (a multiple of PATH_BLOCK)."""
+        budget = self.max_memory_mb * 1024 * 1024
+        blocks = max(1, int(budget // max(bytes_per_path * PATH_BLOCK, 1)))
+        return min(blocks * PATH_BLOCK, -(-self.n_paths // PATH_BLOCK) * PATH_BLOCK)
+
+    def _indices(self, first_path, n_paths, n_source, n_bars):
+        """Bootstrap indices of paths first_path.. (one seed per PATH_BLOCK paths)."""
+        seeds = np.random.SeedSequence(self.seed)
+        streams = seeds.spawn(-(-self.n_paths // PATH_BLOCK))
+        blocks = []
+        for block in range(first_path // PATH_BLOCK, -(-(first_path + n_paths) // PATH_BLOCK)):
+            size = min(PATH_BLOCK, self.n_paths - block * PATH_BLOCK)
+            rng = np.random.default_rng(streams[block])
+            blocks.append(block_bootstrap_indices(n_source, size, n_bars, self.block_size, rng))
+        return np.concatenate(blocks)
+
+    def run(self, data):
+        """
+        Run the bootstrap.
+
+        Args:
+            data (pd.DataFrame): Source history; single-symbol OHLCV, or a
+                                 long-format panel (symbol, date, close) for
+                                 Top3MomentumStrategy
+
+        Returns:
+            dict: {metric: (n_paths,) array for sharpe_ratio, max_drawdown,
+                   total_return and num_trades,
+                   'summary': {metric: {mean, std, p5, p25, p50, p75, p95}},
+                   'paths', 'bars', 'chunks', 'seconds'}
+        """
+        start = time.perf_counter()
+        name = self.strategy_class.__name__
+        if name == 'Top3MomentumStrategy':
+            evaluate, n_source, n_bars, bytes_per_path = self._prepare_top3(data)
+        else:
+            evaluate, n_source, n_bars, bytes_per_path = self._prepare_bars(data, name in self.KERNELS)
+
+        chunk = self.chunk_paths(bytes_per_path)
+        results = {metric: [] for metric in METRICS}
+        chunks = 0
+        for first in range(0, self.n_paths, chunk):
+            indices = self._indices(first, min(chunk, self.n_paths - first), n_source, n_bars)
+            for metric, values in evaluate(indices).items():
+                results[metric].append(values)
+            chunks += 1
+
+        result = {metric: np.concatenate(values) for metric, values in results.items()}
+        result['summary'] = {metric: self._describe(result[metric]) for metric in METRICS}
+        result.update(paths=self.n_paths, bars=n_bars, chunks=chunks, seconds=time.perf_counter() - start)
+        return result
+
+    def _prepare_bars(self, data, vectorized):
+        """Evaluator of a single-symbol strategy on resampled OHLCV paths."""
+        data = self.strategy_class().preprocess_data(data.copy())
+        n_source = len(data) - 1
+        n_bars = self.n_bars or len(data)
+        dates = data['date'].values[:1].astype('datetime64[ns]') if 'date' in data.columns else None
+
+        def evaluate(indices):
+            bars = resample_bars(data, indices)
+            if vectorized:
+                signals = vcb_signals(bars, self.params)
+            else:
+                signals = np.zeros(indices.shape, dtype=np.int8)
+                for p in range(len(indices)):
+                    frame = pd.DataFrame({column: values[p] for column, values in bars.items()})
+                    if dates is not None:
+                        frame.insert(0, 'date', pd.bdate_range(pd.Timestamp(dates[0]), periods=n_bars))
+                    output = self.strategy_class(dict(self.params)).generate_signals(frame)
+                    if 'Signal' in output.columns:
+                        signals[p] = np.sign(output['Signal'].fillna(0).to_numpy(dtype=np.float64))
+            summary = compute_trade_metrics(signals.T, bars['close'].T, self.periods_per_year)['summary']
+            return {metric: summary[metric] for metric in METRICS}
+
+        # Paths x bars float matrices: OHLCV, indicators and state (~24), the
+        # width-percentile window and the transposed metrics inputs
+        bytes_per_path = n_bars * (8 * 32 + self.params.get('width_lookback', 1) * 2)
+        return evaluate, n_source, n_bars, bytes_per_path
+
+    def _prepare_top3(self, data):
+        """Evaluator of Top3MomentumStrategy on resampled panels (dates resampled jointly)."""
+        data = self.strategy_class().preprocess_data(data.copy())
+        index = get_symbol_date_index(data)
+        closes = index.to_wide(data['close'].values)
+        if np.isnan(closes).any():
+            raise ValueError("Top3 bootstrap needs a complete dates x symbols close matrix")
+        n_bars = self.n_bars or index.n_days
+        days = index.days if n_bars <= index.n_days else \
+            pd.bdate_range(pd.Timestamp(index.days[0]), periods=n_bars).values
+        rows, starts = top3_schedule(days[:n_bars], self.params, index.n_symbols)
+        growth = closes[1:] / closes[:-1]
+
+        def evaluate(indices):
+            paths = closes[0] * np.cumprod(growth[indices], axis=1)
+            strategy_returns, trades = top3_returns(paths, rows, starts, self.params['top_n_stocks'])
+            metrics = returns_metrics(strategy_returns, self.periods_per_year)
+            metrics['num_trades'] = trades
+            return metrics
+
+        bytes_per_path = n_bars * index.n_symbols * 8 * 4 + n_bars * 8 * 4
+        return evaluate, index.n_days - 1, n_bars, bytes_per_path
+
+    @staticmethod
+    def _describe(values):
+        """Mean, standard deviation and percentiles of a metric's distribution."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return {}
+        p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+        return {'mean': float(values.mean()), 'std': float(values.std()), 'p5': float(p5), 'p25': float(p25),
+                'p50': float(p50), 'p75': float(p75), 'p95': float(p95)}
+
+
+def main():
+    from benchmark_strategies import STRATEGIES, make_bars
+
+    names = [name for name, (module, _, _) in STRATEGIES.items() if module is not None]
+    parser = argparse.ArgumentParser(description="Bootstrap robustness test")
+    parser.add_argument('--strategy', choices=names, required=True)
+    parser.add_argument('--data', help="CSV with date and OHLCV (and symbol) columns (default: synthetic bars)")
+    parser.add_argument('--bars', type=int, default=2500, help="synthetic bars per symbol")
+    parser.add_argument('--symbols', type=int, default=20, help="synthetic symbols for panel strategies")
+    parser.add_argument('--paths', type=int, default=1000)
+    parser.add_argument('--block-size', type=int, default=20)
+    parser.add_argument('--max-memory', type=float, default=256, help="MB per chunk of paths")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write the distributions as JSON")
+    args = parser.parse_args()
+
+    module_name, class_name, multi_symbol = STRATEGIES[args.strategy]
+    strategy_class = getattr(__import__(module_name, fromlist=[class_name]), class_name)
+    if args.data:
+        data = pd.read_csv(args.data, parse_dates=['date'])
+    elif multi_symbol:
+        data = make_bars(args.bars * args.symbols, args.symbols)
+    else:
+        data = make_bars(args.bars).drop(columns='symbol')
+
+    engine = RobustnessEngine(strategy_class, n_paths=args.paths, block_size=args.block_size,
+                              max_memory_mb=args.max_memory, seed=args.seed)
+    result = engine.run(data)
+
+    print(f"Bootstrap: {class_name}, {result['paths']} paths x {result['bars']} bars, "
+          f"block {args.block_size}, {result['chunks']} chunk(s), {result['seconds']:.1f}s")
+    print(f"{'metric':<14} {'mean':>9} {'p5':>9} {'p50':>9} {'p95':>9}")
+    for metric in METRICS:
+        stats = result['summary'][metric]
+        if stats:
+            print(f"{metric:<14} {stats['mean']:>9.4f} {stats['p5']:>9.4f} {stats['p50']:>9.4f} {stats['p95']:>9.4f}")
+
+    if args.output:
+        report = {metric: result[metric].tolist() for metric in METRICS}
+        report.update({key: result[key] for key in ('summary', 'paths', 'bars', 'chunks', 'seconds')})
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import zipfile
+import pandas as pd
+import numpy as np
+
+
+CACHE_DIR_ENV = 'STRATEGY_SCENARIO_CACHE'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.scenario_cache')
+
+
+def cache_dir():
+    """
+    Scenario cache directory.
+
+    $STRATEGY_SCENARIO_CACHE overrides the default (.scenario_cache next to
+    this file); setting it to 'off' disables caching.
+
+    Returns:
+        str or None: Directory, or None when caching is disabled
+    """
+    directory = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+    return None if directory.lower() in ('', 'off', '0', 'none') else directory
+
+
+def scenario_key(name, params, source=''):
+    """
+    Cache key of one generator call.
+
+    Args:
+        name (str): Generator name
+        params (dict): Generator arguments (including the seed)
+        source (str): Generator source code, so edits invalidate old files
+
+    Returns:
+        str: '<name>-<16 hex digits>'
+    """
+    payload = json.dumps({'params': params, 'source': source}, sort_keys=True, default=str)
+    return f"{name}-{hashlib.sha1(payload.encode()).hexdigest()[:16]}"
+
+
+def save_frame(path, frame):
+    """
+    Write a DataFrame's columns to an uncompressed .npz file.
+
+    Written next to path and renamed over it, so concurrent readers never
+    see a partial file.
+
+    Args:
+        path (str): .npz file
+        frame (pd.DataFrame): Frame with numeric, bool or datetime columns
+    """
+    arrays = {}
+    for column in frame.columns:
+        values = frame[column].to_numpy()
+        if values.dtype == object:
+            raise ValueError(f"Column {column!r} has object dtype and can't be cached")
+        arrays[str(column)] = values
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_frame(path, mmap=True):
+    """
+    Read a DataFrame written by save_frame.
+
+    np.load can't memory-map .npz members, but save_frame stores them
+    uncompressed, so each member's .npy payload is memory-mapped in place.
+    The maps are copy-on-write: pages load lazily and are shared by every
+    process reading the file, and a caller modifying the frame gets private
+    copies of the touched pages, never changing the file.
+
+    Args:
+        path (str): .npz file
+        mmap (bool): Memory-map the columns instead of reading them
+
+    Returns:
+        pd.DataFrame: Frame with the saved columns in order
+    """
+    if not mmap:
+        with np.load(path, allow_pickle=False) as npz:
+            return pd.DataFrame({name[:-4]: npz[name] for name in npz.files})
+
+    columns = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} is compressed and can't be memory-mapped")
+            # Local file header: 30 bytes, then file name and extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(f)
+            read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran_order, dtype = read_header(f)
+            name = info.filename[:-4]
+            if int(np.prod(shape)) == 0:
+                columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode='c', offset=f.tell(), shape=shape,
+                                          order='F' if fortran_order else 'C').view(np.ndarray)
+    return pd.DataFrame(columns, copy=False)
+
+
+def cached_scenario(func):
+    """
+    Memoize a DataFrame generator on disk.
+
+    The cache key is the function name, its bound arguments (defaults
+    included, `self` excluded) and its source code, so a call with the same
+    parameters and seed loads the saved .npz (memory-mapped) instead of
+    regenerating it, and editing the generator invalidates old files. A
+    freshly generated frame is saved and returned as loaded from the file,
+    so the first and later calls return the same (writable) frame.
+
+    Example:
+        @cached_scenario
+        def create_test_data(n_periods=300, seed=42):
+            ...
+    """
+    signature = inspect.signature(func)
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = ''
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        directory = cache_dir()
+        if directory is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = {name: value for name, value in bound.arguments.items() if name != 'self'}
+        path = os.path.join(directory, scenario_key(func.__qualname__, params, source) + '.npz')
+
+        if os.path.exists(path):
+            try:
+                return load_frame(path)
+            except (OSError, ValueError, zipfile.BadZipFile):
+                pass  # Unreadable file: regenerate and overwrite it
+
+        frame = func(*args, **kwargs)
+        os.makedirs(directory, exist_ok=True)
+        save_frame(path, frame)
+        return load_frame(path)
+
+    wrapper.uncached = func
+    return wrapper
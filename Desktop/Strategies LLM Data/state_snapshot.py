@@ -0,0 +1,399 @@
+import json
+import os
+import pickle
+import struct
+from datetime import timedelta, timezone
+import numpy as np
+from numpy.lib.format import descr_to_dtype, dtype_to_descr
+
+
+SNAPSHOT_MAGIC = b'STSNAP01'
+JOURNAL_MAGIC = b'STJRNL02'
+_ALIGN = 64
+
+_MARKET_RECORD = struct.Struct('<BqiddH')  # kind, wall-clock ns, UTC offset s, price, volume, symbol length
+_OBJECT_RECORD = struct.Struct('<BI')     # kind, pickle length
+_KIND_MARKET = 1
+_KIND_OBJECT = 2
+_NAIVE = -(1 << 31)  # UTC offset of a naive timestamp
+
+
+def _to_descr(dtype):
+    """JSON-safe dtype description."""
+    return dtype_to_descr(np.dtype(dtype))
+
+
+def _from_descr(descr):
+    """Inverse of _to_descr (JSON turns the descr tuples into lists)."""
+    if isinstance(descr, list):
+        return descr_to_dtype([tuple(_from_descr(item) if isinstance(item, list) else item for item in field)
+                               for field in descr])
+    return descr_to_dtype(descr)
+
+
+def write_snapshot(path, arrays, meta=None):
+    """
+    Write arrays and metadata to one memory-mappable file.
+
+    Layout: magic, header length (uint64), JSON header (array names, dtypes,
+    shapes, offsets and meta), then each array's raw bytes at a 64-byte
+    aligned offset. The file is written next to path and renamed over it, so
+    a crash mid-write never leaves a torn snapshot.
+
+    Args:
+        path (str): Snapshot file
+        arrays (dict): {name: np.ndarray}
+        meta (dict, optional): JSON-serializable metadata
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    entries = []
+    for name, array in arrays.items():
+        entries.append({'name': name, 'descr': _to_descr(array.dtype), 'shape': list(array.shape),
+                        'nbytes': int(array.nbytes)})
+
+    # Header size depends on the offsets it contains; iterate until stable
+    data_start = 0
+    while True:
+        offset = data_start
+        for entry in entries:
+            entry['offset'] = offset
+            offset += -(-entry['nbytes'] // _ALIGN) * _ALIGN
+        header = json.dumps({'arrays': entries, 'meta': meta or {}}).encode()
+        needed = -(-(len(SNAPSHOT_MAGIC) + 8 + len(header)) // _ALIGN) * _ALIGN
+        if needed == data_start:
+            break
+        data_start = needed
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for entry in entries:
+            f.write(b'\0' * (entry['offset'] - f.tell()))
+            f.write(arrays[entry['name']].tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path, mmap=True):
+    """
+    Read a snapshot written by write_snapshot.
+
+    Args:
+        path (str): Snapshot file
+        mmap (bool): Memory-map the arrays copy-on-write (pages are read
+                     lazily; writes never reach the file) instead of loading
+
+    Returns:
+        tuple: ({name: np.ndarray}, meta dict)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a state snapshot")
+        (header_length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_length))
+
+        arrays = {}
+        for entry in header['arrays']:
+            dtype = _from_descr(entry['descr'])
+            shape = tuple(entry['shape'])
+            if entry['nbytes'] == 0:
+                arrays[entry['name']] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[entry['name']] = np.memmap(path, dtype=dtype, mode='c', offset=entry['offset'], shape=shape)
+            else:
+                f.seek(entry['offset'])
+                arrays[entry['name']] = np.frombuffer(f.read(entry['nbytes']), dtype=dtype).reshape(shape).copy()
+    return arrays, header['meta']
+
+
+class EventJournal:
+    """
+    Append-only binary log of events applied since the last snapshot.
+
+    MarketEvents are stored as fixed-size records (wall-clock timestamp ns,
+    UTC offset, price, volume) plus the UTF-8 symbol; any other event is
+    pickled. A tz-aware timestamp comes back from replay with the same wall
+    clock and offset (as a fixed-offset zone), so bars keyed on local time
+    land where they did live. The file
+    header carries a generation number matching the snapshot the journal
+    continues from, so a journal left over from before the latest snapshot
+    is never replayed twice.
+    """
+
+    def __init__(self, path, generation=0, buffer_size=1 << 16):
+        """
+        Open (or create) a journal.
+        Args:
+            path (str): Journal file
+            generation (int): Generation of a new journal file
+            buffer_size (int): Write buffer size in bytes
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.generation = generation
+        self._file = None
+        self.events_written = 0
+        if os.path.exists(path):
+            self.generation = self.read_generation(path)
+            self._file = open(path, 'ab', buffering=buffer_size)
+        else:
+            self.reset(generation)
+
+    @staticmethod
+    def read_generation(path):
+        """Generation number in a journal header (-1 if missing or invalid)."""
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+                    return -1
+                return struct.unpack('<q', f.read(8))[0]
+        except (OSError, struct.error):
+            return -1
+
+    def reset(self, generation):
+        """Start an empty journal with a new generation number."""
+        if self._file is not None:
+            self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(JOURNAL_MAGIC)
+            f.write(struct.pack('<q', generation))
+        os.replace(tmp_path, self.path)
+        self.generation = generation
+        self.events_written = 0
+        self._file = open(self.path, 'ab', buffering=self.buffer_size)
+
+    def append(self, event):
+        """
+        Append one event.
+
+        Args:
+            event: MarketEvent (compact record) or any picklable event
+        """
+        if type(event).__name__ == 'MarketEvent':
+            symbol = str(event.instrument_token).encode()
+            timestamp = event.timestamp
+            offset = _NAIVE
+            if getattr(timestamp, 'tzinfo', None) is not None:
+                offset = int(timestamp.utcoffset().total_seconds())
+                timestamp = timestamp.replace(tzinfo=None)
+            timestamp = np.datetime64(timestamp, 'ns').astype(np.int64)
+            self._file.write(_MARKET_RECORD.pack(_KIND_MARKET, int(timestamp), offset, float(event.ltp),
+                                                 float(getattr(event, 'volume', 0) or 0), len(symbol)))
+            self._file.write(symbol)
+        else:
+            payload = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+            self._file.write(_OBJECT_RECORD.pack(_KIND_OBJECT, len(payload)))
+            self._file.write(payload)
+        self.events_written += 1
+
+    def flush(self, fsync=False):
+        """Flush buffered records (optionally to disk)."""
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def replay(path, event_factory=None):
+        """
+        Iterate the events in a journal. A truncated last record (crash
+        mid-write) is ignored.
+
+        Args:
+            path (str): Journal file
+            event_factory (callable, optional): f(symbol, price, timestamp, volume)
+                                                building MarketEvents (default:
+                                                engine.event_engine.MarketEvent)
+
+        Yields:
+            Events in write order
+        """
+        if event_factory is None:
+            from engine.event_engine import MarketEvent
+            event_factory = MarketEvent
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        pos = len(JOURNAL_MAGIC) + 8
+        end = len(data)
+        while pos < end:
+            kind = data[pos]
+            if kind == _KIND_MARKET:
+                if pos + _MARKET_RECORD.size > end:
+                    return
+                _, timestamp, offset, price, volume, length = _MARKET_RECORD.unpack_from(data, pos)
+                pos += _MARKET_RECORD.size
+                if pos + length > end:
+                    return
+                symbol = data[pos:pos + length].decode()
+                pos += length
+                ts = np.datetime64(timestamp, 'ns').astype('datetime64[us]').item()
+                if offset != _NAIVE:
+                    ts = ts.replace(tzinfo=_zone(offset))
+                yield event_factory(symbol, price, ts, volume)
+            elif kind == _KIND_OBJECT:
+                if pos + _OBJECT_RECORD.size > end:
+                    return
+                _, length = _OBJECT_RECORD.unpack_from(data, pos)
+                pos += _OBJECT_RECORD.size
+                if pos + length > end:
+                    return
+                yield pickle.loads(data[pos:pos + length])
+                pos += length
+            else:
+                raise ValueError(f"Corrupt journal record at byte {pos} of {path}")
+
+
+_ZONES = {}
+
+
+def _zone(offset):
+    """Fixed-offset timezone for a UTC offset in seconds (cached)."""
+    zone = _ZONES.get(offset)
+    if zone is None:
+        zone = _ZONES[offset] = timezone(timedelta(seconds=offset))
+    return zone
+
+
+class _DiscardingEngine:
+    """Stand-in engine that drops events (used while replaying)."""
+
+    async def put(self, event):
+        pass
+
+    def register(self, *args, **kwargs):
+        pass
+
+
+class StateCheckpointer:
+    """
+    Periodic snapshots plus an event journal for one streaming strategy.
+
+    The strategy provides snapshot_state() -> (arrays, meta) and
+    restore_state(arrays, meta). Register record() as a batch handler after
+    the strategy's own handlers: it receives each dispatched run once the
+    strategy has applied all of it, journals the run and flushes the
+    journal, and once `snapshot_every` events are journaled it snapshots the
+    state and restarts the journal. Snapshots are only taken between runs,
+    so a snapshot never includes an event that the new journal also holds.
+    On restart, restore() loads the snapshot (memory-mapped) and replays the
+    short journal.
+
+    Files in `directory`: <name>.snap and <name>.journal
+
+    Example:
+        checkpointer = StateCheckpointer(strategy, 'state/', snapshot_every=100000)
+        await checkpointer.restore()
+        engine.register(MarketEvent, checkpointer.record, batch=True)
+        engine.register(FillEvent, checkpointer.record, batch=True)
+    """
+
+    def __init__(self, strategy, directory, name=None, snapshot_every=100000, fsync=False):
+        """
+        Initialize the checkpointer.
+        Args:
+            strategy: Streaming strategy with snapshot_state/restore_state.
+            directory (str): Directory for the snapshot and journal files.
+            name (str, optional): File stem (default: strategy_name or class name).
+            snapshot_every (int): Journaled events between snapshots (0 = manual).
+            fsync (bool): fsync the journal after every run (survives power
+                          loss, not just a killed process).
+        """
+        self.strategy = strategy
+        self.directory = directory
+        self.name = name or getattr(strategy, 'strategy_name', type(strategy).__name__)
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, f"{self.name}.snap")
+        self.journal_path = os.path.join(directory, f"{self.name}.journal")
+        self.generation = 0
+        self.journal = None
+
+    def _open_journal(self):
+        if self.journal is None:
+            self.journal = EventJournal(self.journal_path, self.generation)
+            if self.journal.generation != self.generation:
+                self.journal.reset(self.generation)
+
+    def record(self, events):
+        """
+        Journal events the strategy has just applied; snapshot when due.
+
+        Args:
+            events (list or event): Run of events (batch handler) or one event
+        """
+        self._open_journal()
+        if isinstance(events, list):
+            for event in events:
+                self.journal.append(event)
+        else:
+            self.journal.append(events)
+        if self.snapshot_every and self.journal.events_written >= self.snapshot_every:
+            self.snapshot()
+        else:
+            self.journal.flush(fsync=self.fsync)
+
+    def snapshot(self):
+        """Write a snapshot of the current state and start a new journal."""
+        arrays, meta = self.strategy.snapshot_state()
+        generation = self.generation + 1
+        write_snapshot(self.snapshot_path, arrays, {'generation': generation, 'state': meta})
+        self.generation = generation
+        if self.journal is None:
+            self.journal = EventJournal(self.journal_path, generation)
+        self.journal.reset(generation)
+
+    async def restore(self, emit=False, mmap=True):
+        """
+        Load the latest snapshot and replay the journal written after it.
+
+        Args:
+            emit (bool): Let the strategy publish signals while replaying
+                         (default: replayed events only rebuild state)
+            mmap (bool): Memory-map the snapshot arrays
+
+        Returns:
+            int: Number of journal events replayed
+        """
+        if os.path.exists(self.snapshot_path):
+            arrays, meta = read_snapshot(self.snapshot_path, mmap=mmap)
+            self.strategy.restore_state(arrays, meta['state'])
+            self.generation = int(meta['generation'])
+
+        replayed = 0
+        if os.path.exists(self.journal_path) and EventJournal.read_generation(self.journal_path) == self.generation:
+            engine = self.strategy.event_engine
+            if not emit:
+                self.strategy.event_engine = _DiscardingEngine()
+            try:
+                for event in EventJournal.replay(self.journal_path):
+                    if type(event).__name__ == 'MarketEvent':
+                        await self.strategy.handle_market_event(event)
+                    elif type(event).__name__ == 'FillEvent':
+                        await self.strategy.handle_fill_event(event)
+                    replayed += 1
+            finally:
+                self.strategy.event_engine = engine
+
+        # Keep appending to the journal that was just replayed
+        self.journal = EventJournal(self.journal_path, self.generation)
+        if self.journal.generation != self.generation:
+            self.journal.reset(self.generation)
+        self.journal.events_written = replayed
+        return replayed
+
+    def close(self):
+        """Flush and close the journal."""
+        if self.journal is not None:
+            self.journal.flush(fsync=True)
+            self.journal.close()
+            self.journal = None
@@ -0,0 +1,46 @@
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.event_engine import EventEngine, FillEvent, MarketEvent
+
+
+class BaseStrategy:
+    """
+    Base class for event-driven (streaming) strategies.
+
+    Subclasses override handle_market_event and handle_fill_event. Both are
+    registered on the engine when the strategy is created; fills carrying a
+    different strategy_id are ignored.
+    """
+
+    def __init__(self, event_engine: EventEngine, logger: logging.Logger, executor_account_name: str):
+        """
+        Initialize the strategy and subscribe it to the engine.
+        Args:
+            event_engine (EventEngine): Engine delivering events and receiving signals.
+            logger (logging.Logger): Strategy logger.
+            executor_account_name (str): Account orders are routed to.
+        """
+        self.event_engine = event_engine
+        self.logger = logger
+        self.executor_account_name = executor_account_name
+        self.strategy_name = type(self).__name__
+
+        if hasattr(event_engine, 'register'):
+            event_engine.register(MarketEvent, self.handle_market_event)
+            event_engine.register(FillEvent, self._on_fill)
+
+    async def _on_fill(self, event: FillEvent):
+        """Forward fills for this strategy (or untagged fills) to handle_fill_event."""
+        if event.strategy_id is None or event.strategy_id == self.strategy_name:
+            await self.handle_fill_event(event)
+
+    async def handle_market_event(self, event: MarketEvent):
+        """Handle one tick."""
+        raise NotImplementedError
+
+    async def handle_fill_event(self, event: FillEvent):
+        """Handle an execution report."""
+        pass
@@ -0,0 +1,271 @@
+import pandas as pd
+import numpy as np
+
+
+class SymbolDateIndex:
+    """
+    (symbol, date) -> row index lookup for long-format data.
+
+    Built once per dataset so multi-symbol strategies don't scan masks like
+    (data['symbol'] == s) & (data['date'].dt.date == d) on every call.
+    Symbols are stored as dense categorical codes, dates as int64 day
+    ordinals (days since 1970-01-01), and rows are grouped by symbol and by
+    day in CSR-style offset tables, so all rows of a symbol or of a date are
+    a single slice.
+    """
+
+    def __init__(self, data, symbol_col='symbol', date_col='date'):
+        """
+        Build the index.
+        Args:
+            data (pd.DataFrame): Long-format data with symbol and date columns.
+            symbol_col (str): Name of the symbol column.
+            date_col (str): Name of the date column.
+        """
+        symbols = data[symbol_col]
+        if isinstance(symbols.dtype, pd.CategoricalDtype):
+            self.symbol_codes = symbols.cat.codes.values.astype(np.int64)
+            self.symbols = pd.Index(symbols.cat.categories)
+        else:
+            codes, uniques = pd.factorize(symbols)
+            self.symbol_codes = codes.astype(np.int64)
+            self.symbols = pd.Index(uniques)
+        self._symbol_lookup = {symbol: code for code, symbol in enumerate(self.symbols)}
+
+        # Int64 day ordinals avoid building Python date objects per row
+        row_ordinals = _day_ordinals(data[date_col])
+        day_codes, day_ordinals = pd.factorize(row_ordinals, sort=True)
+        self.day_codes = day_codes.astype(np.int64)
+        self.day_ordinals = np.asarray(day_ordinals, dtype=np.int64)
+        self.days = self.day_ordinals.astype('datetime64[D]').astype('datetime64[ns]')
+
+        # Dense ordinal -> day code table for O(1) date lookups
+        self._first_ordinal = int(self.day_ordinals[0]) if len(self.day_ordinals) else 0
+        span = int(self.day_ordinals[-1]) - self._first_ordinal + 1 if len(self.day_ordinals) else 0
+        self._day_lookup = np.full(span, -1, dtype=np.int64)
+        self._day_lookup[self.day_ordinals - self._first_ordinal] = np.arange(len(self.day_ordinals))
+
+        self.symbol_col = symbol_col
+        self.date_col = date_col
+        self.n_rows = len(data)
+        self._by_symbol = None
+        self._by_day = None
+
+    @property
+    def n_symbols(self):
+        """Number of distinct symbols."""
+        return len(self.symbols)
+
+    @property
+    def n_days(self):
+        """Number of distinct days."""
+        return len(self.day_ordinals)
+
+    def symbol_code(self, symbol):
+        """
+        Dense code of a symbol.
+
+        Args:
+            symbol (str): Instrument symbol
+
+        Returns:
+            int: Symbol code, or -1 if the symbol is not in the data
+        """
+        return self._symbol_lookup.get(symbol, -1)
+
+    def day_code(self, date):
+        """
+        Dense code of a date.
+
+        Args:
+            date (datetime-like): Date (time of day is ignored)
+
+        Returns:
+            int: Day code, or -1 if the date is not in the data
+        """
+        ordinal = int(np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64)) - self._first_ordinal
+        if ordinal < 0 or ordinal >= len(self._day_lookup):
+            return -1
+        return int(self._day_lookup[ordinal])
+
+    def pair_keys(self):
+        """
+        Combined (day, symbol) key for every row.
+
+        Returns:
+            np.ndarray: day_code * n_symbols + symbol_code
+        """
+        return self.day_codes * self.n_symbols + self.symbol_codes
+
+    def _build_csr(self, group_codes, n_groups, sort_codes):
+        """Row order grouped by group_codes (ordered by sort_codes within a group) plus offsets."""
+        order = np.lexsort((sort_codes, group_codes))
+        offsets = np.zeros(n_groups + 1, dtype=np.int64)
+        np.cumsum(np.bincount(group_codes, minlength=n_groups), out=offsets[1:])
+        return order, offsets
+
+    @property
+    def by_symbol(self):
+        """Row order grouped by symbol (date-ordered within a symbol) and symbol offsets."""
+        if self._by_symbol is None:
+            self._by_symbol = self._build_csr(self.symbol_codes, self.n_symbols, self.day_codes)
+        return self._by_symbol
+
+    @property
+    def by_day(self):
+        """Row order grouped by day (symbol-ordered within a day) and day offsets."""
+        if self._by_day is None:
+            self._by_day = self._build_csr(self.day_codes, self.n_days, self.symbol_codes)
+        return self._by_day
+
+    def rows_for_symbol(self, symbol):
+        """
+        All rows of a symbol in date order.
+
+        Args:
+            symbol (str): Instrument symbol
+
+        Returns:
+            np.ndarray: Row positions (empty if the symbol is unknown)
+        """
+        code = self.symbol_code(symbol)
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        order, offsets = self.by_symbol
+        return order[offsets[code]:offsets[code + 1]]
+
+    def rows_for_date(self, date):
+        """
+        All rows of a date in symbol-code order.
+
+        Args:
+            date (datetime-like): Date
+
+        Returns:
+            np.ndarray: Row positions (empty if the date is unknown)
+        """
+        code = self.day_code(date)
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        order, offsets = self.by_day
+        return order[offsets[code]:offsets[code + 1]]
+
+    def row(self, symbol, date):
+        """
+        Row of a (symbol, date) pair.
+
+        Args:
+            symbol (str): Instrument symbol
+            date (datetime-like): Date
+
+        Returns:
+            int: First matching row position, or -1 if absent
+        """
+        code = self.symbol_code(symbol)
+        day = self.day_code(date)
+        if code < 0 or day < 0:
+            return -1
+        order, offsets = self.by_symbol
+        rows = order[offsets[code]:offsets[code + 1]]
+        pos = np.searchsorted(self.day_codes[rows], day)
+        if pos < len(rows) and self.day_codes[rows[pos]] == day:
+            return int(rows[pos])
+        return -1
+
+    def to_wide(self, values, fill_value=np.nan):
+        """
+        Pivot a per-row column into a days x symbols matrix.
+
+        Args:
+            values (array-like): One value per row (e.g. data['close'])
+            fill_value (float): Value for missing (day, symbol) pairs
+
+        Returns:
+            np.ndarray: Matrix of shape (n_days, n_symbols); the last row
+                        wins for duplicate pairs
+        """
+        values = np.asarray(values)
+        wide = np.full((self.n_days, self.n_symbols), fill_value,
+                       dtype=np.result_type(values.dtype, np.asarray(fill_value).dtype))
+        wide[self.day_codes, self.symbol_codes] = values
+        return wide
+
+    def broadcast_pairs(self, day_codes, symbol_codes, values, default=0):
+        """
+        Spread values given per (day, symbol) pair onto every matching row.
+
+        Args:
+            day_codes (array-like): Day codes of the pairs
+            symbol_codes (array-like): Symbol codes of the pairs
+            values (array-like): Value for each pair (the last one wins for
+                                 repeated pairs)
+            default (int or float): Value for rows without a pair
+
+        Returns:
+            np.ndarray: One value per row
+        """
+        values = np.asarray(values)
+        result = np.full(self.n_rows, default, dtype=np.result_type(values.dtype, np.asarray(default).dtype))
+        if len(values) == 0:
+            return result
+
+        keys = np.asarray(day_codes, dtype=np.int64) * self.n_symbols + np.asarray(symbol_codes, dtype=np.int64)
+        order = np.argsort(keys, kind='stable')
+        keys, values = keys[order], values[order]
+
+        # Keep the last value for repeated pairs
+        last = np.append(keys[1:] != keys[:-1], True)
+        keys, values = keys[last], values[last]
+
+        row_keys = self.pair_keys()
+        pos = np.minimum(np.searchsorted(keys, row_keys), len(keys) - 1)
+        matched = keys[pos] == row_keys
+        result[matched] = values[pos[matched]]
+        return result
+
+    def matches(self, data):
+        """
+        Check whether this index describes a frame row for row.
+
+        Compares every row's symbol and day with the ones the index was
+        built from, so a frame that was re-sorted or filtered after the
+        index was built does not match.
+
+        Args:
+            data (pd.DataFrame): Candidate frame
+
+        Returns:
+            bool: True if data has the same (symbol, day) in every row
+        """
+        if data is None or len(data) != self.n_rows:
+            return False
+        if self.symbol_col not in data.columns or self.date_col not in data.columns:
+            return False
+        codes = self.symbols.get_indexer(data[self.symbol_col])
+        if not np.array_equal(codes, self.symbol_codes):
+            return False
+        return np.array_equal(_day_ordinals(data[self.date_col]), self.day_ordinals[self.day_codes])
+
+
+def _day_ordinals(dates):
+    """Int64 day ordinals (days since 1970-01-01) of a date column."""
+    return pd.DatetimeIndex(dates).values.astype('datetime64[D]').astype(np.int64)
+
+
+def get_symbol_date_index(data, context=None):
+    """
+    Reuse context['row_index'] when it matches data row for row, otherwise
+    build a new index.
+
+    Args:
+        data (pd.DataFrame): Long-format data
+        context (dict, optional): May hold a prebuilt SymbolDateIndex
+
+    Returns:
+        SymbolDateIndex: Index for data
+    """
+    if context is not None:
+        index = context.get('row_index')
+        if index is not None and index.matches(data):
+            return index
+    return SymbolDateIndex(data)
@@ -0,0 +1,317 @@
+import numpy as np
+
+
+class SymbolStateStore:
+    """
+    Compact per-symbol state for streaming strategies.
+
+    Symbols are mapped to dense integer ids and numeric state lives in one
+    preallocated NumPy structured array (one record per symbol) plus
+    fixed-length ring buffers for rolling windows, instead of nested dicts of
+    lists. Lookups are a dict hit plus an array index, memory is fixed per
+    symbol, and a batch of symbols can be read or updated with one fancy
+    index. Capacity doubles when it runs out.
+
+    Example:
+        store = SymbolStateStore(
+            fields={'prev_close': (np.float64, np.nan), 'position': (np.int8, 0)},
+            windows={'closes': (50, np.float64)}
+        )
+        ids = store.ids(['INFY', 'TCS'])
+        store.update(ids, prev_close=[1500.0, 3500.0])
+        store.push(ids, 'closes', [1500.0, 3500.0])
+    """
+
+    def __init__(self, fields, windows=None, capacity=256):
+        """
+        Allocate the store.
+        Args:
+            fields (dict): {name: (dtype, default)} scalar state per symbol.
+            windows (dict, optional): {name: (length, dtype)} ring buffers per
+                                      symbol; unfilled slots hold NaN/NaT/0.
+            capacity (int): Initial number of symbol slots.
+        """
+        self.symbols = []
+        self._ids = {}
+        self._defaults = {name: default for name, (_, default) in fields.items()}
+        self._dtype = np.dtype([(name, dtype) for name, (dtype, _) in fields.items()])
+        self._window_specs = dict(windows or {})
+
+        capacity = max(int(capacity), 1)
+        self.state = self._new_records(capacity)
+        self.windows = {name: self._new_window(capacity, length, dtype)
+                        for name, (length, dtype) in self._window_specs.items()}
+        self.window_counts = {name: np.zeros(capacity, dtype=np.int64) for name in self._window_specs}
+        self.window_heads = {name: np.zeros(capacity, dtype=np.int64) for name in self._window_specs}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._ids
+
+    @property
+    def capacity(self):
+        """Number of allocated symbol slots."""
+        return len(self.state)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the state arrays."""
+        total = self.state.nbytes
+        for name in self._window_specs:
+            total += self.windows[name].nbytes + self.window_counts[name].nbytes + self.window_heads[name].nbytes
+        return total
+
+    @staticmethod
+    def _empty_value(dtype):
+        """Fill value for unset window slots."""
+        dtype = np.dtype(dtype)
+        if dtype.kind == 'f':
+            return np.nan
+        if dtype.kind in 'mM':
+            return np.datetime64('NaT') if dtype.kind == 'M' else np.timedelta64('NaT')
+        return 0
+
+    def _new_records(self, capacity):
+        """Structured array of default records."""
+        records = np.zeros(capacity, dtype=self._dtype)
+        for name, default in self._defaults.items():
+            records[name] = default
+        return records
+
+    def _new_window(self, capacity, length, dtype):
+        """Ring-buffer block filled with empty values."""
+        return np.full((capacity, length), self._empty_value(dtype), dtype=dtype)
+
+    def _grow(self, size):
+        """Grow all arrays to hold at least size symbols."""
+        capacity = self.capacity
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+
+        records = self._new_records(new_capacity)
+        records[:capacity] = self.state
+        self.state = records
+
+        for name, (length, dtype) in self._window_specs.items():
+            window = self._new_window(new_capacity, length, dtype)
+            window[:capacity] = self.windows[name]
+            self.windows[name] = window
+            for table in (self.window_counts, self.window_heads):
+                grown = np.zeros(new_capacity, dtype=np.int64)
+                grown[:capacity] = table[name]
+                table[name] = grown
+
+    def symbol_id(self, symbol, create=True):
+        """
+        Dense id of a symbol.
+
+        Args:
+            symbol (str): Instrument symbol
+            create (bool): Register the symbol if it is new
+
+        Returns:
+            int: Symbol id, or -1 if unknown and create is False
+        """
+        sid = self._ids.get(symbol)
+        if sid is None:
+            if not create:
+                return -1
+            sid = len(self.symbols)
+            self._grow(sid + 1)
+            self._ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def ids(self, symbols, create=True):
+        """
+        Dense ids of a batch of symbols.
+
+        Args:
+            symbols (iterable): Instrument symbols
+            create (bool): Register new symbols
+
+        Returns:
+            np.ndarray: Symbol ids (-1 for unknown symbols when create is False)
+        """
+        symbols = list(symbols)
+        return np.fromiter((self.symbol_id(s, create) for s in symbols), dtype=np.int64, count=len(symbols))
+
+    def get(self, symbol, field):
+        """Scalar state of one symbol (the field default if the symbol is unknown)."""
+        sid = self._ids.get(symbol)
+        if sid is None:
+            return self._defaults[field]
+        return self.state[field][sid]
+
+    def set(self, symbol, field, value):
+        """Set scalar state of one symbol."""
+        sid = self.symbol_id(symbol)  # may grow (replace) self.state
+        self.state[field][sid] = value
+
+    def column(self, field):
+        """View of one field for all registered symbols (indexed by id)."""
+        return self.state[field][:len(self.symbols)]
+
+    def update(self, ids, **values):
+        """
+        Vectorized update of scalar fields.
+
+        Args:
+            ids (array-like): Symbol ids
+            **values: field=value (scalar or one value per id)
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        for field, value in values.items():
+            self.state[field][ids] = value
+
+    def push(self, ids, name, values):
+        """
+        Append one value per symbol to a ring buffer.
+
+        Args:
+            ids (array-like): Symbol ids (unique within the call)
+            name (str): Window name
+            values (array-like): One value per id
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        length = self._window_specs[name][0]
+        heads = self.window_heads[name]
+        counts = self.window_counts[name]
+
+        self.windows[name][ids, heads[ids]] = values
+        heads[ids] = (heads[ids] + 1) % length
+        counts[ids] = np.minimum(counts[ids] + 1, length)
+
+    def fill_window(self, ids, name, values, counts):
+        """
+        Overwrite ring buffers with their latest values in chronological order.
+
+        Args:
+            ids (array-like): Symbol ids
+            name (str): Window name
+            values (np.ndarray): ids x window length block, oldest first
+            counts (array-like): Number of valid leading values per id
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        length, dtype = self._window_specs[name]
+
+        block = np.asarray(values, dtype=dtype).copy()
+        block[np.arange(length)[None, :] >= counts[:, None]] = self._empty_value(dtype)
+        self.windows[name][ids] = block
+        self.window_counts[name][ids] = counts
+        self.window_heads[name][ids] = counts % length
+
+    def reset_window(self, ids, name):
+        """Clear ring buffers for a batch of symbols."""
+        ids = np.asarray(ids, dtype=np.int64)
+        length, dtype = self._window_specs[name]
+        self.windows[name][ids] = self._empty_value(dtype)
+        self.window_counts[name][ids] = 0
+        self.window_heads[name][ids] = 0
+
+    def window_count(self, ids, name):
+        """Number of filled slots per symbol."""
+        return self.window_counts[name][np.asarray(ids, dtype=np.int64)]
+
+    def window_values(self, symbol, name):
+        """
+        Filled ring-buffer values of one symbol, oldest first.
+
+        Args:
+            symbol (str): Instrument symbol
+            name (str): Window name
+
+        Returns:
+            np.ndarray: Up to window length values
+        """
+        sid = self._ids.get(symbol)
+        if sid is None:
+            return self.windows[name][:0, 0].copy()
+        length = self._window_specs[name][0]
+        count = self.window_counts[name][sid]
+        head = self.window_heads[name][sid]
+        ordered = np.roll(self.windows[name][sid], -head) if count == length else self.windows[name][sid, :count]
+        return ordered.copy()
+
+    def window_mean_std(self, ids, name, ddof=0):
+        """
+        Mean and standard deviation over each symbol's filled slots.
+
+        Args:
+            ids (array-like): Symbol ids
+            name (str): Window name (float dtype)
+            ddof (int): Delta degrees of freedom for the standard deviation
+
+        Returns:
+            tuple: (mean, std) arrays, NaN where a window is empty
+        """
+        block = self.windows[name][np.asarray(ids, dtype=np.int64)]
+        counts = np.sum(~np.isnan(block), axis=1)
+        safe = counts > 0
+        mean = np.full(len(block), np.nan)
+        std = np.full(len(block), np.nan)
+        if safe.any():
+            mean[safe] = np.nanmean(block[safe], axis=1)
+            dev = block[safe] - mean[safe, None]
+            denom = np.maximum(counts[safe] - ddof, 1)
+            std[safe] = np.sqrt(np.nansum(dev * dev, axis=1) / denom)
+        return mean, std
+
+    def to_arrays(self, prefix=''):
+        """
+        State of the registered symbols as plain arrays (for snapshots).
+
+        Args:
+            prefix (str): Prefix for the array names
+
+        Returns:
+            dict: {name: array}; symbol order is self.symbols
+        """
+        n = len(self.symbols)
+        arrays = {prefix + 'state': self.state[:n]}
+        for name in self._window_specs:
+            arrays[f'{prefix}window.{name}'] = self.windows[name][:n]
+            arrays[f'{prefix}window_count.{name}'] = self.window_counts[name][:n]
+            arrays[f'{prefix}window_head.{name}'] = self.window_heads[name][:n]
+        return arrays
+
+    def load_arrays(self, arrays, symbols, prefix=''):
+        """
+        Replace the store contents with arrays from to_arrays.
+
+        The arrays are copied into the store's own buffers, so memory-mapped
+        snapshot arrays can be passed directly.
+
+        Args:
+            arrays (dict): {name: array} as produced by to_arrays
+            symbols (list): Symbols in id order
+            prefix (str): Prefix used when the arrays were written
+        """
+        symbols = list(symbols)
+        n = len(symbols)
+        self.symbols = []
+        self._ids = {}
+        self.state = self._new_records(max(self.capacity, n, 1))
+        for name, (length, dtype) in self._window_specs.items():
+            self.windows[name] = self._new_window(self.capacity, length, dtype)
+            self.window_counts[name] = np.zeros(self.capacity, dtype=np.int64)
+            self.window_heads[name] = np.zeros(self.capacity, dtype=np.int64)
+
+        state = arrays[prefix + 'state']
+        for field in self._dtype.names:
+            if field in state.dtype.names:
+                self.state[field][:n] = state[field]
+        for name, (length, _) in self._window_specs.items():
+            window = arrays[f'{prefix}window.{name}']
+            if window.shape[1] != length:
+                raise ValueError(f"Window '{name}' has length {window.shape[1]} in the snapshot, expected {length}")
+            self.windows[name][:n] = window
+            self.window_counts[name][:n] = arrays[f'{prefix}window_count.{name}']
+            self.window_heads[name][:n] = arrays[f'{prefix}window_head.{name}']
+
+        self.symbols = symbols
+        self._ids = {symbol: sid for sid, symbol in enumerate(symbols)}
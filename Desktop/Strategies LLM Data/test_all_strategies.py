@@ -10,6 +10,7 @@ import os
 
 # Add parent directory to path to import strat2
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from scenario_cache import cached_scenario
 
 # Import all strategies
 from Statistical_Pairs_Mean_Reversion_Strategy.statistical_pairs_mean_reversion_strategy import StatisticalPairsMeanReversionStrategy
@@ -17,35 +18,28 @@ from Volatility_Contraction_Breakout_Strategy.volatility_contraction_breakout_st
 from Market_Breadth_Rotation_Strategy.market_breadth_rotation_strategy import MarketBreadthRotationStrategy
 from Liquidity_Aware_Momentum_Strategy.liquidity_aware_momentum_strategy import LiquidityAwareMomentumStrategy
 
-def create_test_data(n_periods=300):
-    """Create comprehensive test data for all strategies"""
-    np.random.seed(42)
+@cached_scenario
+def create_test_data(n_periods=300, seed=42):
+    """Create comprehensive test data for all strategies (cached on disk per parameters)"""
+    rng = np.random.default_rng(seed)
     
     # Generate price data with different market phases
     base_price = 100
     trend = np.linspace(0, 30, n_periods)  # Upward trend
-    noise = np.random.normal(0, 2, n_periods)
+    noise = rng.normal(0, 2, n_periods)
     prices = base_price + trend + noise
     
-    # Generate OHLCV data
-    data = []
-    for i, price in enumerate(prices):
-        high = price + abs(np.random.normal(0, 1))
-        low = price - abs(np.random.normal(0, 1))
-        open_price = prices[i-1] if i > 0 else price
-        close = price
-        volume = np.random.randint(1000, 10000)
-        
-        data.append({
-            'date': pd.Timestamp('2023-01-01') + pd.Timedelta(days=i),
-            'open': open_price,
-            'high': high,
-            'low': low,
-            'close': close,
-            'volume': volume
-        })
+    # Generate OHLCV data: open at the previous close, high/low around the close
+    open_prices = np.concatenate([prices[:1], prices[:-1]])
     
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2023-01-01') + pd.to_timedelta(np.arange(n_periods), unit='D'),
+        'open': open_prices,
+        'high': prices + np.abs(rng.normal(0, 1, n_periods)),
+        'low': prices - np.abs(rng.normal(0, 1, n_periods)),
+        'close': prices,
+        'volume': rng.integers(1000, 10000, n_periods)
+    })
 
 def test_strategy(strategy_class, strategy_name, data, params=None):
     """Test a single strategy"""
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared bar resampler
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bar_resampler import BarResampler, parse_interval
+
+
+def make_ticks(tz=None, n=400, seed=11):
+    """Irregular ticks over a few weeks, including overnight ones."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-01-05 09:15', tz=tz)
+    times = start + pd.to_timedelta(np.sort(rng.integers(0, 20 * 1440, n)), unit='min')
+    return pd.DataFrame({
+        'date': times,
+        'close': 100 + rng.normal(0, 1, n).cumsum(),
+        'volume': rng.integers(1, 100, n).astype(float)
+    })
+
+
+def stream(resampler, ticks, as_datetime64=False):
+    """Feed ticks one by one, returning the finished bars in order."""
+    bars = []
+    for row in ticks.itertuples(index=False):
+        timestamp = row.date.to_datetime64() if as_datetime64 else row.date.to_pydatetime()
+        bar = resampler.update('X', row.close, row.volume, timestamp)
+        if bar is not None:
+            bars.append(bar)
+    bars.extend(bar for _, bar in resampler.flush())
+    return bars
+
+
+def test_parse_interval():
+    assert parse_interval('1W') == ('W', 1)
+    assert parse_interval('15min') == ('min', 15)
+    assert parse_interval('2h') == ('min', 120)
+    assert parse_interval('D') == ('D', 1)
+    with pytest.raises(ValueError):
+        parse_interval('5s')
+    with pytest.raises(ValueError):
+        parse_interval('0W')
+
+
+def test_weekly_bars_from_daily_rows():
+    data = pd.DataFrame({
+        'date': pd.bdate_range('2024-01-01', periods=10),
+        'open': np.arange(10.0), 'high': np.arange(10.0) + 2, 'low': np.arange(10.0) - 1,
+        'close': np.arange(10.0) + 1, 'volume': np.ones(10)
+    })
+    bars = BarResampler('1W').resample(data)
+    assert list(bars['date']) == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-08')]
+    assert list(bars['open']) == [0.0, 5.0]
+    assert list(bars['high']) == [6.0, 11.0]
+    assert list(bars['low']) == [-1.0, 4.0]
+    assert list(bars['close']) == [5.0, 10.0]
+    assert list(bars['count']) == [5, 5]
+    assert list(bars['last_row']) == [4, 9]
+
+
+def test_tz_aware_codes_use_wall_clock():
+    monday_night = pd.Timestamp('2024-01-08 02:00', tz='Asia/Kolkata')
+    for interval in ('1W', '1D'):
+        resampler = BarResampler(interval)
+        naive = resampler.bar_code(monday_night.tz_localize(None).to_pydatetime())
+        assert resampler.bar_code(monday_night.to_pydatetime()) == naive
+        assert resampler.bar_codes(pd.DatetimeIndex([monday_night]))[0] == naive
+
+    resampler = BarResampler('15min', session_start='09:15', session_minutes=375)
+    morning = pd.Timestamp('2024-01-08 10:00', tz='Asia/Kolkata')
+    code = resampler.bar_code(morning.to_pydatetime())
+    assert resampler.bar_codes(pd.DatetimeIndex([morning]))[0] == code
+    assert resampler.bar_start(code) == np.datetime64('2024-01-08T10:00', 'ns')
+
+
+@pytest.mark.parametrize('interval,session', [('1W', {}), ('1D', {}),
+                                              ('15min', {'session_start': '09:15', 'session_minutes': 375})])
+@pytest.mark.parametrize('tz', [None, 'Asia/Kolkata'])
+def test_streaming_matches_batch(interval, session, tz):
+    ticks = make_ticks(tz)
+    batch = BarResampler(interval, **session).resample(ticks)
+    streamed = stream(BarResampler(interval, **session), ticks)
+
+    assert len(streamed) == len(batch)
+    np.testing.assert_array_equal(BarResampler(interval, **session).bar_start([bar['code'] for bar in streamed]),
+                                  batch['date'].values)
+    for column in ('open', 'high', 'low', 'close', 'volume', 'count'):
+        np.testing.assert_allclose([bar[column] for bar in streamed], batch[column].values)
+
+
+def test_streaming_accepts_datetime64():
+    ticks = make_ticks()
+    resampler = BarResampler('1D')
+    streamed = stream(resampler, ticks, as_datetime64=True)
+    assert [bar['code'] for bar in streamed] == list(np.unique(resampler.bar_codes(ticks['date'])))
+
+
+def test_streamed_bar_times_are_wall_clock():
+    resampler = BarResampler('1D')
+    resampler.update('X', 1.0, 1.0, pd.Timestamp('2024-01-08 09:15', tz='Asia/Kolkata').to_pydatetime())
+    resampler.update('X', 2.0, 1.0, pd.Timestamp('2024-01-08 15:30', tz='Asia/Kolkata').to_pydatetime())
+    bar = resampler.current_bar('X')
+    assert bar['start_time'] == np.datetime64('2024-01-08T09:15', 'ns')
+    assert bar['end_time'] == np.datetime64('2024-01-08T15:30', 'ns')
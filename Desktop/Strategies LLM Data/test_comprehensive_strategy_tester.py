@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for running the strategy grid on a process pool
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from comprehensive_strategy_tester import (MovingAverageCrossoverStrategy, StrategyTester, VolumeBreakoutStrategy,
+                                           attach_frames, share_frames)
+
+
+def test_shared_frames_round_trip():
+    frames = {
+        'prices': pd.DataFrame({'date': pd.date_range('2024-01-01', periods=5),
+                                'close': np.linspace(1, 2, 5), 'volume': np.arange(5)}),
+        'flags': pd.DataFrame({'flag': np.array([True, False, True])})
+    }
+    shm, spec = share_frames(frames)
+    try:
+        offsets = [offset for *_, offset, _ in spec]
+        assert all(offset % 64 == 0 for offset in offsets) and len(set(offsets)) == len(offsets)
+        attached = attach_frames(shm, spec)
+        for name, frame in frames.items():
+            pd.testing.assert_frame_equal(attached[name], frame)
+        del attached
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_parallel_grid_matches_serial_runs():
+    tester = StrategyTester()
+    scenarios = {'Uptrend Market': tester.generate_test_data(300, 100, 'uptrend', 0.02, seed=1),
+                 'Sideways Market': tester.generate_test_data(300, 100, 'sideways', 0.015, seed=2)}
+    strategies = [(MovingAverageCrossoverStrategy, 'MA'), (VolumeBreakoutStrategy, 'Volume')]
+
+    results, timings = tester.run_parallel(strategies, scenarios, max_workers=2)
+
+    assert [(t['strategy'], t['scenario']) for t in timings] == [
+        ('MA', 'Uptrend Market'), ('MA', 'Sideways Market'),
+        ('Volume', 'Uptrend Market'), ('Volume', 'Sideways Market')]
+    assert all(t['worker'] != os.getpid() for t in timings)
+    for strategy_class, name in strategies:
+        assert list(results[name]['scenarios']) == list(scenarios)
+        for scenario_name, data in scenarios.items():
+            parallel = dict(results[name]['scenarios'][scenario_name])
+            assert parallel.pop('seconds') >= 0
+            assert parallel == tester.run_scenario(strategy_class, data.copy())
+            assert parallel['status'] == 'PASSED'
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared indicator cache
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+for folder in ('Trend_Momentum_Filter_Strategy', 'Volatility_Contraction_Breakout_Strategy',
+               'Moving_Average_Crossover_Strategy', 'Liquidity_Aware_Momentum_Strategy'):
+    sys.path.append(os.path.join(BASE_DIR, folder))
+
+from comprehensive_strategy_tester import StrategyTester
+from indicator_cache import IndicatorCache, cached_indicator
+from liquidity_aware_momentum_strategy import LiquidityAwareMomentumStrategy
+from moving_average_crossover_strategy import MovingAverageCrossoverStrategy
+from trend_momentum_filter_strategy import TrendMomentumFilterStrategy
+from volatility_contraction_breakout_strategy import VolatilityContractionBreakoutStrategy
+
+STRATEGIES = [TrendMomentumFilterStrategy, VolatilityContractionBreakoutStrategy,
+              MovingAverageCrossoverStrategy, LiquidityAwareMomentumStrategy]
+
+
+def make_data(days=300):
+    return StrategyTester().generate_test_data(days=days, trend='sideways', seed=7)
+
+
+def test_strategies_sharing_a_cache_match_uncached_runs():
+    data = make_data()
+    cache = IndicatorCache(data)
+    for strategy_class in STRATEGIES:
+        cached = strategy_class().generate_signals(data, context={'indicator_cache': cache})
+        uncached = strategy_class().generate_signals(data)
+        pd.testing.assert_frame_equal(cached, uncached)
+    assert cache.misses == len(cache)
+
+
+def test_same_key_is_namespaced_by_strategy_class():
+    data = make_data(50)
+    cache = IndicatorCache(data)
+    context = {'indicator_cache': cache}
+    tmf, vcb = TrendMomentumFilterStrategy(), VolatilityContractionBreakoutStrategy()
+
+    key = ('bollinger', 'close', 20, 2.0)
+    assert cached_indicator(tmf, context, data, key, lambda: (1, 2, 3)) == (1, 2, 3)
+    assert cached_indicator(vcb, context, data, key, lambda: (1, 2, 3, 4)) == (1, 2, 3, 4)
+    assert cached_indicator(TrendMomentumFilterStrategy(), context, data, key, lambda: None) == (1, 2, 3)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_for_another_frame_is_ignored():
+    data = make_data(50)
+    cache = IndicatorCache(data.copy())
+    value = cached_indicator(TrendMomentumFilterStrategy(), {'indicator_cache': cache}, data,
+                             ('sma', 'close', 5), lambda: 'computed')
+    assert value == 'computed'
+    assert len(cache) == 0
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for OHLCVAccumulator
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ohlcv_accumulator import OHLCVAccumulator
+
+
+def test_running_bar():
+    bars = OHLCVAccumulator(capacity=1)
+    for hour, (price, volume) in enumerate([(10.0, 1.0), (12.0, 2.0), (9.0, 1.0), (11.0, 4.0)]):
+        bars.update('INFY', price, volume, datetime(2024, 1, 1, 9 + hour))
+
+    bar = bars.bar('INFY')
+    assert (bar['open'], bar['high'], bar['low'], bar['close'], bar['count']) == (10.0, 12.0, 9.0, 11.0, 4)
+    assert bar['volume'] == 8.0
+    assert bar['vwap'] == (10.0 + 24.0 + 9.0 + 44.0) / 8.0
+    assert bar['start_time'] == np.datetime64('2024-01-01T09:00', 'ns')
+    assert bar['end_time'] == np.datetime64('2024-01-01T12:00', 'ns')
+
+    bars.reset('INFY')
+    assert bars.bar('INFY') is None
+
+
+def test_column_cache_follows_replaced_state():
+    bars = OHLCVAccumulator(capacity=4)
+    bars.update('INFY', 10.0, 1.0, datetime(2024, 1, 1, 9))
+    arrays = bars.symbol_state.to_arrays()
+
+    # load_arrays replaces the state array without changing its capacity
+    restored = OHLCVAccumulator(capacity=4)
+    restored.update('TCS', 1.0, 1.0, datetime(2024, 1, 1, 9))
+    restored.symbol_state.load_arrays(arrays, ['INFY'])
+    restored.update('INFY', 12.0, 1.0, datetime(2024, 1, 1, 10))
+
+    bar = restored.bar('INFY')
+    assert (bar['open'], bar['high'], bar['count']) == (10.0, 12.0, 2)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the trade-level metrics engine
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from performance_metrics import compute_trade_metrics
+
+
+def test_open_trade_is_kept_out_of_trade_averages():
+    prices = [100.0, 110.0, 121.0, 100.0, 90.0, 99.0]
+    signals = [1, -1, 0, 1, 0, 0]   # closed +10% trade, then an open -1% trade
+
+    summary = compute_trade_metrics(signals, prices)['summary']
+
+    assert summary['num_trades'][0] == 2
+    assert summary['open_trades'][0] == 1
+    assert summary['win_rate'][0] == 1.0
+    np.testing.assert_allclose(summary['avg_trade_return'][0], 0.10)
+    assert summary['avg_trade_duration'][0] == 1.0
+
+
+def test_single_open_winner_reports_no_closed_trade_stats():
+    summary = compute_trade_metrics([1, 0, 0], [100.0, 105.0, 110.0])['summary']
+
+    assert (summary['num_trades'][0], summary['open_trades'][0]) == (1, 1)
+    assert summary['win_rate'][0] == 0.0
+    assert summary['avg_trade_return'][0] == 0.0
+    np.testing.assert_allclose(summary['total_return'][0], 0.10)
+
+
+def test_panel_matches_single_symbol_runs():
+    rng = np.random.default_rng(3)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (200, 3)), axis=0))
+    signals = rng.choice([-1, 0, 1], size=(200, 3), p=[0.05, 0.9, 0.05])
+
+    panel = compute_trade_metrics(signals, prices)['summary']
+    for column in range(3):
+        single = compute_trade_metrics(signals[:, column], prices[:, column])['summary']
+        for name, values in single.items():
+            np.testing.assert_allclose(panel[name][column], values[0], err_msg=name)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed rebalance calendar
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from rebalance_calendar import RebalanceCalendar
+
+
+def make_calendar():
+    """Business days from late Dec 2023 to mid Apr 2024 without February, a holiday Monday and a duplicate."""
+    days = pd.bdate_range('2023-12-27', '2024-04-12')
+    days = days[(days.month != 2) & (days != pd.Timestamp('2024-01-15'))]
+    sessions = list(days + pd.Timedelta(hours=15, minutes=30)) + [days[3]]
+    return RebalanceCalendar(sessions[::-1]), days
+
+
+def test_period_codes_at_week_and_month_boundaries():
+    code = RebalanceCalendar.period_code
+    assert code('1970-01-05', 'W') == 0
+    assert code(pd.Timestamp('2024-01-07'), 'W') + 1 == code(pd.Timestamp('2024-01-08'), 'W')
+    # ISO week 1 of 2025 starts on Monday 2024-12-30
+    assert code('2024-12-30', 'W') == code('2025-01-05', 'W')
+    assert code('2024-01-31') + 1 == code('2024-02-01') == 2024 * 12 + 1
+    assert code('2024-03-31', 'Q') + 1 == code('2024-04-01', 'Q')
+    assert code('2023-12-31', 'Y') == 2023
+    np.testing.assert_array_equal(code(pd.DatetimeIndex(['2024-01-31', '2024-02-01']), 'M'), [24288, 24289])
+    with pytest.raises(ValueError):
+        code('2024-01-01', 'D')
+
+
+def test_sessions_are_normalized_sorted_and_unique():
+    calendar, days = make_calendar()
+    assert calendar.n_sessions == len(days)
+    assert list(calendar.sessions) == list(days)
+
+
+def test_next_period_start_skips_gaps_and_stops_after_the_last_period():
+    calendar, days = make_calendar()
+    row = list(days).index(pd.Timestamp('2024-01-10'))
+
+    # No February sessions: one month on from January is the first March session
+    assert days[calendar.next_period_start(row, 1, 'M')] == pd.Timestamp('2024-03-01')
+    assert days[calendar.next_period_start(row, 2, 'M')] == pd.Timestamp('2024-03-01')
+    assert days[calendar.next_period_start(row, 3, 'M')] == pd.Timestamp('2024-04-01')
+    # The week after has its Monday off
+    assert days[calendar.next_period_start(row, 1, 'W')] == pd.Timestamp('2024-01-16')
+    assert days[calendar.next_period_start(0, 1, 'Y')] == pd.Timestamp('2024-01-01')
+
+    last = calendar.n_sessions - 1
+    assert calendar.next_period_start(last, 1, 'M') == calendar.n_sessions
+    assert calendar.next_period_start(last, 1, 'W') == calendar.n_sessions
+
+
+def test_first_row_in_period():
+    calendar, days = make_calendar()
+    code = RebalanceCalendar.period_code
+    assert calendar.first_row_in_period(code('2023-12-01')) == 0
+    assert calendar.first_row_in_period(code('2023-06-01')) == 0
+    assert days[calendar.first_row_in_period(code('2024-01-15', 'W'), 'W')] == pd.Timestamp('2024-01-16')
+    assert days[calendar.first_row_in_period(code('2024-02-01'))] == pd.Timestamp('2024-03-01')
+    assert calendar.first_row_in_period(code('2024-05-01')) == calendar.n_sessions
+
+
+def test_period_starts_and_ends():
+    calendar, days = make_calendar()
+    assert list(days[calendar.monthly()].strftime('%m-%d')) == ['12-27', '01-01', '03-01', '04-01']
+    assert list(days[calendar.period_ends('M')].strftime('%m-%d')) == ['12-29', '01-31', '03-29', '04-12']
+    # Every second month counts the missing February
+    assert list(days[calendar.monthly(2)].strftime('%m-%d')) == ['12-27', '04-01']
+    assert list(days[calendar.period_starts('M', 2, offset=1)].strftime('%m-%d')) == ['01-01', '03-01']
+    assert calendar.mask(calendar.quarterly()).sum() == 3
+    with pytest.raises(ValueError):
+        calendar.schedule('daily')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite results store
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from comprehensive_strategy_tester import MovingAverageCrossoverStrategy, StrategyTester, VolumeBreakoutStrategy
+from results_store import ResultsStore
+
+
+def make_results(sharpe, seconds):
+    """Two strategies x two scenarios; the second volume scenario failed."""
+    def passed(value):
+        return {'status': 'PASSED', 'params': {'period': 20, 'mode': 'daily'},
+                'metrics': {'sharpe_ratio': value, 'num_trades': 4}, 'total_signals': 9, 'data_points': 100,
+                'signal_breakdown': {'buy_signals': 4, 'sell_signals': 5, 'hold_signals': 91}, 'seconds': seconds}
+    return {
+        'MA': {'strategy_name': 'MA', 'test_date': '2024-05-01',
+               'scenarios': {'Up': passed(sharpe), 'Down': passed(sharpe - 1)}},
+        'Volume': {'strategy_name': 'Volume', 'test_date': '2024-05-01',
+                   'scenarios': {'Up': passed(sharpe / 2),
+                                 'Down': {'status': 'FAILED', 'error': 'boom', 'data_points': 100,
+                                          'seconds': 3 * seconds}}}
+    }
+
+
+def test_tester_results_round_trip():
+    tester = StrategyTester()
+    scenarios = {'Uptrend Market': tester.generate_test_data(300, 100, 'uptrend', 0.02, seed=1),
+                 'Sideways Market': tester.generate_test_data(300, 100, 'sideways', 0.015, seed=2)}
+    for strategy_class, name in [(MovingAverageCrossoverStrategy, 'MA'), (VolumeBreakoutStrategy, 'Volume')]:
+        tester.results[name] = tester.test_strategy(strategy_class, name, None, scenarios)
+    tester.results['Volume']['scenarios']['Broken'] = {'status': 'FAILED', 'error': 'boom', 'data_points': 0,
+                                                       'seconds': 0.1}
+
+    with ResultsStore(':memory:') as store:
+        run_id = store.record_run(tester.results, tester.test_date, wall_seconds=1.5)
+        assert store.run_results(run_id) == tester.results
+        assert store.run_results() == tester.results
+        with pytest.raises(KeyError):
+            store.run_results(run_id + 1)
+
+
+def test_queries_cover_the_latest_runs():
+    now = datetime.now()
+    with ResultsStore(':memory:') as store:
+        store.record_run(make_results(9.0, 50.0), '2024-04-01', started_at=now - timedelta(days=30))
+        for sharpe in (1.0, 2.0, 3.0):
+            store.record_run(make_results(sharpe, sharpe), '2024-05-01', workers=2)
+
+        assert list(store.runs(limit=2)['run_id']) == [4, 3]
+        assert list(store.runs()['passed']) == [3, 3, 3, 3]
+
+        by_strategy = store.metric_by_strategy('sharpe_ratio', last_runs=3)
+        assert list(by_strategy['strategy']) == ['MA', 'Volume']
+        assert list(by_strategy['runs']) == [3, 3]
+        assert list(by_strategy['mean']) == [1.5, 1.0]
+
+        history = store.metric_history('sharpe_ratio', last_runs=2, strategy='MA', scenario='Up')
+        assert list(history['run_id']) == [3, 4] and list(history['value']) == [2.0, 3.0]
+
+        slowest = store.slowest_strategies(days=7)
+        assert list(slowest['strategy']) == ['Volume', 'MA']
+        assert slowest['max_seconds'].iloc[0] == 9.0
+
+        assert len(store.parameter_sets()) == 2
+        assert list(store.parameter_sets('MA')['params']) == ['{"mode": "daily", "period": 20}']
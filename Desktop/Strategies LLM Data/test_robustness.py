@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the bootstrap robustness kernels
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from benchmark_strategies import make_bars
+from robustness import (RobustnessEngine, block_bootstrap_indices, resample_bars, top3_returns, top3_schedule,
+                        vcb_signals)
+from symbol_date_index import SymbolDateIndex
+from Top3_12Month_Momentum_Strategy.top3_momentum_strategy import Top3MomentumStrategy
+from Volatility_Contraction_Breakout_Strategy.volatility_contraction_breakout_strategy import \
+    VolatilityContractionBreakoutStrategy
+
+VCB_PARAMS = {**VolatilityContractionBreakoutStrategy().params, 'width_lookback': 60, 'width_percentile': 30,
+              'volume_multiplier': 1.2}
+TOP3_PARAMS = {'momentum_period': 6, 'holding_period': 3, 'top_n_stocks': 3, 'rebalance_frequency': 1}
+
+
+def test_vcb_kernel_matches_generate_signals():
+    data = make_bars(1500).drop(columns='symbol')
+    indices = block_bootstrap_indices(len(data) - 1, 6, 1000, 20, np.random.default_rng(1))
+    bars = resample_bars(data, indices)
+    signals = vcb_signals(bars, VCB_PARAMS)
+
+    assert (signals == 1).sum() > 30
+    for path in range(len(indices)):
+        frame = pd.DataFrame({column: values[path] for column, values in bars.items()})
+        expected = VolatilityContractionBreakoutStrategy(dict(VCB_PARAMS)).generate_signals(frame)['Signal']
+        np.testing.assert_array_equal(signals[path], expected.to_numpy())
+
+
+def test_top3_kernel_matches_generate_signals():
+    panel = make_bars(600 * 8, 8)
+    index = SymbolDateIndex(panel)
+    closes = index.to_wide(panel['close'].values)
+    indices = block_bootstrap_indices(len(closes) - 1, 3, len(closes), 20, np.random.default_rng(2))
+    paths = closes[0] * np.cumprod((closes[1:] / closes[:-1])[indices], axis=1)
+
+    rows, starts = top3_schedule(index.days, TOP3_PARAMS, index.n_symbols)
+    strategy_returns, trades = top3_returns(paths, rows, starts, TOP3_PARAMS['top_n_stocks'])
+
+    for path in range(len(paths)):
+        frame = pd.DataFrame({'symbol': np.repeat(index.symbols, index.n_days),
+                              'date': np.tile(index.days, index.n_symbols), 'close': paths[path].T.ravel()})
+        strategy = Top3MomentumStrategy(dict(TOP3_PARAMS))
+        data = strategy.preprocess_data(frame)
+        signals = strategy.generate_signals(data)['Signal'].to_numpy(dtype=np.float64)
+        data_index = SymbolDateIndex(data)
+        bought = data_index.to_wide(signals)[:, data_index.symbols.get_indexer(index.symbols)] == 1
+
+        # Equal-weight returns of the symbols bought at each rebalance, held to the next one
+        rebalances = np.flatnonzero(bought.any(axis=1))
+        np.testing.assert_array_equal(rebalances, rows)
+        bar_returns = np.zeros_like(paths[path])
+        bar_returns[1:] = paths[path][1:] / paths[path][:-1] - 1
+        expected = np.zeros(index.n_days)
+        for row, end in zip(rebalances, np.append(rebalances[1:], index.n_days - 1)):
+            expected[row + 1:end + 1] = bar_returns[row + 1:end + 1][:, bought[row]].mean(axis=1)
+        np.testing.assert_allclose(strategy_returns[path], expected, rtol=0, atol=1e-12)
+        assert trades[path] == len(strategy.trades)
+
+
+def test_results_do_not_depend_on_chunking():
+    data = make_bars(800).drop(columns='symbol')
+    kwargs = dict(params=VCB_PARAMS, n_paths=150, block_size=10, seed=3)
+    whole = RobustnessEngine(VolatilityContractionBreakoutStrategy, **kwargs).run(data)
+    chunked = RobustnessEngine(VolatilityContractionBreakoutStrategy, max_memory_mb=0.5, **kwargs).run(data)
+    assert chunked['chunks'] > whole['chunks'] == 1
+    for metric in ('sharpe_ratio', 'max_drawdown', 'total_return', 'num_trades'):
+        np.testing.assert_array_equal(chunked[metric], whole[metric])
+    assert whole['num_trades'].sum() > 0
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk scenario cache
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from scenario_cache import CACHE_DIR_ENV, cached_scenario
+
+
+@cached_scenario
+def make_frame(n=50, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'close': 100 + rng.normal(0, 1, n).cumsum(),
+        'volume': rng.integers(1, 1000, n)
+    })
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+def test_hit_and_miss_return_the_same_writable_frame(cache_dir):
+    miss = make_frame()
+    hit = make_frame()
+
+    pd.testing.assert_frame_equal(miss, hit)
+    pd.testing.assert_frame_equal(hit, make_frame.uncached())
+    assert len(os.listdir(cache_dir)) == 1
+
+    for frame in (miss, hit):
+        frame.loc[0, 'close'] = 1.0
+        frame['volume'] *= 2
+        assert frame.loc[0, 'close'] == 1.0
+
+    # Writes stay in the caller's frame, never in the cached file
+    pd.testing.assert_frame_equal(make_frame(), make_frame.uncached())
+
+
+def test_parameters_are_part_of_the_key(cache_dir):
+    assert not make_frame(seed=1).equals(make_frame(seed=2))
+    assert len(make_frame(n=10)) == 10
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_tester_generators_leave_global_rng_alone(cache_dir):
+    from comprehensive_strategy_tester import StrategyTester
+
+    tester = StrategyTester()
+    np.random.seed(123)
+    expected = np.random.random(3)
+    for _ in range(2):  # miss, then hit
+        np.random.seed(123)
+        tester.generate_test_data(100, 100, 'uptrend', 0.02)
+        tester.generate_pairs_data(100)
+        tester.generate_market_breadth_data(100)
+        np.testing.assert_array_equal(np.random.random(3), expected)
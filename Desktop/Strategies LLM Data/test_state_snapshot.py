@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for state snapshots, the event journal and StateCheckpointer
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from engine.event_engine import EventEngine, MarketEvent, make_market_events
+from state_snapshot import EventJournal, StateCheckpointer, read_snapshot, write_snapshot
+from Weekly_Bollinger_Breakout_Strategy.weekly_bollinger_strategy import WeeklyBollingerStrategy
+
+EVENTS = make_market_events(n_events=6000, n_symbols=5, span_days=900, seed=7)
+# Same wall-clock ticks in IST; some fall on Monday 00:00-05:30, which is still Sunday in UTC
+IST = ZoneInfo('Asia/Kolkata')
+IST_EVENTS = [MarketEvent(e.instrument_token, e.ltp, e.timestamp.replace(tzinfo=IST), e.volume) for e in EVENTS]
+EVENTS_BY_TZ = {None: EVENTS, 'Asia/Kolkata': IST_EVENTS}
+CUT = 4321            # not a multiple of the snapshot interval or the batch size
+SNAPSHOT_EVERY = 1000
+BATCH_SIZE = 64
+
+
+def make_strategy(engine):
+    return WeeklyBollingerStrategy(engine, logging.getLogger('test'), 'test',
+                                   bollinger_period=5, ma_period=10)
+
+
+async def stream(engine, events):
+    await engine.start()
+    for event in events:
+        await engine.put(event)
+    await engine.join()
+
+
+def run_until_killed(directory, batch_record, events):
+    """Child process: apply events[:CUT] with checkpointing, then die without closing."""
+    async def main():
+        engine = EventEngine(batch_size=BATCH_SIZE)
+        strategy = make_strategy(engine)
+        checkpointer = StateCheckpointer(strategy, directory, snapshot_every=SNAPSHOT_EVERY)
+        engine.register(MarketEvent, checkpointer.record, batch=batch_record)
+        await stream(engine, events[:CUT])
+    asyncio.run(main())
+    os._exit(0)
+
+
+def reference_state(events):
+    """State after an uninterrupted run over events."""
+    async def main():
+        engine = EventEngine(batch_size=BATCH_SIZE)
+        strategy = make_strategy(engine)
+        await stream(engine, events)
+        await engine.stop()
+        return strategy.snapshot_state()
+    return asyncio.run(main())
+
+
+def assert_same_state(state, expected):
+    arrays, meta = state
+    expected_arrays, expected_meta = expected
+    assert meta == expected_meta
+    assert arrays.keys() == expected_arrays.keys()
+    for name, array in expected_arrays.items():
+        np.testing.assert_array_equal(np.asarray(arrays[name]), array, err_msg=name)
+
+
+@pytest.mark.parametrize('tz', [None, 'Asia/Kolkata'])
+@pytest.mark.parametrize('batch_record', [True, False])
+def test_restore_after_kill_between_snapshots(tmp_path, batch_record, tz):
+    events = EVENTS_BY_TZ[tz]
+    process = multiprocessing.get_context('fork').Process(target=run_until_killed,
+                                                          args=(str(tmp_path), batch_record, events))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+    async def restore():
+        strategy = make_strategy(EventEngine())
+        checkpointer = StateCheckpointer(strategy, str(tmp_path), snapshot_every=SNAPSHOT_EVERY)
+        replayed = await checkpointer.restore(mmap=False)
+        checkpointer.close()
+        return strategy.snapshot_state(), replayed
+
+    state, replayed = asyncio.run(restore())
+    assert 0 < replayed < SNAPSHOT_EVERY + BATCH_SIZE
+    assert_same_state(state, reference_state(events[:CUT]))
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'state.snap')
+    arrays = {
+        'prices': np.arange(10, dtype=np.float64),
+        'records': np.zeros(3, dtype=[('open', 'f8'), ('count', 'i8'), ('start', 'M8[ns]')]),
+        'empty': np.zeros((0, 4), dtype=np.float32)
+    }
+    write_snapshot(path, arrays, {'generation': 3})
+
+    for mmap in (True, False):
+        loaded, meta = read_snapshot(path, mmap=mmap)
+        assert meta == {'generation': 3}
+        for name, array in arrays.items():
+            assert loaded[name].dtype == array.dtype
+            np.testing.assert_array_equal(loaded[name], array)
+
+
+def test_journal_ignores_torn_last_record(tmp_path):
+    path = str(tmp_path / 'events.journal')
+    journal = EventJournal(path, generation=2)
+    for event in EVENTS[:3]:
+        journal.append(event)
+    journal.close()
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 2)
+
+    replayed = list(EventJournal.replay(path))
+    assert EventJournal.read_generation(path) == 2
+    assert [(e.instrument_token, e.ltp, e.volume) for e in replayed] == \
+        [(e.instrument_token, e.ltp, e.volume) for e in EVENTS[:2]]
+
+
+def test_journal_keeps_wall_clock_and_offset(tmp_path):
+    path = str(tmp_path / 'events.journal')
+    journal = EventJournal(path)
+    events = [IST_EVENTS[0], EVENTS[0], MarketEvent('X', 1.0, np.datetime64('2024-01-08T02:00'), 5.0)]
+    for event in events:
+        journal.append(event)
+    journal.close()
+
+    aware, naive, from_datetime64 = EventJournal.replay(path)
+    assert aware.timestamp == IST_EVENTS[0].timestamp
+    assert aware.timestamp.replace(tzinfo=None) == EVENTS[0].timestamp
+    assert aware.timestamp.utcoffset() == IST_EVENTS[0].timestamp.utcoffset()
+    assert naive.timestamp == EVENTS[0].timestamp and naive.timestamp.tzinfo is None
+    assert np.datetime64(from_datetime64.timestamp, 'ns') == np.datetime64('2024-01-08T02:00', 'ns')
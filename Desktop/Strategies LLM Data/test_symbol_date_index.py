@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the (symbol, date) row index
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'Top3_12Month_Momentum_Strategy'))
+
+from symbol_date_index import SymbolDateIndex, get_symbol_date_index
+from top3_momentum_strategy import Top3MomentumStrategy
+
+
+def make_panel(n_symbols=6, n_days=700, seed=5):
+    """Long-format closes grouped by symbol (not by date)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=n_days)
+    frames = [pd.DataFrame({'symbol': f'S{i}', 'date': dates,
+                            'close': 100 * np.exp(rng.normal(0.0003 * i, 0.02, n_days).cumsum())})
+              for i in range(n_symbols)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_lookups():
+    data = make_panel(3, 5)
+    index = SymbolDateIndex(data)
+    assert list(index.symbols) == ['S0', 'S1', 'S2']
+    assert index.n_days == 5
+    assert index.row('S1', data['date'][2]) == 7
+    assert index.row('S9', data['date'][2]) == -1
+    assert list(index.rows_for_symbol('S2')) == [10, 11, 12, 13, 14]
+    assert list(index.rows_for_date(data['date'][4])) == [4, 9, 14]
+    np.testing.assert_array_equal(index.to_wide(data['close'].values)[:, 1], data['close'].values[5:10])
+
+
+def test_matches_only_the_same_rows():
+    data = make_panel(3, 20)
+    index = SymbolDateIndex(data)
+    assert index.matches(data.copy())
+
+    resorted = data.sort_values('date', kind='stable').reset_index(drop=True)
+    assert len(resorted) == index.n_rows
+    assert not index.matches(resorted)
+    assert get_symbol_date_index(resorted, {'row_index': index}) is not index
+
+    shifted = data.copy()
+    shifted['date'] = shifted['date'] + pd.Timedelta(days=1)
+    assert not index.matches(shifted)
+    assert get_symbol_date_index(data, {'row_index': index}) is index
+
+
+def test_index_of_raw_frame_is_not_reused_after_resorting():
+    raw = make_panel()
+    strategy = Top3MomentumStrategy()
+    data = strategy.preprocess_data(raw.copy())
+
+    expected = Top3MomentumStrategy().generate_signals(data)
+    reused = Top3MomentumStrategy().generate_signals(data, context={'row_index': SymbolDateIndex(raw)})
+    assert (expected['Signal'] != 0).any()
+    pd.testing.assert_frame_equal(reused, expected)
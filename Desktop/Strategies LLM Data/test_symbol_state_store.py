@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for SymbolStateStore
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from symbol_state_store import SymbolStateStore
+
+
+def make_store(capacity=2):
+    return SymbolStateStore(
+        fields={'prev_close': (np.float64, np.nan), 'position': (np.int8, 0)},
+        windows={'closes': (3, np.float64)},
+        capacity=capacity
+    )
+
+
+def test_set_new_symbol_that_grows_the_store():
+    store = make_store(capacity=2)
+    store.set('A', 'prev_close', 1.0)
+    store.set('B', 'prev_close', 2.0)
+    store.set('C', 'prev_close', 3.0)  # third symbol doubles the capacity
+
+    assert store.capacity == 4
+    assert [store.get(s, 'prev_close') for s in 'ABC'] == [1.0, 2.0, 3.0]
+    assert store.get('D', 'position') == 0
+
+
+def test_ring_buffer_keeps_latest_values_in_order():
+    store = make_store()
+    ids = store.ids(['A', 'B'])
+    for value in range(5):
+        store.push(ids, 'closes', [value, 10 + value])
+
+    np.testing.assert_array_equal(store.window_values('A', 'closes'), [2, 3, 4])
+    np.testing.assert_array_equal(store.window_count(ids, 'closes'), [3, 3])
+    mean, _ = store.window_mean_std(ids, 'closes')
+    np.testing.assert_allclose(mean, [3.0, 13.0])
+
+
+def test_arrays_round_trip():
+    store = make_store()
+    ids = store.ids(['A', 'B', 'C'])
+    store.update(ids, prev_close=[1.0, 2.0, 3.0])
+    store.push(ids, 'closes', [1.0, 2.0, 3.0])
+
+    restored = make_store()
+    restored.load_arrays(store.to_arrays(), store.symbols)
+
+    assert restored.symbols == ['A', 'B', 'C']
+    np.testing.assert_array_equal(restored.column('prev_close'), [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(restored.window_values('C', 'closes'), [3.0])
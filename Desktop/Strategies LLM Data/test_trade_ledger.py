@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar trade ledger
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from trade_ledger import EXIT_OPEN, EXIT_SIGNAL, EXIT_STOP_LOSS, TradeLedger
+
+
+def loop_trades(signals, codes, reasons):
+    """Bar-by-bar state machine per symbol: (symbol, entry_row, exit_row, reason, bars)."""
+    trades, open_trades, last_row, bars = [], {}, {}, {}
+    for row, (signal, code) in enumerate(zip(signals, codes)):
+        bars[code] = bars.get(code, -1) + 1
+        last_row[code] = (row, bars[code])
+        if signal == 1 and code not in open_trades:
+            open_trades[code] = (row, bars[code])
+        elif signal == -1 and code in open_trades:
+            entry, entry_bar = open_trades.pop(code)
+            trades.append((code, entry, row, reasons[row] or EXIT_SIGNAL, bars[code] - entry_bar))
+    for code, (entry, entry_bar) in open_trades.items():
+        trades.append((code, entry, last_row[code][0], EXIT_OPEN, last_row[code][1] - entry_bar))
+    return sorted(trades)
+
+
+def test_from_signals_matches_state_machine():
+    rng = np.random.default_rng(9)
+    n = 400
+    signals = rng.choice([1, 0, 0, 0, -1], n)
+    codes = rng.integers(0, 5, n)
+    reasons = np.where(rng.random(n) < 0.3, EXIT_STOP_LOSS, 0)
+    prices = rng.uniform(50, 150, n)
+
+    ledger = TradeLedger.from_signals(signals, prices, symbol_codes=codes, symbols=list('ABCDE'),
+                                      exit_reasons=reasons)
+    got = sorted(zip(ledger.symbol_id, ledger.entry_index, ledger.exit_index, ledger.exit_reason,
+                     ledger.holding_bars))
+    assert got == loop_trades(signals, codes, reasons)
+    np.testing.assert_array_equal(ledger.entry_price, prices[ledger.entry_index])
+    np.testing.assert_array_equal(ledger.is_open, ledger.exit_reason == EXIT_OPEN)
+    assert ledger.is_open.sum() <= 5 and (ledger.side == 1).all()
+
+
+def test_from_positions_handles_flips_and_open_trades():
+    positions = [0, 1, 1, -1, -1, 0, 0, 1, np.nan, -1, -1]
+    prices = np.arange(100.0, 111.0)
+    ledger = TradeLedger.from_positions(positions, prices, exit_reasons=[0] * 5 + [EXIT_STOP_LOSS] + [0] * 5)
+
+    assert list(ledger.side) == [1, -1, 1, -1]
+    assert list(ledger.entry_index) == [1, 3, 7, 9]
+    assert list(ledger.exit_index) == [3, 5, 8, 10]
+    assert list(ledger.exit_reason) == [EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_SIGNAL, EXIT_OPEN]
+    np.testing.assert_allclose(ledger.returns, [2 / 101, -2 / 103, 1 / 107, -1 / 109])
+
+
+def test_concatenate_remaps_symbols():
+    a = TradeLedger.from_signals([1, 0, -1, 1], [1.0, 2.0, 3.0, 4.0], symbols=['INFY'])
+    b = TradeLedger.from_positions([0, 1, 0], [5.0, 6.0, 7.0], symbol='TCS')
+    c = TradeLedger.from_signals([1, -1], [8.0, 9.0], symbols=['INFY'])
+
+    frame = TradeLedger.concatenate([a, None, b, c]).to_frame()
+    assert list(frame['symbol']) == ['INFY', 'INFY', 'TCS', 'INFY']
+    assert list(frame['exit_reason_name']) == ['signal', 'open', 'signal', 'signal']
+    assert len(TradeLedger.concatenate([]).to_frame()) == 0
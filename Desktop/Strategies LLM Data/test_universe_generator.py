@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the chunked synthetic universe generator
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from universe_generator import generate_universe, load_chunk, load_universe, simulate_chunk, write_chunk
+
+PARAMS = {'n_symbols': 10, 'n_days': 60, 'n_sectors': 3, 'chunk_symbols': 4}
+
+
+def test_chunks_do_not_depend_on_generation_order(tmp_path):
+    serial, parallel = str(tmp_path / 'serial'), str(tmp_path / 'parallel')
+    manifest = generate_universe(serial, **PARAMS)
+    generate_universe(parallel, workers=2, **PARAMS)
+    assert [chunk['n_symbols'] for chunk in manifest['chunks']] == [4, 4, 2]
+
+    # Rewrite the chunks of one universe in reverse order
+    for chunk_index in (2, 1, 0):
+        write_chunk(parallel, chunk_index)
+    for chunk_index in range(3):
+        pd.testing.assert_frame_equal(load_chunk(parallel, chunk_index, mmap=False),
+                                      load_chunk(serial, chunk_index, mmap=False))
+
+
+def test_chunk_streams_are_independent(tmp_path):
+    path = str(tmp_path / 'universe')
+    generate_universe(path, **PARAMS)
+    bigger = str(tmp_path / 'bigger')
+    generate_universe(bigger, **{**PARAMS, 'n_symbols': 12})
+
+    # A chunk's draws come from its own SeedSequence child, not from the number of chunks
+    for chunk_index in (0, 1):
+        pd.testing.assert_frame_equal(load_chunk(bigger, chunk_index, mmap=False),
+                                      load_chunk(path, chunk_index, mmap=False), check_categorical=False)
+
+    # Residual returns of different chunks are not the same draws
+    frames = [load_chunk(path, i, ['close'], mmap=False) for i in range(2)]
+    residuals = [np.diff(np.log(frame['close'].to_numpy().reshape(4, -1)), axis=1) for frame in frames]
+    residuals = [r - r.mean(axis=0) for r in residuals]
+    correlation = np.corrcoef(residuals[0].ravel(), residuals[1].ravel())[0, 1]
+    assert abs(correlation) < 0.2
+
+
+def test_load_universe_reads_only_requested_symbols(tmp_path):
+    path = str(tmp_path / 'universe')
+    generate_universe(path, **PARAMS)
+    data = load_universe(path, symbols=['SYM00009', 'SYM00001'], columns=['close'])
+    assert list(data['symbol'].unique()) == ['SYM00001', 'SYM00009']
+    assert len(data) == 2 * PARAMS['n_days']
+    assert (data.groupby('symbol', observed=True)['symbol_id'].first() == [1, 9]).all()
+
+
+def test_simulated_bars_are_consistent():
+    dates = pd.bdate_range('2020-01-01', periods=50).values.astype('datetime64[ns]')
+    params = {**PARAMS, 'n_days': 50, 'seed': 3, 'market_vol': 0.01, 'sector_vol': 0.006, 'idio_vol_range': (0.01, 0.03),
+              'gap_probability': 0.05, 'gap_size': 0.05}
+    factors = {'vol_multiplier': np.ones(50), 'market': np.zeros(50), 'sectors': np.zeros((50, 3))}
+    chunk = simulate_chunk(params, factors, 1, dates)
+    assert list(np.unique(chunk['symbol_id'])) == [4, 5, 6, 7]
+    assert (chunk['high'] >= np.maximum(chunk['open'], chunk['close'])).all()
+    assert (chunk['low'] <= np.minimum(chunk['open'], chunk['close'])).all()
+    assert (chunk['volume'] > 0).all()
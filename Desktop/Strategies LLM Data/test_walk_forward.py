@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the walk-forward optimiser's successive-halving search
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from comprehensive_strategy_tester import StrategyTester
+from walk_forward import WalkForwardOptimizer, lookback_warmup, successive_halving
+
+
+def fake_run_tasks(calls):
+    """run_tasks scoring each candidate by its index, recording the scored slices."""
+    def run_tasks(tasks):
+        results = []
+        for fold, start, end, score_from, candidates in tasks:
+            calls.extend((index, end - start - score_from) for index, _ in candidates)
+            results.append((fold, [(index, float(index), 1) for index, _ in candidates], 0, 0,
+                            (end - start) * len(candidates)))
+        return results
+    return run_tasks
+
+
+def test_warmup_uses_lookback_parameters_only():
+    params = {'atr_period': 14, 'vwap_period': 20, 'max_holding_period': 90,
+              'max_holding_days': 60, 'top_n_stocks': 300, 'lookback_window': 40, 'flag': True}
+    assert lookback_warmup(params) == 40
+    assert lookback_warmup({'max_holding_period': 30}) == 0
+
+
+def test_rungs_follow_the_candidate_count():
+    candidates = [{'period': 5} for _ in range(82)]
+    calls = []
+    search = successive_halving(fake_run_tasks(calls), candidates, list(range(1001)), 0, 668, eta=3)
+
+    assert [rung['candidates'] for rung in search['rungs']] == [82, 28, 10, 4]
+    assert [rung['length'] for rung in search['rungs']] == [24, 74, 222, 668]
+    assert search['best'] == 81
+    assert len(calls) == 82 + 28 + 10 + 4
+
+    calls.clear()
+    search = successive_halving(fake_run_tasks(calls), candidates, list(range(1001)), 0, 668, eta=3,
+                                min_length=100)
+    assert [rung['candidates'] for rung in search['rungs']] == [82, 28]
+
+
+class CrossoverStrategy:
+    """Small moving-average crossover with a schema, cheap enough to grid-search in a test."""
+
+    def __init__(self, params=None):
+        self.params = params or {'fast_period': 10, 'slow_period': 50, 'band': 0.0}
+
+    def parameter_schema(self):
+        return {
+            'fast_period': {'type': 'int', 'min': 5, 'max': 40, 'default': 10},
+            'slow_period': {'type': 'int', 'min': 30, 'max': 120, 'default': 50},
+            'band': {'type': 'float', 'min': 0.0, 'max': 0.02, 'default': 0.0}
+        }
+
+    def preprocess_data(self, data, context=None):
+        return data
+
+    def generate_signals(self, data, context=None):
+        close = data['close']
+        spread = close.rolling(self.params['fast_period']).mean() / close.rolling(self.params['slow_period']).mean() - 1
+        signal = np.where(spread > self.params['band'], 1, np.where(spread < -self.params['band'], -1, 0))
+        return pd.DataFrame({'Signal': signal}, index=data.index)
+
+
+def test_halving_over_a_sample_costs_a_fraction_of_the_grid():
+    data = StrategyTester().generate_test_data(days=2000, trend='sideways', seed=3)
+    kwargs = dict(n_folds=2, levels=8, workers=1)
+    grid = WalkForwardOptimizer(CrossoverStrategy, search='grid', **kwargs).run(data)
+    halving = WalkForwardOptimizer(CrossoverStrategy, search='halving', n_candidates=27, **kwargs).run(data)
+
+    assert grid['candidates'] == 8 * 8 * 8 + 1  # plus the defaults
+    assert grid['signal_calls'] == (grid['candidates'] + 1) * 2  # plus one test run per fold
+    rung_calls = sum(rung['candidates'] for fold in halving['folds'] for rung in fold['rungs'])
+    assert all(len(fold['rungs']) == 4 for fold in halving['folds'])
+    assert halving['signal_calls'] == rung_calls + 2
+    assert halving['signal_calls'] < 0.1 * grid['signal_calls']
+    assert halving['signal_bars'] < 0.05 * grid['signal_bars']
+    assert np.isfinite(halving['mean_test_score'])
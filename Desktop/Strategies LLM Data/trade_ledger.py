@@ -0,0 +1,239 @@
+import pandas as pd
+import numpy as np
+from performance_metrics import pair_events
+
+
+# Exit reason codes stored in TradeLedger.exit_reason
+EXIT_OPEN = 0           # still open at the end of the data
+EXIT_SIGNAL = 1         # strategy exit rule
+EXIT_STOP_LOSS = 2
+EXIT_TRAILING_STOP = 3
+EXIT_TIME = 4           # maximum holding period
+EXIT_TARGET = 5
+EXIT_REBALANCE = 6      # dropped from the selection at a rebalance
+
+EXIT_REASON_NAMES = ('open', 'signal', 'stop_loss', 'trailing_stop', 'time', 'target', 'rebalance')
+
+
+class TradeLedger:
+    """
+    Columnar list of trades.
+
+    One NumPy array per column, one element per trade:
+        symbol_id (int32): Index into `symbols`
+        side (int8): 1 long, -1 short
+        entry_index, exit_index (int64): Row positions in the data the
+                                         strategy ran on
+        entry_price, exit_price (float64): Prices at those rows
+        exit_reason (int8): EXIT_* code (EXIT_OPEN if still open)
+        holding_bars (int64): Bars of the symbol between entry and exit
+
+    Ledgers are built from whole signal arrays in one pass, concatenate
+    column by column, and to_arrays() gives plain buffers that pandas or
+    pyarrow (pa.table(ledger.to_arrays())) wrap without copying.
+
+    Example:
+        ledger = TradeLedger.from_signals(signals, data['close'], exit_reasons=reasons)
+        ledger.returns.mean()
+        TradeLedger.concatenate([ledger_a, ledger_b]).to_frame()
+    """
+
+    COLUMNS = {
+        'symbol_id': np.int32,
+        'side': np.int8,
+        'entry_index': np.int64,
+        'exit_index': np.int64,
+        'entry_price': np.float64,
+        'exit_price': np.float64,
+        'exit_reason': np.int8,
+        'holding_bars': np.int64
+    }
+
+    def __init__(self, columns=None, symbols=None):
+        """
+        Initialize the ledger.
+        Args:
+            columns (dict, optional): {column: array-like} for every column
+                                      in COLUMNS (default: empty ledger).
+            symbols (list, optional): Symbol of each symbol_id.
+        """
+        columns = columns or {}
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.asarray(columns.get(name, ()), dtype=dtype))
+        self.symbols = list(symbols) if symbols is not None else ['default']
+
+    def __len__(self):
+        return len(self.entry_index)
+
+    @classmethod
+    def from_signals(cls, signals, prices, symbol_codes=None, symbols=None, exit_reasons=None,
+                     default_reason=EXIT_SIGNAL):
+        """
+        Pair long entry (1) and exit (-1) signals into trades.
+
+        Args:
+            signals (array-like): Signal per row
+            prices (array-like): Price per row
+            symbol_codes (array-like, optional): Symbol code per row for
+                                                 long-format data; rows of a
+                                                 symbol are taken in data order
+            symbols (list, optional): Symbol of each code
+            exit_reasons (array-like, optional): EXIT_* code per row, read
+                                                 at each exit row (0 = use
+                                                 default_reason)
+            default_reason (int): Exit reason of signal exits without one
+
+        Returns:
+            TradeLedger: Trades ordered by symbol then entry
+        """
+        signals = np.nan_to_num(np.sign(np.asarray(signals, dtype=np.float64)))
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(signals)
+
+        if symbol_codes is None:
+            order = np.arange(n)
+            codes = np.zeros(n, dtype=np.int64)
+        else:
+            symbol_codes = np.asarray(symbol_codes, dtype=np.int64)
+            order = np.argsort(symbol_codes, kind='stable')
+            codes = symbol_codes[order]
+        n_groups = int(codes.max()) + 1 if n else 0
+
+        # Last sorted position of each symbol closes its open trade
+        group_last = np.full(n_groups, -1, dtype=np.int64)
+        group_last[codes] = np.arange(n)
+
+        events = np.flatnonzero(signals[order])
+        group, entry_pos, exit_pos, is_open = pair_events(codes[events], events, signals[order][events], group_last)
+
+        entry_index = order[entry_pos]
+        exit_index = order[exit_pos]
+        exit_reason = np.full(len(group), default_reason, dtype=np.int8)
+        if exit_reasons is not None:
+            reasons = np.asarray(exit_reasons, dtype=np.int8)[exit_index]
+            exit_reason = np.where(reasons > 0, reasons, exit_reason)
+        exit_reason[is_open] = EXIT_OPEN
+
+        if symbols is None:
+            symbols = ['default'] if symbol_codes is None else [str(code) for code in range(n_groups)]
+        return cls({
+            'symbol_id': group,
+            'side': np.ones(len(group)),
+            'entry_index': entry_index,
+            'exit_index': exit_index,
+            'entry_price': prices[entry_index],
+            'exit_price': prices[exit_index],
+            'exit_reason': exit_reason,
+            'holding_bars': exit_pos - entry_pos
+        }, symbols)
+
+    @classmethod
+    def from_positions(cls, positions, prices, exit_reasons=None, default_reason=EXIT_SIGNAL, symbol='default'):
+        """
+        Trades from a held-position path (long and short).
+
+        Every run of the same non-zero position is one trade, entered on the
+        run's first row and exited on the first row with a different position.
+
+        Args:
+            positions (array-like): Position held after each row (1, -1 or 0)
+            prices (array-like): Price per row
+            exit_reasons (array-like, optional): EXIT_* code per row, read
+                                                 at each exit row
+            default_reason (int): Exit reason of exits without one
+            symbol (str): Symbol of the trades
+
+        Returns:
+            TradeLedger: Trades in entry order
+        """
+        positions = np.sign(np.nan_to_num(np.asarray(positions, dtype=np.float64))).astype(np.int8)
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(positions)
+
+        change = np.flatnonzero(np.diff(positions, prepend=0) != 0)
+        entries = change[positions[change] != 0]
+        ends = np.searchsorted(change, entries, side='right')
+        is_open = ends >= len(change)
+        exit_index = np.append(change, n - 1)[ends]
+
+        exit_reason = np.full(len(entries), default_reason, dtype=np.int8)
+        if exit_reasons is not None:
+            reasons = np.asarray(exit_reasons, dtype=np.int8)[exit_index]
+            exit_reason = np.where(reasons > 0, reasons, exit_reason)
+        exit_reason[is_open] = EXIT_OPEN
+
+        return cls({
+            'symbol_id': np.zeros(len(entries)),
+            'side': positions[entries],
+            'entry_index': entries,
+            'exit_index': exit_index,
+            'entry_price': prices[entries],
+            'exit_price': prices[exit_index],
+            'exit_reason': exit_reason,
+            'holding_bars': exit_index - entries
+        }, [symbol])
+
+    @classmethod
+    def concatenate(cls, ledgers):
+        """
+        Combine ledgers (e.g. per symbol or per worker) into one.
+
+        Symbol ids are remapped onto the union of the ledgers' symbols.
+
+        Args:
+            ledgers (list): TradeLedgers
+
+        Returns:
+            TradeLedger: All trades, in ledger order
+        """
+        ledgers = [ledger for ledger in ledgers if ledger is not None]
+        symbols = []
+        lookup = {}
+        symbol_ids = []
+        for ledger in ledgers:
+            mapping = np.empty(len(ledger.symbols), dtype=np.int32)
+            for i, symbol in enumerate(ledger.symbols):
+                if symbol not in lookup:
+                    lookup[symbol] = len(symbols)
+                    symbols.append(symbol)
+                mapping[i] = lookup[symbol]
+            symbol_ids.append(mapping[ledger.symbol_id])
+
+        columns = {name: np.concatenate([getattr(ledger, name) for ledger in ledgers])
+                   if ledgers else () for name in cls.COLUMNS}
+        if ledgers:
+            columns['symbol_id'] = np.concatenate(symbol_ids)
+        return cls(columns, symbols or None)
+
+    @property
+    def is_open(self):
+        """Trades still open at the end of the data."""
+        return self.exit_reason == EXIT_OPEN
+
+    @property
+    def returns(self):
+        """Return of each trade, signed by side."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.side * (self.exit_price / self.entry_price - 1)
+
+    def to_arrays(self):
+        """
+        Columns as {name: np.ndarray}.
+
+        Returns:
+            dict: One contiguous array per column
+        """
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    def to_frame(self):
+        """
+        Ledger as a DataFrame with symbol and exit reason names.
+
+        Returns:
+            pd.DataFrame: One row per trade
+        """
+        frame = pd.DataFrame(self.to_arrays())
+        frame.insert(1, 'symbol', np.asarray(self.symbols, dtype=object)[self.symbol_id] if len(self) else [])
+        frame['exit_reason_name'] = np.asarray(EXIT_REASON_NAMES, dtype=object)[self.exit_reason] if len(self) else []
+        frame['return'] = self.returns
+        return frame
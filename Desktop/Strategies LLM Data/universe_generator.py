@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Large synthetic multi-asset universe for scale testing.
+
+Writes a correlated symbols x days OHLCV panel to disk chunk by chunk, so
+the full panel never has to fit in memory:
+
+    <path>/manifest.json            parameters, symbols, chunk list
+    <path>/factors.npz              shared market/sector factor paths
+    <path>/chunk_00000/<column>.npy one memory-mappable array per column
+
+Each chunk holds `chunk_symbols` symbols in long format (symbol-major, dates
+ascending). Returns are a regime-switching market factor, a sector factor
+and idiosyncratic noise; opens carry overnight gaps and occasional jumps,
+volume scales with the size of the move. The factors are generated once
+from the master seed; every chunk draws from its own SeedSequence child, so
+chunks are independent and can be generated in any order or in parallel
+with identical results.
+
+Usage:
+    python universe_generator.py data/universe --symbols 5000 --days 5000 --workers 0
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+
+
+COLUMNS = ('symbol_id', 'date', 'open', 'high', 'low', 'close', 'volume')
+
+# Market regimes: daily drift, volatility multiplier
+REGIMES = {
+    'bull': (0.0006, 0.8),
+    'normal': (0.0002, 1.0),
+    'bear': (-0.0008, 1.8)
+}
+# Regime transition probabilities (rows: from, columns: to)
+REGIME_TRANSITIONS = np.array([
+    [0.985, 0.012, 0.003],
+    [0.010, 0.980, 0.010],
+    [0.004, 0.026, 0.970]
+])
+
+
+def default_params():
+    """Generator parameters and their defaults."""
+    return {
+        'n_symbols': 5000,
+        'n_days': 5000,
+        'n_sectors': 10,
+        'chunk_symbols': 250,
+        'seed': 42,
+        'start_date': '2005-01-03',
+        'market_vol': 0.01,
+        'sector_vol': 0.006,
+        'idio_vol_range': (0.01, 0.03),
+        'gap_probability': 0.01,
+        'gap_size': 0.05
+    }
+
+
+def simulate_factors(params):
+    """
+    Regime path and market/sector factor returns shared by every chunk.
+
+    Args:
+        params (dict): Generator parameters
+
+    Returns:
+        dict: regime (int8 per day), vol_multiplier, market (log returns per
+              day) and sectors (days x n_sectors log returns)
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(params['seed']).spawn(1)[0])
+    n_days = params['n_days']
+    drift = np.array([r[0] for r in REGIMES.values()])
+    vol = np.array([r[1] for r in REGIMES.values()])
+
+    # Markov chain by inverse CDF on pre-drawn uniforms
+    cumulative = np.cumsum(REGIME_TRANSITIONS, axis=1)
+    uniforms = rng.random(n_days)
+    regime = np.empty(n_days, dtype=np.int8)
+    state = 1
+    for day in range(n_days):
+        state = int(np.searchsorted(cumulative[state], uniforms[day], side='right'))
+        state = min(state, len(REGIMES) - 1)
+        regime[day] = state
+
+    vol_multiplier = vol[regime]
+    market = drift[regime] + params['market_vol'] * vol_multiplier * rng.standard_normal(n_days)
+    sectors = params['sector_vol'] * vol_multiplier[:, None] * rng.standard_normal((n_days, params['n_sectors']))
+    return {'regime': regime, 'vol_multiplier': vol_multiplier, 'market': market, 'sectors': sectors}
+
+
+def simulate_chunk(params, factors, chunk_index, dates):
+    """
+    OHLCV rows of one chunk of symbols.
+
+    Args:
+        params (dict): Generator parameters
+        factors (dict): Output of simulate_factors
+        chunk_index (int): Chunk number
+        dates (np.ndarray): datetime64[ns] trading days
+
+    Returns:
+        dict: {column: np.ndarray} in long format, symbol-major
+    """
+    n_chunks = -(-params['n_symbols'] // params['chunk_symbols'])
+    seed_sequence = np.random.SeedSequence(params['seed']).spawn(n_chunks + 1)[chunk_index + 1]
+    rng = np.random.default_rng(seed_sequence)
+
+    first = chunk_index * params['chunk_symbols']
+    symbol_ids = np.arange(first, min(first + params['chunk_symbols'], params['n_symbols']))
+    n, n_days = len(symbol_ids), params['n_days']
+
+    # Per-symbol loadings
+    sector = symbol_ids % params['n_sectors']
+    market_beta = rng.uniform(0.6, 1.4, n)
+    sector_beta = rng.uniform(0.5, 1.5, n)
+    idio_vol = rng.uniform(*params['idio_vol_range'], n)
+    start_price = np.exp(rng.normal(np.log(100), 0.8, n))
+    base_volume = np.exp(rng.normal(np.log(500000), 1.0, n))
+
+    # Daily log returns (days x symbols), plus jumps that show up as gaps
+    vol_multiplier = factors['vol_multiplier'][:, None]
+    returns = (factors['market'][:, None] * market_beta +
+               factors['sectors'][:, sector] * sector_beta +
+               rng.standard_normal((n_days, n)) * idio_vol * vol_multiplier)
+    jumps = np.where(rng.random((n_days, n)) < params['gap_probability'],
+                     rng.normal(0, params['gap_size'], (n_days, n)), 0.0)
+    returns += jumps
+    returns[0] = 0.0
+
+    close = start_price * np.exp(np.cumsum(returns, axis=0))
+    prev_close = np.vstack([start_price[None, :], close[:-1]])
+
+    # Open = previous close moved by the overnight share of the return and the jump
+    overnight = 0.3 * (returns - jumps) + jumps + rng.normal(0, 0.002, (n_days, n))
+    open_ = prev_close * np.exp(overnight)
+    range_scale = 0.5 * idio_vol * vol_multiplier
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 1, (n_days, n))) * range_scale)
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 1, (n_days, n))) * range_scale)
+
+    activity = 1 + 3 * np.abs(returns) / (idio_vol * vol_multiplier)
+    volume = (base_volume * activity * np.exp(rng.normal(0, 0.3, (n_days, n)))).astype(np.int64)
+
+    # Long format, symbol-major: transpose days x symbols to symbols x days
+    return {
+        'symbol_id': np.repeat(symbol_ids.astype(np.int32), n_days),
+        'date': np.tile(dates, n),
+        'open': open_.T.ravel(),
+        'high': high.T.ravel(),
+        'low': low.T.ravel(),
+        'close': close.T.ravel(),
+        'volume': volume.T.ravel()
+    }
+
+
+def _trading_days(params):
+    return pd.bdate_range(params['start_date'], periods=params['n_days']).values.astype('datetime64[ns]')
+
+
+def _chunk_dir(path, chunk_index):
+    return os.path.join(path, f"chunk_{chunk_index:05d}")
+
+
+def write_chunk(path, chunk_index):
+    """
+    Generate one chunk and write its columns (worker entry point).
+
+    Args:
+        path (str): Universe directory with manifest.json and factors.npz
+        chunk_index (int): Chunk number
+
+    Returns:
+        tuple: (chunk_index, rows written, seconds)
+    """
+    start = time.perf_counter()
+    with open(os.path.join(path, 'manifest.json')) as f:
+        params = json.load(f)['params']
+    with np.load(os.path.join(path, 'factors.npz')) as npz:
+        factors = {name: npz[name] for name in npz.files}
+
+    columns = simulate_chunk(params, factors, chunk_index, _trading_days(params))
+    directory = _chunk_dir(path, chunk_index)
+    tmp_directory = f"{directory}.tmp"
+    os.makedirs(tmp_directory, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(tmp_directory, f"{name}.npy"), values)
+    if os.path.exists(directory):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    os.replace(tmp_directory, directory)
+    return chunk_index, len(columns['close']), time.perf_counter() - start
+
+
+def generate_universe(path, workers=1, **overrides):
+    """
+    Write a synthetic universe to disk.
+
+    Args:
+        path (str): Output directory
+        workers (int, optional): Processes generating chunks (1 = in this
+                                 process, None = every core)
+        **overrides: Any of default_params()
+
+    Returns:
+        dict: Manifest (params, symbols, chunks)
+    """
+    unknown = set(overrides) - set(default_params())
+    if unknown:
+        raise ValueError(f"Unknown universe parameters: {sorted(unknown)}")
+    params = {**default_params(), **overrides}
+    params['idio_vol_range'] = list(params['idio_vol_range'])
+    n_chunks = -(-params['n_symbols'] // params['chunk_symbols'])
+
+    os.makedirs(path, exist_ok=True)
+    factors = simulate_factors(params)
+    np.savez(os.path.join(path, 'factors.npz'), **factors)
+
+    manifest = {
+        'params': params,
+        'columns': list(COLUMNS),
+        'symbols': [f"SYM{i:05d}" for i in range(params['n_symbols'])],
+        'sectors': [f"SECTOR{i:02d}" for i in range(params['n_sectors'])],
+        'chunks': [{'index': i, 'first_symbol': i * params['chunk_symbols'],
+                    'n_symbols': min(params['chunk_symbols'], params['n_symbols'] - i * params['chunk_symbols'])}
+                   for i in range(n_chunks)]
+    }
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    if workers == 1:
+        for chunk_index in range(n_chunks):
+            write_chunk(path, chunk_index)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(write_chunk, [path] * n_chunks, range(n_chunks)))
+    return manifest
+
+
+def read_manifest(path):
+    """Manifest of a universe written by generate_universe."""
+    with open(os.path.join(path, 'manifest.json')) as f:
+        return json.load(f)
+
+
+def load_chunk(path, chunk_index, columns=None, mmap=True, manifest=None):
+    """
+    One chunk as a long-format DataFrame.
+
+    Args:
+        path (str): Universe directory
+        chunk_index (int): Chunk number
+        columns (list, optional): Columns to load (default: all)
+        mmap (bool): Memory-map the column files
+        manifest (dict, optional): Manifest, if already read
+
+    Returns:
+        pd.DataFrame: Rows of the chunk with a categorical 'symbol' column
+    """
+    manifest = manifest or read_manifest(path)
+    directory = _chunk_dir(path, chunk_index)
+    names = list(columns or manifest['columns'])
+    if 'symbol_id' not in names:
+        names.insert(0, 'symbol_id')
+    data = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None)
+            for name in names}
+
+    frame = pd.DataFrame(data, copy=False)
+    frame.insert(0, 'symbol', pd.Categorical.from_codes(data['symbol_id'], categories=manifest['symbols']))
+    return frame
+
+
+def iter_universe(path, columns=None, mmap=True):
+    """
+    Iterate over a universe chunk by chunk.
+
+    Args:
+        path (str): Universe directory
+        columns (list, optional): Columns to load
+        mmap (bool): Memory-map the column files
+
+    Yields:
+        pd.DataFrame: One chunk at a time
+    """
+    manifest = read_manifest(path)
+    for chunk in manifest['chunks']:
+        yield load_chunk(path, chunk['index'], columns, mmap, manifest)
+
+
+def load_universe(path, symbols=None, columns=None):
+    """
+    Load (part of) a universe into one DataFrame.
+
+    Only chunks holding the requested symbols are read.
+
+    Args:
+        path (str): Universe directory
+        symbols (list, optional): Symbols to keep (default: all)
+        columns (list, optional): Columns to load
+
+    Returns:
+        pd.DataFrame: Long-format rows, symbol-major
+    """
+    manifest = read_manifest(path)
+    chunk_symbols = manifest['params']['chunk_symbols']
+    if symbols is None:
+        wanted = None
+        chunk_indices = [chunk['index'] for chunk in manifest['chunks']]
+    else:
+        lookup = {symbol: i for i, symbol in enumerate(manifest['symbols'])}
+        wanted = np.array(sorted(lookup[s] for s in symbols), dtype=np.int32)
+        chunk_indices = sorted(set((wanted // chunk_symbols).tolist()))
+
+    frames = []
+    for chunk_index in chunk_indices:
+        frame = load_chunk(path, chunk_index, columns, True, manifest)
+        if wanted is not None:
+            frame = frame[np.isin(frame['symbol_id'].to_numpy(), wanted)]
+        frames.append(frame)
+    if not frames:
+        return load_chunk(path, 0, columns, True, manifest).iloc[:0]
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic multi-asset universe")
+    parser.add_argument('path', help="output directory")
+    parser.add_argument('--symbols', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=5000)
+    parser.add_argument('--sectors', type=int, default=10)
+    parser.add_argument('--chunk-symbols', type=int, default=250)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=1, help="chunk-writing processes (0 = all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = generate_universe(args.path, workers=args.workers or None, n_symbols=args.symbols,
+                                 n_days=args.days, n_sectors=args.sectors,
+                                 chunk_symbols=args.chunk_symbols, seed=args.seed)
+    rows = args.symbols * args.days
+    seconds = time.perf_counter() - start
+    print(f"Wrote {rows:,} rows in {len(manifest['chunks'])} chunks to {args.path} "
+          f"in {seconds:.1f}s ({rows / seconds:,.0f} rows/s)")
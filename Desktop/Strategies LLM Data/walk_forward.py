@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Optimiser
+Splits history into rolling (or anchored) train/test folds, searches a
+strategy's parameter_schema on each train fold, and scores the best
+parameter set on the following test fold. Folds and candidates run on a
+process pool; candidates of a fold share one IndicatorCache per worker, so
+indicators with the same lookback are computed once.
+
+Searches: 'random' and 'grid' score every candidate on the whole train
+window; 'halving' (successive halving) scores a sample of the schema on
+short recent slices and only extends the history of the best 1/eta. Its
+saving is against the schema grid: --compare runs that grid (and the
+exhaustive search over the same sample) and reports calls, bars and
+scores side by side.
+
+Usage:
+    python walk_forward.py --strategy moving_average_crossover --bars 3000
+    python walk_forward.py --strategy volatility_contraction --folds 5 --candidates 100 --workers 0
+    python walk_forward.py --strategy trend_momentum_filter --search grid --params short_ma_period long_ma_period
+    python walk_forward.py --strategy moving_average_crossover --search halving --candidates 27 --levels 6 \
+        --params short_ma_period long_ma_period trailing_stop_atr --compare
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from performance_metrics import compute_trade_metrics
+from indicator_cache import IndicatorCache
+
+# Worker-side state (set by _init_worker)
+_WORKER = {}
+
+
+def walk_forward_folds(n_rows, n_folds=4, train_size=None, test_size=None, anchored=False):
+    """
+    Train/test windows for walk-forward analysis.
+
+    Test windows are consecutive and non-overlapping; each train window ends
+    where its test window starts. Rolling windows keep a fixed train length,
+    anchored ones always start at 0.
+
+    Args:
+        n_rows (int): Length of the history (rows, or dates for panel data)
+        n_folds (int): Number of folds
+        train_size (int, optional): Train length (default: all history
+                                    before the first test window)
+        test_size (int, optional): Test length (default: n_rows // (n_folds + 2))
+        anchored (bool): Grow the train window from the start instead of
+                         rolling it
+
+    Returns:
+        list: (train_start, train_end, test_start, test_end) per fold,
+              end-exclusive; the last test window runs to n_rows
+    """
+    test_size = test_size or n_rows // (n_folds + 2)
+    train_size = train_size or n_rows - n_folds * test_size
+    if test_size < 1 or train_size < 1 or train_size + n_folds * test_size > n_rows:
+        raise ValueError(f"{n_rows} rows can't hold {n_folds} folds of {train_size} train / {test_size} test rows")
+
+    folds = []
+    for k in range(n_folds):
+        test_start = n_rows - (n_folds - k) * test_size
+        test_end = n_rows if k == n_folds - 1 else test_start + test_size
+        train_start = 0 if anchored else test_start - train_size
+        folds.append((train_start, test_start, test_start, test_end))
+    return folds
+
+
+def parameter_values(spec, levels=10):
+    """
+    Candidate values of one parameter_schema entry.
+
+    Numeric ranges are cut into `levels` evenly spaced values (ints rounded
+    and deduplicated), so random candidates share lookbacks and their
+    indicators can be reused.
+
+    Args:
+        spec (dict): Schema entry with type, min, max (and default)
+        levels (int): Values per numeric parameter
+
+    Returns:
+        list: Values within [min, max] of the parameter's type
+    """
+    kind = spec.get('type')
+    if kind == 'bool':
+        return [False, True]
+    if kind == 'int':
+        values = np.unique(np.round(np.linspace(spec['min'], spec['max'], levels)).astype(int))
+        return [int(v) for v in values]
+    if kind == 'float':
+        return [round(float(v), 6) for v in np.linspace(spec['min'], spec['max'], levels)]
+    return [spec['default']] if 'default' in spec else []
+
+
+def grid_candidates(schema, levels=3, names=None):
+    """
+    Every combination of the searched parameters' values.
+
+    Args:
+        schema (dict): Strategy parameter_schema
+        levels (int): Values per numeric parameter
+        names (list, optional): Parameters to search (default: all)
+
+    Returns:
+        list: {name: value} dicts of the searched parameters
+    """
+    names = [name for name in (names or schema) if name in schema]
+    values = [parameter_values(schema[name], levels) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def sample_candidates(schema, n_candidates, levels=10, names=None, seed=42):
+    """
+    Distinct random combinations of the searched parameters' values.
+
+    Args:
+        schema (dict): Strategy parameter_schema
+        n_candidates (int): Number of candidates (fewer if the space is smaller)
+        levels (int): Values per numeric parameter
+        names (list, optional): Parameters to search (default: all)
+        seed (int): Random seed
+
+    Returns:
+        list: {name: value} dicts of the searched parameters
+    """
+    names = [name for name in (names or schema) if name in schema]
+    values = [parameter_values(schema[name], levels) for name in names]
+    space = int(np.prod([len(v) for v in values], dtype=np.float64)) if values else 1
+    if space <= n_candidates:
+        return grid_candidates(schema, levels, names)
+
+    rng = np.random.default_rng(seed)
+    seen = set()
+    candidates = []
+    while len(candidates) < n_candidates:
+        combo = tuple(v[rng.integers(len(v))] for v in values)
+        if combo not in seen:
+            seen.add(combo)
+            candidates.append(dict(zip(names, combo)))
+    return candidates
+
+
+def score_signals(data, signals, price_column, objective='sharpe_ratio', score_from=0):
+    """
+    Objective of a signal series, from compute_trade_metrics.
+
+    Long-format panel data (with symbol and date columns) is pivoted to
+    dates x symbols and the objective is averaged over symbols.
+
+    Args:
+        data (pd.DataFrame): Data the signals were generated on
+        signals (pd.Series): Signal per row
+        price_column (str): Price column trades are valued at
+        objective (str): Key of compute_trade_metrics' summary
+        score_from (int): Rows before this are warm-up and not scored
+
+    Returns:
+        tuple: (score, number of trades)
+    """
+    signals = pd.Series(np.asarray(signals, dtype=np.float64), index=data.index).fillna(0)
+    prices = data[price_column]
+    if 'symbol' in data.columns and 'date' in data.columns:
+        rows = slice(score_from, None)
+        frame = pd.DataFrame({'date': data['date'].values[rows], 'symbol': data['symbol'].values[rows],
+                              'signal': signals.values[rows], 'price': prices.values[rows]})
+        signals = frame.pivot_table(index='date', columns='symbol', values='signal', aggfunc='last').fillna(0)
+        prices = frame.pivot_table(index='date', columns='symbol', values='price', aggfunc='last').ffill()
+    else:
+        signals = signals.iloc[score_from:]
+        prices = prices.iloc[score_from:]
+    if len(prices) == 0:
+        return float('-inf'), 0
+    summary = compute_trade_metrics(signals, prices)['summary']
+    return float(np.nanmean(summary[objective])), int(summary['num_trades'].sum())
+
+
+def _init_worker(strategy_class, data, price_column, objective):
+    """Pool initializer: keep the data and settings once per worker."""
+    _WORKER.update(strategy_class=strategy_class, data=data, price_column=price_column,
+                   objective=objective, frame=None, window=None, cache=None)
+
+
+def _evaluate(task):
+    """
+    Pool task: score candidates on one data window.
+
+    The window is preprocessed once and its IndicatorCache kept while the
+    worker stays on it, so consecutive tasks of a fold reuse indicators.
+    """
+    fold, start, end, score_from, candidates = task
+    strategy_class = _WORKER['strategy_class']
+    if _WORKER['window'] != (start, end):
+        window = _WORKER['data'].iloc[start:end].reset_index(drop=True)
+        frame = strategy_class().preprocess_data(window.copy())
+        _WORKER.update(window=(start, end), frame=frame, cache=IndicatorCache(frame))
+    frame, cache = _WORKER['frame'], _WORKER['cache']
+    hits, misses = cache.hits, cache.misses
+
+    scores = []
+    for index, params in candidates:
+        try:
+            output = strategy_class(params).generate_signals(frame, context={'indicator_cache': cache})
+            signals = output['Signal'] if 'Signal' in output.columns else pd.Series(0, index=frame.index)
+            score, trades = score_signals(frame, signals, _WORKER['price_column'], _WORKER['objective'], score_from)
+        except Exception:
+            score, trades = float('-inf'), 0
+        scores.append((index, score if np.isfinite(score) else float('-inf'), trades))
+    return fold, scores, cache.hits - hits, cache.misses - misses, len(frame) * len(candidates)
+
+
+def chunk_tasks(fold, start, end, score_from, candidates, indices, n_chunks):
+    """
+    Tasks scoring candidates[indices] on rows [start, end) in n_chunks chunks.
+
+    Candidates with equal lookbacks sit next to each other, so a chunk hits
+    the indicator cache as often as possible.
+    """
+    order = sorted(indices, key=lambda i: tuple(sorted((k, str(v)) for k, v in candidates[i].items())))
+    return [(fold, int(start), int(end), int(score_from), [(int(i), candidates[int(i)]) for i in chunk])
+            for chunk in np.array_split(np.asarray(order, dtype=np.int64), min(n_chunks, len(order))) if len(chunk)]
+
+
+LOOKBACK_WORDS = ('period', 'lookback', 'window')
+NON_LOOKBACK_WORDS = ('holding',)
+
+
+def is_lookback(name, value):
+    """Whether a parameter is an indicator lookback (e.g. 'atr_period', not 'max_holding_period')."""
+    return (isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+            and any(word in name for word in LOOKBACK_WORDS)
+            and not any(word in name for word in NON_LOOKBACK_WORDS))
+
+
+def lookback_warmup(params):
+    """Largest lookback parameter of a candidate: history needed before a scored slice."""
+    return int(max((value for name, value in params.items() if is_lookback(name, value)), default=0))
+
+
+def successive_halving(run_tasks, candidates, bounds, start, end, eta=3, min_length=20, n_chunks=1, fold=0):
+    """
+    Successive-halving search over candidates on units [start, end).
+
+    Rung r scores the surviving candidates on the most recent
+    length / eta^(R-1-r) units, each preceded by enough history to warm up
+    its longest lookback (candidates with the same warm-up share a window
+    and its indicator cache), and keeps the best 1/eta; the last rung
+    scores the survivors on the whole window, like an exhaustive search
+    would. There are enough rungs to bring the candidates down to at most
+    eta, unless the first slice would get shorter than min_length.
+
+    Every candidate is scored at least once and survivors again, so over
+    the same candidates there are more generate_signals calls than in an
+    exhaustive search (up to eta / (eta - 1) times as many). The saving
+    comes from sampling: halving n candidates out of a schema grid of N
+    costs about 1.5 n calls instead of N. Trade-based objectives are noisy
+    on short slices, so the first rungs can drop candidates that would
+    have won on the whole window; compare scores before relying on it.
+
+    Args:
+        run_tasks (callable): Runs a list of _evaluate tasks, returns results
+        candidates (list): Parameter dicts
+        bounds (np.ndarray): Row offset of each unit (row or date)
+        start, end (int): Units searched
+        eta (int): Keep 1/eta of the candidates per rung, stretch the
+                   history eta times
+        min_length (int): Shortest scored slice, in units
+        n_chunks (int): Tasks per rung
+        fold (int): Fold tag of the tasks
+
+    Returns:
+        dict: {'best': candidate index, 'score': its score on the whole
+               window, 'rungs': [{length, candidates, best_score}],
+               'results': every task result}
+    """
+    length = end - start
+    n_rungs = 1
+    while eta ** n_rungs < len(candidates):
+        n_rungs += 1
+    while n_rungs > 1 and length // eta ** (n_rungs - 1) < min_length:
+        n_rungs -= 1
+
+    alive = list(range(len(candidates)))
+    rungs = []
+    results = []
+    ranked = [(0, float('-inf'))]
+    for rung in range(n_rungs):
+        score_start = start if rung == n_rungs - 1 else end - length // eta ** (n_rungs - 1 - rung)
+        windows = {}
+        for index in alive:
+            window_start = start if rung == n_rungs - 1 else \
+                max(0, score_start - lookback_warmup(candidates[index]))
+            windows.setdefault(window_start, []).append(index)
+        tasks = [task for window_start, indices in sorted(windows.items())
+                 for task in chunk_tasks(fold, bounds[window_start], bounds[end],
+                                         bounds[score_start] - bounds[window_start], candidates, indices, n_chunks)]
+        rung_results = run_tasks(tasks)
+        results.extend(rung_results)
+
+        scores = {index: score for _, chunk, _, _, _ in rung_results for index, score, _ in chunk}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        rungs.append({'length': int(end - score_start), 'candidates': len(alive), 'best_score': ranked[0][1]})
+        alive = [index for index, _ in ranked[:max(1, -(-len(alive) // eta))]]
+
+    best, score = ranked[0]
+    return {'best': best, 'score': score, 'rungs': rungs, 'results': results}
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward parameter optimisation over a strategy's parameter_schema.
+
+    For every fold the candidates are scored on the train window, the best
+    one (ties: first candidate, i.e. the defaults) is run over the train and
+    test windows, and only test rows are scored, so indicators are warmed up
+    by train history but the test score is out of sample.
+
+    Example:
+        optimizer = WalkForwardOptimizer(MovingAverageCrossoverStrategy, n_folds=4, n_candidates=40, workers=4)
+        result = optimizer.run(data)
+        result['folds'][0]['best_params'], result['mean_test_score']
+    """
+
+    def __init__(self, strategy_class, n_folds=4, n_candidates=50, search='random', levels=10,
+                 param_names=None, objective='sharpe_ratio', anchored=False, train_size=None,
+                 test_size=None, price_column=None, seed=42, workers=1, eta=3, min_length=20):
+        """
+        Initialize the optimiser.
+        Args:
+            strategy_class (type): Strategy to optimise
+            n_folds (int): Number of walk-forward folds
+            n_candidates (int): Random candidates per fold (search='random'
+                                or 'halving')
+            search (str): 'random', 'grid' or 'halving'
+            levels (int): Values per numeric parameter
+            param_names (list, optional): Parameters to search (default: all
+                                          in the schema); others keep defaults
+            objective (str): compute_trade_metrics summary key to maximise
+            anchored (bool): Anchored instead of rolling train windows
+            train_size, test_size (int, optional): Window lengths (rows, or
+                                                   dates for panel data)
+            price_column (str, optional): Price column (default: 'close',
+                                          else the second column)
+            seed (int): Random seed of the candidate sample
+            workers (int): Process-pool size; 1 runs in this process,
+                           None uses every core
+            eta (int): Successive-halving factor (search='halving')
+            min_length (int): Shortest successive-halving slice, in rows or
+                              dates (search='halving')
+        """
+        self.strategy_class = strategy_class
+        self.n_folds = n_folds
+        self.n_candidates = n_candidates
+        self.search = search
+        self.levels = levels
+        self.param_names = param_names
+        self.objective = objective
+        self.anchored = anchored
+        self.train_size = train_size
+        self.test_size = test_size
+        self.price_column = price_column
+        self.seed = seed
+        self.workers = workers
+        self.eta = eta
+        self.min_length = min_length
+
+    def candidates(self):
+        """
+        Full parameter dicts to search: the defaults first, then the
+        sampled or grid combinations merged over the defaults.
+
+        Returns:
+            list: Parameter dicts
+        """
+        strategy = self.strategy_class()
+        defaults = dict(strategy.params)
+        schema = strategy.parameter_schema()
+        if self.search == 'grid':
+            combos = grid_candidates(schema, self.levels, self.param_names)
+        else:
+            combos = sample_candidates(schema, self.n_candidates, self.levels, self.param_names, self.seed)
+
+        candidates = [defaults]
+        seen = {json.dumps(defaults, sort_keys=True, default=str)}
+        for combo in combos:
+            params = {**defaults, **combo}
+            key = json.dumps(params, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                candidates.append(params)
+        return candidates
+
+    def _row_bounds(self, data):
+        """Row offset of each date for panel data (rows for single series)."""
+        if 'symbol' in data.columns and 'date' in data.columns:
+            dates = data['date'].values
+            unique = np.unique(dates)
+            return np.append(np.searchsorted(dates, unique, side='left'), len(data))
+        return np.arange(len(data) + 1)
+
+    def run(self, data):
+        """
+        Run the walk-forward optimisation.
+
+        Args:
+            data (pd.DataFrame): Full history; long-format panels (symbol and
+                                 date columns) are split by date
+
+        Returns:
+            dict: {
+                'folds': per fold {fold, train, test (date or row ranges),
+                         best_params, train_score, test_score, test_trades,
+                         and rungs for search='halving'},
+                'candidates': number of candidates,
+                'mean_test_score', 'mean_train_score',
+                'signal_calls', 'signal_bars' (rows run through
+                generate_signals), 'indicator_hits', 'indicator_misses', 'seconds'
+            }
+        """
+        start = time.perf_counter()
+        if 'symbol' in data.columns and 'date' in data.columns:
+            data = data.sort_values('date', kind='stable').reset_index(drop=True)
+        price_column = self.price_column or ('close' if 'close' in data.columns else data.columns[1])
+        bounds = self._row_bounds(data)
+        folds = walk_forward_folds(len(bounds) - 1, self.n_folds, self.train_size, self.test_size, self.anchored)
+        candidates = self.candidates()
+
+        workers = self.workers or os.cpu_count()
+        n_chunks = max(1, min(workers, len(candidates)))
+        init_args = (self.strategy_class, data, price_column, self.objective)
+
+        pool = None
+        if workers == 1:
+            _init_worker(*init_args)
+            run_tasks = lambda tasks: [_evaluate(task) for task in tasks]
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args)
+            run_tasks = lambda tasks: list(pool.map(_evaluate, tasks))
+        try:
+            rungs = {}
+            if self.search == 'halving':
+                train_results = []
+                best = {}
+                for fold, (train_start, train_end, _, _) in enumerate(folds):
+                    search = successive_halving(run_tasks, candidates, bounds, train_start, train_end, self.eta,
+                                                self.min_length, n_chunks, fold)
+                    train_results.extend(search['results'])
+                    best[fold] = (search['best'], search['score'])
+                    rungs[fold] = search['rungs']
+            else:
+                train_results = run_tasks([task for fold, (train_start, train_end, _, _) in enumerate(folds)
+                                           for task in chunk_tasks(fold, bounds[train_start], bounds[train_end], 0,
+                                                                   candidates, range(len(candidates)), n_chunks)])
+                best = self._best(folds, train_results)
+            test_results = run_tasks(self._test_tasks(folds, bounds, candidates, best))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        dates = data['date'].values if 'date' in data.columns else None
+        fold_results = []
+        for (fold, scores, _, _, _) in test_results:
+            train_start, train_end, test_start, test_end = folds[fold]
+            index, train_score = best[fold]
+            _, test_score, test_trades = scores[0]
+            fold_results.append({
+                'fold': fold,
+                'train': self._label(dates, bounds, train_start, train_end),
+                'test': self._label(dates, bounds, test_start, test_end),
+                'best_params': candidates[index],
+                'train_score': train_score,
+                'test_score': test_score,
+                'test_trades': test_trades
+            })
+            if fold in rungs:
+                fold_results[-1]['rungs'] = rungs[fold]
+
+        all_results = train_results + test_results
+        finite = lambda values: [v for v in values if np.isfinite(v)]
+        test_scores = finite(f['test_score'] for f in fold_results)
+        train_scores = finite(f['train_score'] for f in fold_results)
+        return {
+            'strategy': self.strategy_class.__name__,
+            'objective': self.objective,
+            'folds': fold_results,
+            'candidates': len(candidates),
+            'mean_test_score': float(np.mean(test_scores)) if test_scores else float('-inf'),
+            'mean_train_score': float(np.mean(train_scores)) if train_scores else float('-inf'),
+            'search': self.search,
+            'signal_calls': sum(len(scores) for _, scores, _, _, _ in all_results),
+            'signal_bars': sum(r[4] for r in all_results),
+            'indicator_hits': sum(r[2] for r in all_results),
+            'indicator_misses': sum(r[3] for r in all_results),
+            'seconds': time.perf_counter() - start
+        }
+
+    def _best(self, folds, train_results):
+        """Best (candidate index, train score) per fold; ties go to the lower index."""
+        best = {fold: (0, float('-inf')) for fold in range(len(folds))}
+        for fold, scores, _, _, _ in train_results:
+            for index, score, _ in scores:
+                current_index, current_score = best[fold]
+                if score > current_score or (score == current_score and index < current_index):
+                    best[fold] = (index, score)
+        return best
+
+    def _test_tasks(self, folds, bounds, candidates, best):
+        """Test tasks: the fold's best candidate over train + test rows, scored on test rows."""
+        tasks = []
+        for fold, (train_start, _, test_start, test_end) in enumerate(folds):
+            index = best[fold][0]
+            start = int(bounds[train_start])
+            tasks.append((fold, start, int(bounds[test_end]), int(bounds[test_start]) - start,
+                          [(index, candidates[index])]))
+        return tasks
+
+    def _label(self, dates, bounds, start, end):
+        """[first, last] date of a window (row positions without dates)."""
+        if dates is None:
+            return [int(start), int(end) - 1]
+        return [str(pd.Timestamp(dates[bounds[start]]).date()), str(pd.Timestamp(dates[bounds[end] - 1]).date())]
+
+
+def main():
+    from benchmark_strategies import STRATEGIES, make_bars
+
+    names = [name for name, (module, _, _) in STRATEGIES.items() if module is not None]
+    parser = argparse.ArgumentParser(description="Walk-forward parameter optimisation")
+    parser.add_argument('--strategy', choices=names, required=True)
+    parser.add_argument('--data', help="CSV with date and OHLCV columns (default: synthetic bars)")
+    parser.add_argument('--bars', type=int, default=3000, help="synthetic bars per symbol")
+    parser.add_argument('--symbols', type=int, default=1, help="synthetic symbols")
+    parser.add_argument('--folds', type=int, default=4)
+    parser.add_argument('--candidates', type=int, default=50)
+    parser.add_argument('--search', choices=('random', 'grid', 'halving'), default='random')
+    parser.add_argument('--eta', type=int, default=3, help="successive-halving factor")
+    parser.add_argument('--min-length', type=int, default=20,
+                        help="shortest successive-halving slice, in bars (or dates for panel data)")
+    parser.add_argument('--compare', action='store_true',
+                        help="with --search halving: also run the schema grid (--levels, --params) and "
+                             "the exhaustive search over the same sample, and compare")
+    parser.add_argument('--levels', type=int, default=10, help="values per numeric parameter")
+    parser.add_argument('--params', nargs='+', help="parameters to search (default: all)")
+    parser.add_argument('--objective', default='sharpe_ratio')
+    parser.add_argument('--anchored', action='store_true')
+    parser.add_argument('--workers', type=int, default=1, help="process-pool size (0 = all cores)")
+    parser.add_argument('--output', help="write the result as JSON")
+    args = parser.parse_args()
+
+    module_name, class_name, multi_symbol = STRATEGIES[args.strategy]
+    strategy_class = getattr(__import__(module_name, fromlist=[class_name]), class_name)
+    if args.data:
+        data = pd.read_csv(args.data, parse_dates=['date'])
+    else:
+        data = make_bars(args.bars * args.symbols, args.symbols)
+        if args.symbols == 1 or not multi_symbol:
+            data = data[data['symbol'] == data['symbol'].iloc[0]].drop(columns='symbol').reset_index(drop=True)
+
+    optimizer = WalkForwardOptimizer(strategy_class, n_folds=args.folds, n_candidates=args.candidates,
+                                     search=args.search, levels=args.levels, param_names=args.params,
+                                     objective=args.objective, anchored=args.anchored,
+                                     workers=args.workers or None, eta=args.eta,
+                                     min_length=args.min_length)
+    result = optimizer.run(data)
+
+    print(f"Walk-forward: {result['strategy']} ({result['candidates']} candidates, {args.objective})")
+    for fold in result['folds']:
+        print(f"  Fold {fold['fold']}: train {fold['train'][0]}..{fold['train'][1]}  "
+              f"test {fold['test'][0]}..{fold['test'][1]}  "
+              f"train {fold['train_score']:.3f}  test {fold['test_score']:.3f}  trades {fold['test_trades']}")
+        for rung in fold.get('rungs', []):
+            print(f"    {rung['candidates']:>4} candidates on last {rung['length']:>5}  best {rung['best_score']:.3f}")
+    print(f"Mean train score: {result['mean_train_score']:.3f}")
+    print(f"Mean test score:  {result['mean_test_score']:.3f}")
+    print(f"generate_signals calls: {result['signal_calls']} ({result['signal_bars']:,} bars)  "
+          f"indicator cache: {result['indicator_hits']} hits / {result['indicator_misses']} misses  "
+          f"({result['seconds']:.1f}s)")
+
+    if args.compare and args.search == 'halving':
+        baselines = {}
+        for name, search in (('grid', 'grid'), ('sample', 'random')):
+            optimizer.search = search
+            baselines[name] = optimizer.run(data)
+        grid = baselines['grid']
+        print(f"{'search':<28}{'candidates':>11}{'calls':>9}{'bars':>13}{'seconds':>9}{'train':>8}{'test':>8}")
+        for label, run in ((f"halving (eta={args.eta})", result),
+                           ('exhaustive over the sample', baselines['sample']),
+                           (f"schema grid ({args.levels} levels)", grid)):
+            print(f"{label:<28}{run['candidates']:>11}{run['signal_calls']:>9}{run['signal_bars']:>13,}"
+                  f"{run['seconds']:>9.1f}{run['mean_train_score']:>8.3f}{run['mean_test_score']:>8.3f}")
+        print(f"Halving against the grid: "
+              f"{result['signal_calls'] / max(grid['signal_calls'], 1):.0%} of the calls, "
+              f"{result['signal_bars'] / max(grid['signal_bars'], 1):.0%} of the bars, "
+              f"mean test score {result['mean_test_score'] - grid['mean_test_score']:+.3f}")
+        result['baselines'] = {name: {key: run[key] for key in ('candidates', 'mean_train_score', 'mean_test_score',
+                                                                'signal_calls', 'signal_bars', 'seconds')}
+                               for name, run in baselines.items()}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()